@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""
+    Benchmarks for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Runs the benchmarks, saves the results as a JSON file and compares them against a baseline. Requires only the
+    standard library. The peak memory usage is measured via "tracemalloc" module, which is available on Python 3.4+.
+
+    Usage examples:
+
+        python benchmarks/run.py --quick
+        python benchmarks/run.py --output results.json --save-baseline baseline.json
+        python benchmarks/run.py --baseline baseline.json --threshold 0.15
+"""
+
+import os
+import sys
+import gc
+import re
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import timeit
+
+# Benchmark the package in the source tree, not the installed one
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)))
+
+import geomdl
+import workloads
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def result_key(name, params):
+    """ Generates a unique key for the benchmark result using its name and parameters.
+
+    :param name: name of the benchmark
+    :type name: str
+    :param params: parameters of the benchmark
+    :type params: dict
+    :return: key
+    :rtype: str
+    """
+    return name + "[" + ",".join([k + "=" + str(params[k]) for k in sorted(params.keys())]) + "]"
+
+
+def measure_time(setup, params, repeat):
+    """ Measures the minimum wall time of the benchmark over the repeated runs.
+
+    The garbage collector is disabled during the measurements, similar to the ``timeit`` module.
+
+    :return: wall time in seconds
+    :rtype: float
+    """
+    timings = []
+    for _ in range(repeat):
+        func = setup(**params)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = timeit.default_timer()
+            func()
+            timings.append(timeit.default_timer() - start)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return min(timings)
+
+
+def measure_memory(setup, params):
+    """ Measures the peak memory allocated by the benchmark.
+
+    :return: peak memory usage in bytes, None if the measurement is not available
+    :rtype: int
+    """
+    if tracemalloc is None:
+        return None
+    func = setup(**params)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(benchmarks, repeat=3, quick=False, pattern=None, memory=True):
+    """ Runs the benchmarks.
+
+    :param benchmarks: list of benchmarks
+    :type benchmarks: list
+    :param repeat: number of repeated runs for the timing measurements
+    :type repeat: int
+    :param quick: uses the quick parameter sweeps
+    :type quick: bool
+    :param pattern: regular expression for selecting the benchmarks by their result keys
+    :type pattern: str
+    :param memory: enables the peak memory measurements
+    :type memory: bool
+    :return: list of results
+    :rtype: list
+    """
+    results = []
+    for bench in benchmarks:
+        for params in (bench.quick if quick else bench.params):
+            key = result_key(bench.name, params)
+            if pattern and not re.search(pattern, key):
+                continue
+            elapsed = measure_time(bench.setup, params, repeat)
+            peak = measure_memory(bench.setup, params) if memory else None
+            results.append(dict(key=key, name=bench.name, params=params, time=elapsed, peak_memory=peak))
+            print("%-72s %12.6f s %12s" % (key, elapsed, _format_memory(peak)))
+            sys.stdout.flush()
+    return results
+
+
+def compare_results(results, baseline, threshold):
+    """ Compares the results against the baseline.
+
+    A result is reported as a regression if its wall time or peak memory usage exceeds the baseline value by more
+    than the threshold, e.g. ``threshold=0.1`` allows 10% increase.
+
+    :param results: list of results
+    :type results: list
+    :param baseline: list of baseline results
+    :type baseline: list
+    :param threshold: relative regression threshold
+    :type threshold: float
+    :return: list of regressions in (key, metric, baseline value, current value) format
+    :rtype: list
+    """
+    reference = dict([(res['key'], res) for res in baseline])
+    regressions = []
+    for res in results:
+        ref = reference.get(res['key'])
+        if ref is None:
+            continue
+        for metric in ('time', 'peak_memory'):
+            if res.get(metric) is None or not ref.get(metric):
+                continue
+            if res[metric] > ref[metric] * (1.0 + threshold):
+                regressions.append((res['key'], metric, ref[metric], res[metric]))
+    return regressions
+
+
+def _format_memory(value):
+    if value is None:
+        return "n/a"
+    return "%.1f KiB" % (value / 1024.0)
+
+
+def _read_results(file_name):
+    with open(file_name, 'r') as fp:
+        return json.load(fp)['results']
+
+
+def _write_results(file_name, results, repeat):
+    data = dict(
+        meta=dict(
+            geomdl=geomdl.__version__,
+            python=platform.python_version(),
+            implementation=platform.python_implementation(),
+            platform=platform.platform(),
+            machine=platform.machine(),
+            timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            repeat=repeat,
+        ),
+        results=results,
+    )
+    with open(file_name, 'w') as fp:
+        json.dump(data, fp, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the NURBS-Python benchmarks")
+    parser.add_argument('--quick', action='store_true', help="use the smaller parameter sweeps")
+    parser.add_argument('--repeat', type=int, default=3, help="number of repeated timing runs (default: 3)")
+    parser.add_argument('--filter', dest='pattern', default=None, help="regular expression for selecting benchmarks")
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="skip peak memory measurements")
+    parser.add_argument('--output', default=None, help="JSON file to save the results")
+    parser.add_argument('--save-baseline', default=None, help="JSON file to save the results as the new baseline")
+    parser.add_argument('--baseline', default=None, help="JSON file of the baseline results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="allowed relative increase over the baseline (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be a positive integer")
+
+    output_dir = tempfile.mkdtemp(prefix="geomdl_benchmarks_")
+    try:
+        results = run_benchmarks(workloads.get_benchmarks(output_dir), args.repeat, args.quick, args.pattern,
+                                 args.memory)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    for file_name in (args.output, args.save_baseline):
+        if file_name:
+            _write_results(file_name, results, args.repeat)
+
+    if args.baseline:
+        regressions = compare_results(results, _read_results(args.baseline), args.threshold)
+        for key, metric, ref, value in regressions:
+            print("REGRESSION %s %s: %g -> %g (%+.1f%%)" % (key, metric, ref, value, 100.0 * (value / ref - 1.0)))
+        if regressions:
+            return 1
+        print("No regressions over the threshold of %.1f%%" % (100.0 * args.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+    Benchmarks for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Defines the deterministic benchmark workloads. Each benchmark has a setup function, which generates the geometry
+    using the control point generators (CPGen module) and returns a callable containing the operation to be measured.
+    The setup function is called before each measurement, therefore the operations modifying the geometry (e.g. knot
+    insertion) always start from the same state.
+"""
+
+import os
+import random
+import itertools
+from geomdl import BSpline
+from geomdl import NURBS
+from geomdl import CPGen
+from geomdl import exchange
+from geomdl import utilities
+
+# Seed of the random number generator used for perturbing the control points and the weights
+SEED = 0
+
+
+class Benchmark(object):
+    """ Benchmark definition.
+
+    :param name: name of the benchmark
+    :type name: str
+    :param setup: function generating the workload and returning the callable to be measured
+    :type setup: callable
+    :param params: parameter sweep used in the full runs
+    :type params: list
+    :param quick: parameter sweep used in the quick runs
+    :type quick: list
+    """
+
+    def __init__(self, name, setup, params, quick):
+        self.name = name
+        self.setup = setup
+        self.params = params
+        self.quick = quick
+
+
+def sweep(**axes):
+    """ Generates the parameter sweep as the Cartesian product of the axes.
+
+    :return: list of parameter dictionaries
+    :rtype: list
+    """
+    keys = sorted(axes.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*[axes[k] for k in keys])]
+
+
+def make_grid(size_u, size_v, weighted=False):
+    """ Generates a deterministic control points grid.
+
+    The grid is generated by :class:`.CPGen.Grid` (or :class:`.CPGen.GridWeighted`) and the z-coordinates (and the
+    weights) are perturbed using a seeded random number generator.
+
+    :param size_u: number of control points in U-direction
+    :type size_u: int
+    :param size_v: number of control points in V-direction
+    :type size_v: int
+    :param weighted: generates weighted control points
+    :type weighted: bool
+    :return: control points in [u][v] format
+    :rtype: list
+    """
+    rng = random.Random(SEED)
+    grid = CPGen.GridWeighted(size_u - 1, size_v - 1) if weighted else CPGen.Grid(size_u - 1, size_v - 1)
+    grid.generate(size_u - 1, size_v - 1)
+    if weighted:
+        grid.add_weight(1.0)
+    points = grid.grid()
+    for row in points:
+        for pt in row:
+            pt[2] = rng.uniform(-1.0, 1.0)
+            if weighted:
+                w = rng.uniform(0.5, 1.5)
+                pt[:] = [c * w for c in pt[0:3]] + [w]
+    return points
+
+
+def make_curve(num_ctrlpts, degree, sample_size=100, rational=False):
+    """ Generates a curve using the middle row of a control points grid.
+
+    :param num_ctrlpts: number of control points
+    :type num_ctrlpts: int
+    :param degree: degree of the curve
+    :type degree: int
+    :param sample_size: sample size of the curve
+    :type sample_size: int
+    :param rational: generates a NURBS curve
+    :type rational: bool
+    :return: curve
+    :rtype: BSpline.Curve or NURBS.Curve
+    """
+    points = make_grid(3, num_ctrlpts, rational)[1]
+    curve = NURBS.Curve() if rational else BSpline.Curve()
+    curve.degree = degree
+    curve.set_ctrlpts(points)
+    curve.knotvector = utilities.generate_knot_vector(degree, num_ctrlpts)
+    curve.sample_size = sample_size
+    return curve
+
+
+def make_surface(num_ctrlpts, degree, sample_size=10, rational=False):
+    """ Generates a surface with a square control points grid.
+
+    :param num_ctrlpts: number of control points in each direction
+    :type num_ctrlpts: int
+    :param degree: degree of the surface in each direction
+    :type degree: int
+    :param sample_size: sample size of the surface in each direction
+    :type sample_size: int
+    :param rational: generates a NURBS surface
+    :type rational: bool
+    :return: surface
+    :rtype: BSpline.Surface or NURBS.Surface
+    """
+    points = make_grid(num_ctrlpts, num_ctrlpts, rational)
+    surf = NURBS.Surface() if rational else BSpline.Surface()
+    surf.degree_u = degree
+    surf.degree_v = degree
+    surf.set_ctrlpts([pt for row in points for pt in row], num_ctrlpts, num_ctrlpts)
+    surf.knotvector_u = utilities.generate_knot_vector(degree, num_ctrlpts)
+    surf.knotvector_v = utilities.generate_knot_vector(degree, num_ctrlpts)
+    surf.sample_size = sample_size
+    return surf
+
+
+def _params(num):
+    # Evenly distributed parameters excluding the end points
+    return [(i + 0.5) / num for i in range(num)]
+
+
+def setup_curve_evaluate(ctrlpts, degree, sample_size, rational=False):
+    curve = make_curve(ctrlpts, degree, sample_size, rational)
+    return curve.evaluate
+
+
+def setup_surface_evaluate(ctrlpts, degree, sample_size, rational=False):
+    surf = make_surface(ctrlpts, degree, sample_size, rational)
+    return surf.evaluate
+
+
+def setup_curve_derivatives(ctrlpts, degree, num, order):
+    curve = make_curve(ctrlpts, degree)
+    params = _params(num)
+
+    def run():
+        for u in params:
+            curve.derivatives(u, order)
+    return run
+
+
+def setup_surface_derivatives(ctrlpts, degree, num, order):
+    surf = make_surface(ctrlpts, degree)
+    params = _params(num)
+
+    def run():
+        for u in params:
+            for v in params:
+                surf.derivatives(u, v, order)
+    return run
+
+
+def setup_curve_insert_knot(ctrlpts, degree, num):
+    curve = make_curve(ctrlpts, degree)
+    params = _params(num)
+
+    def run():
+        for u in params:
+            curve.insert_knot(u, check_r=False)
+    return run
+
+
+def setup_surface_insert_knot(ctrlpts, degree, num):
+    surf = make_surface(ctrlpts, degree)
+    params = _params(num)
+
+    def run():
+        for u in params:
+            surf.insert_knot(u, u, check_r=False)
+    return run
+
+
+def setup_curve_decompose(ctrlpts, degree):
+    curve = make_curve(ctrlpts, degree)
+    return curve.decompose
+
+
+def setup_surface_decompose(ctrlpts, degree):
+    surf = make_surface(ctrlpts, degree)
+    return surf.decompose
+
+
+def setup_export(writer, sample_size, output_dir):
+    """ Generates the workload of the file exporters.
+
+    The surface is evaluated during the setup, therefore only the writer is measured.
+
+    :param writer: name of the writer, i.e. ``csv``, ``vtk``, ``vtk_binary``, ``obj``, ``stl`` or ``stl_ascii``
+    :type writer: str
+    :param sample_size: sample size of the surface in each direction
+    :type sample_size: int
+    :param output_dir: directory of the output files
+    :type output_dir: str
+    :return: callable to be measured
+    """
+    surf = make_surface(10, 3, sample_size)
+    surf.evaluate()
+    file_name = os.path.join(output_dir, "benchmark_" + writer)
+    writers = {
+        'csv': lambda: exchange.export_csv(surf, file_name + ".csv"),
+        'vtk': lambda: exchange.export_vtk(surf, file_name + ".vtk"),
+        'vtk_binary': lambda: exchange.export_vtk(surf, file_name + ".vtk", binary=True),
+        'obj': lambda: exchange.save_obj(surf, file_name + ".obj", vertex_spacing=1),
+        'stl': lambda: exchange.save_stl(surf, file_name + ".stl", vertex_spacing=1),
+        'stl_ascii': lambda: exchange.save_stl(surf, file_name + ".stl", binary=False, vertex_spacing=1),
+    }
+    return writers[writer]
+
+
+def get_benchmarks(output_dir):
+    """ Returns the list of the benchmarks.
+
+    :param output_dir: directory of the output files of the exporter benchmarks
+    :type output_dir: str
+    :return: list of benchmarks
+    :rtype: list
+    """
+    def export(**kwargs):
+        return setup_export(output_dir=output_dir, **kwargs)
+
+    return [
+        Benchmark("curve_evaluate", setup_curve_evaluate,
+                  sweep(ctrlpts=[16, 128], degree=[2, 3, 5], sample_size=[1000, 10000]),
+                  sweep(ctrlpts=[16], degree=[3], sample_size=[100, 1000])),
+        Benchmark("nurbs_curve_evaluate", lambda **kw: setup_curve_evaluate(rational=True, **kw),
+                  sweep(ctrlpts=[16, 128], degree=[2, 3, 5], sample_size=[1000, 10000]),
+                  sweep(ctrlpts=[16], degree=[3], sample_size=[100, 1000])),
+        Benchmark("surface_evaluate", setup_surface_evaluate,
+                  sweep(ctrlpts=[8, 32], degree=[2, 3, 5], sample_size=[25, 50, 100]),
+                  sweep(ctrlpts=[8], degree=[3], sample_size=[10, 20])),
+        Benchmark("nurbs_surface_evaluate", lambda **kw: setup_surface_evaluate(rational=True, **kw),
+                  sweep(ctrlpts=[8, 32], degree=[2, 3, 5], sample_size=[25, 50, 100]),
+                  sweep(ctrlpts=[8], degree=[3], sample_size=[10, 20])),
+        Benchmark("curve_derivatives", setup_curve_derivatives,
+                  sweep(ctrlpts=[16, 128], degree=[3, 5], num=[1000], order=[1, 2]),
+                  sweep(ctrlpts=[16], degree=[3], num=[100], order=[2])),
+        Benchmark("surface_derivatives", setup_surface_derivatives,
+                  sweep(ctrlpts=[8, 32], degree=[3, 5], num=[30], order=[1, 2]),
+                  sweep(ctrlpts=[8], degree=[3], num=[10], order=[2])),
+        Benchmark("curve_insert_knot", setup_curve_insert_knot,
+                  sweep(ctrlpts=[16, 128], degree=[3, 5], num=[100, 400]),
+                  sweep(ctrlpts=[16], degree=[3], num=[20])),
+        Benchmark("surface_insert_knot", setup_surface_insert_knot,
+                  sweep(ctrlpts=[8, 32], degree=[3], num=[10, 40]),
+                  sweep(ctrlpts=[8], degree=[3], num=[5])),
+        Benchmark("curve_decompose", setup_curve_decompose,
+                  sweep(ctrlpts=[16, 128, 1024], degree=[3, 5]),
+                  sweep(ctrlpts=[16, 128], degree=[3])),
+        Benchmark("surface_decompose", setup_surface_decompose,
+                  sweep(ctrlpts=[8, 32], degree=[3, 5]),
+                  sweep(ctrlpts=[8], degree=[3])),
+        Benchmark("export", export,
+                  sweep(writer=['csv', 'vtk', 'vtk_binary', 'obj', 'stl', 'stl_ascii'], sample_size=[50, 200]),
+                  sweep(writer=['csv', 'vtk', 'obj', 'stl'], sample_size=[20])),
+    ]
@@ -8,8 +8,16 @@
 """
 
 from . import abc
+from . import logging
 from . import warnings
 from . import utilities
+from . import spatial
+from . import buffers
+
+# Names of the attributes defining the geometry. Assigning any of them increments the geometry version.
+_GEOMETRY_ATTRIBUTES = frozenset(['_rational', '_degree', '_degree_u', '_degree_v', '_knot_vector', '_knot_vector_u',
+                                  '_knot_vector_v', '_control_points', '_control_points2D', '_control_points_size_u',
+                                  '_control_points_size_v', '_dimension'])
 
 
 class Curve(object):
@@ -17,6 +25,7 @@ class Curve(object):
     __metaclass__ = abc.ABCMeta
 
     def __init__(self):
+        self._version = 0  # geometry version, see _geometry_changed()
         self._rational = False  # defines whether the curve is rational or not
         self._degree = 0  # degree
         self._knot_vector = None  # knot vector
@@ -35,17 +44,21 @@ class Curve(object):
         """ Curve evaluator.
 
         Evaluators allow users to use different algorithms for B-Spline and NURBS evaluations. Please see the
-        documentation on ``Evaluator`` classes.
+        documentation on ``Evaluator`` classes. The evaluator can also be set using the name of a registered evaluator,
+        e.g. ``sequential``, ``parallel`` or ``auto``.
 
-        :getter: Prints the name of the evaluator and returns the current Evaluator instance
+        :getter: Logs the name of the evaluator and returns the current Evaluator instance
         :setter: Sets the evaluator
         """
         if self._evaluator:
-            print("Using " + self._evaluator.name)
+            logging.getLogger(__name__).debug("Using " + self._evaluator.name)
             return self._evaluator
 
     @evaluator.setter
     def evaluator(self, value):
+        if isinstance(value, str):
+            from . import evaluators
+            value = evaluators.get_evaluator(value, 'nurbs_curve' if self._rational else 'curve')
         if not isinstance(value, Evaluator):
             raise TypeError("The evaluator must be an instance of Abstract.Evaluator")
         self._evaluator = value
@@ -290,6 +303,28 @@ class Curve(object):
         if reset_evalpts:
             self._curve_points = None
 
+    def __setattr__(self, name, value):
+        if name in _GEOMETRY_ATTRIBUTES:
+            self._geometry_changed()
+        super(Curve, self).__setattr__(name, value)
+
+    # Increments the geometry version, which invalidates the data derived from the curve geometry, e.g. the prepared
+    # evaluators. The in-place modifications of the geometry attributes must call this method explicitly.
+    def _geometry_changed(self):
+        super(Curve, self).__setattr__('_version', self.__dict__.get('_version', 0) + 1)
+
+    # Returns the buffer to store the evaluated points, None if the points are not going to be stored in a buffer
+    def _output_buffer(self, size, **kwargs):
+        out = kwargs.get('out', None)
+        if out is not None:
+            if len(out) < size:
+                raise ValueError("The output buffer must contain at least " + str(size) + " elements")
+            return out
+        if kwargs.get('buffer', False):
+            self._cache['evalpts_buffer'] = buffers.allocate(size, self._cache.get('evalpts_buffer'))
+            return self._cache['evalpts_buffer']
+        return None
+
     # Checks whether the curve evaluation is possible or not
     def _check_variables(self):
         works = True
@@ -328,6 +363,7 @@ class Surface(object):
         self._control_points_size_v = 0  # control points array length
         self._delta_v = 0.1  # evaluation delta
         # Common
+        self._version = 0  # geometry version, see _geometry_changed()
         self._rational = False  # defines whether the surface is rational or not
         self._sample_size = None  # defines sample size
         self._control_points = None  # control points, 1-D array (v-order)
@@ -344,17 +380,21 @@ class Surface(object):
         """ Curve evaluator.
 
         Evaluators allow users to use different algorithms for B-Spline and NURBS evaluations. Please see the
-        documentation on ``Evaluator`` classes.
+        documentation on ``Evaluator`` classes. The evaluator can also be set using the name of a registered evaluator,
+        e.g. ``sequential``, ``parallel`` or ``auto``.
 
-        :getter: Prints the name of the evaluator and returns the current Evaluator instance
+        :getter: Logs the name of the evaluator and returns the current Evaluator instance
         :setter: Sets the evaluator
         """
         if self._evaluator:
-            print("Using " + self._evaluator.name)
+            logging.getLogger(__name__).debug("Using " + self._evaluator.name)
             return self._evaluator
 
     @evaluator.setter
     def evaluator(self, value):
+        if isinstance(value, str):
+            from . import evaluators
+            value = evaluators.get_evaluator(value, 'nurbs_surface' if self._rational else 'surface')
         if not isinstance(value, Evaluator):
             raise TypeError("The evaluator must be an instance of Abstract.Evaluator")
         self._evaluator = value
@@ -764,6 +804,28 @@ class Surface(object):
         if reset_evalpts:
             self._surface_points = None
 
+    def __setattr__(self, name, value):
+        if name in _GEOMETRY_ATTRIBUTES:
+            self._geometry_changed()
+        super(Surface, self).__setattr__(name, value)
+
+    # Increments the geometry version, which invalidates the data derived from the surface geometry, e.g. the prepared
+    # evaluators. The in-place modifications of the geometry attributes must call this method explicitly.
+    def _geometry_changed(self):
+        super(Surface, self).__setattr__('_version', self.__dict__.get('_version', 0) + 1)
+
+    # Returns the buffer to store the evaluated points, None if the points are not going to be stored in a buffer
+    def _output_buffer(self, size, **kwargs):
+        out = kwargs.get('out', None)
+        if out is not None:
+            if len(out) < size:
+                raise ValueError("The output buffer must contain at least " + str(size) + " elements")
+            return out
+        if kwargs.get('buffer', False):
+            self._cache['evalpts_buffer'] = buffers.allocate(size, self._cache.get('evalpts_buffer'))
+            return self._cache['evalpts_buffer']
+        return None
+
     # Checks whether the surface evaluation is possible or not
     def _check_variables(self):
         works = True
@@ -803,6 +865,7 @@ class Multi(object):
         self._vis_component = None  # visualization component
         self._iter_index = 0  # iterator index
         self._instance = None  # type of the initial element
+        self._bbox_tree = None  # spatial index over the bounding boxes of the elements
 
     def __iter__(self):
         self._iter_index = 0
@@ -879,6 +942,8 @@ class Multi(object):
             warnings.warn("Cannot add, incompatible type.")
             return
         self._elements.append(element)
+        if self._bbox_tree is not None:
+            self._bbox_tree.insert(element.bbox, len(self._elements) - 1)
 
     def add_list(self, elements):
         """ Adds curve objects to the container.
@@ -901,6 +966,73 @@ class Multi(object):
         """
         for elem in self._elements:
             elem.translate(vec)
+        self.update_bbox()
+
+    @property
+    def bbox_tree(self):
+        """ Spatial index over the bounding boxes of the elements.
+
+        The index is generated on the first access and updated when new elements are added to the container.
+        The item identifiers stored in the index are the indices of the elements in the container.
+
+        :getter: Gets the spatial index
+        :type: spatial.BoundingBoxTree
+        """
+        if self._bbox_tree is None:
+            self._bbox_tree = spatial.BoundingBoxTree([elem.bbox for elem in self._elements])
+        return self._bbox_tree
+
+    def update_bbox(self, index=None):
+        """ Updates the spatial index after modifying the elements in the container.
+
+        :param index: index of the modified element; all elements are updated if it is not provided
+        :type index: int
+        """
+        if self._bbox_tree is None:
+            return
+        indices = range(len(self._elements)) if index is None else [index]
+        for idx in indices:
+            self._bbox_tree.update(idx, self._elements[idx].bbox)
+
+    def query_box(self, bbox):
+        """ Finds the elements whose bounding boxes overlap with the input bounding box.
+
+        :param bbox: bounding box defined by its minimum and maximum points
+        :type bbox: list, tuple
+        :return: list of element indices
+        :rtype: list
+        """
+        return sorted(self.bbox_tree.query_box(bbox))
+
+    def query_sphere(self, center, radius):
+        """ Finds the elements whose bounding boxes overlap with the sphere.
+
+        :param center: center of the sphere
+        :type center: list, tuple
+        :param radius: radius of the sphere
+        :type radius: float
+        :return: list of element indices
+        :rtype: list
+        """
+        return sorted(self.bbox_tree.query_sphere(center, radius))
+
+    def nearest(self, point):
+        """ Finds the element whose bounding box is nearest to the input point.
+
+        :param point: query point
+        :type point: list, tuple
+        :return: element index and the distance between the point and the bounding box of the element
+        :rtype: tuple
+        """
+        return self.bbox_tree.nearest(point)
+
+    def overlapping_pairs(self):
+        """ Finds all pairs of elements with overlapping bounding boxes.
+
+        :return: sorted list of element index pairs
+        :rtype: list
+        """
+        return sorted(self.bbox_tree.overlapping_pairs())
 
     # Runs visualization component to render the surface
     @abc.abstractmethod
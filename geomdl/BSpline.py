@@ -10,11 +10,17 @@
 from . import warnings
 from . import copy
 from . import pickle
+from . import bisect
 from . import Abstract
 from . import Multi
 from . import utilities
 from . import helpers
 from . import evaluators
+from . import buffers
+from . import quadrature
+from . import profiling
+from . import prepared
+from . import lod
 
 
 class Curve(Abstract.Curve):
@@ -39,6 +45,9 @@ class Curve(Abstract.Curve):
         self._curve_points = []
         self._bounding_box = []
         self._evaluator = evaluators.CurveEvaluator()
+        self._cache['arc_length'] = None
+        self._cache['span_elements'] = {}
+        self._cache['evalpts_params'] = None
 
     def __str__(self):
         return "B-Spline Curve"
@@ -122,6 +131,7 @@ class Curve(Abstract.Curve):
 
         # Clean up the surface points lists
         self.reset(evalpts=True)
+        self._cache['arc_length'] = None
 
         # Set knot vector
         self._knot_vector = [float(kv) for kv in value_normalized]
@@ -176,9 +186,18 @@ class Curve(Abstract.Curve):
         if reset_ctrlpts:
             del self._control_points[:]
             del self._bounding_box[:]
+            self._geometry_changed()
+            self._cache['arc_length'] = None
+            self._cache['span_elements'].clear()
 
         if reset_evalpts:
-            del self._curve_points[:]
+            # The evaluated points might be stored in a buffer, which is reused by the next evaluation
+            self._curve_points = []
+            self._cache['evalpts_params'] = None
+
+    def _evaluation_data(self):
+        # Returns the evaluator, the control points and the dimension to be used for the curve evaluation
+        return self._evaluator, self._control_points, self._dimension
 
     def curvept(self, u):
         """ Evaluates the curve at the given parameter.
@@ -195,14 +214,33 @@ class Curve(Abstract.Curve):
         utilities.check_uv(u)
 
         # Evaluate
-        cpt = self._evaluator.evaluate_single(knot=u,
-                                              degree=self.degree,
-                                              knotvector=self.knotvector,
-                                              ctrlpts=self._control_points,
-                                              dimension=self._dimension)
+        evaluator, ctrlpts, dimension = self._evaluation_data()
+        cpt = evaluator.evaluate_single(knot=u,
+                                        degree=self.degree,
+                                        knotvector=self.knotvector,
+                                        ctrlpts=ctrlpts,
+                                        dimension=dimension)
 
         return cpt
 
+    def prepare(self, **kwargs):
+        """ Generates a prepared evaluator for the repeated single point queries.
+
+        The prepared evaluator validates the curve once and evaluates the points and the derivatives with minimal
+        overhead. It is updated automatically when the curve is modified. Please see :class:`.prepared.PreparedCurve`
+        for details.
+
+        Keyword Arguments:
+            * ``polynomial``: converts the knot spans to polynomials, see :class:`.prepared.PolynomialCurve`.
+              *Default: False*
+
+        :return: prepared evaluator
+        :rtype: prepared.PreparedCurve
+        """
+        if kwargs.get('polynomial', False):
+            return prepared.PolynomialCurve(self)
+        return prepared.PreparedCurve(self)
+
     def evaluate(self, **kwargs):
         """ Evaluates the curve.
 
@@ -210,10 +248,19 @@ class Curve(Abstract.Curve):
 
         * ``start``: start parameter
         * ``stop``: stop parameter
+        * ``out``: writable buffer of double precision floats to store the evaluated points, e.g. ``array('d')``
+        * ``buffer``: if True, stores the evaluated points in a buffer owned by the curve. *Default: False*
 
         The ``start`` and ``stop`` parameters allow evaluation of a curve segment in the range *[start, stop]*, i.e.
         the curve will also be evaluated at the ``stop`` parameter value.
 
+        The ``out`` and ``buffer`` parameters store the evaluated points contiguously in a buffer, which is wrapped by
+        a :class:`.buffers.PointBuffer` instance. The ``out`` buffer must contain at least *sample_size * dimension*
+        elements. The buffer owned by the curve is reused by the next evaluations with ``buffer=True``, therefore the
+        points evaluated before are overwritten.
+        The evaluated points can be accessed without copying via :py:attr:`.buffers.PointBuffer.view`, e.g.
+        ``numpy.asarray(curve.evalpts.view)``, which is the supported zero-copy path. The view is flat on Python 2.x.
+
         .. note:: The evaluated curve points are stored in :py:attr:`~evalpts`.
 
         """
@@ -235,13 +282,19 @@ class Curve(Abstract.Curve):
         knots = utilities.linspace(start, stop, self.sample_size)
 
         # Evaluate
-        cpts = self._evaluator.evaluate(knots=knots,
-                                        degree=self.degree,
-                                        knotvector=self.knotvector,
-                                        ctrlpts=self._control_points,
-                                        dimension=self._dimension)
-
+        evaluator, ctrlpts, dimension = self._evaluation_data()
+        out = self._output_buffer(len(knots) * self.dimension, **kwargs)
+        cpts = evaluator.evaluate(knots=knots,
+                                  degree=self.degree,
+                                  knotvector=self.knotvector,
+                                  ctrlpts=ctrlpts,
+                                  dimension=dimension,
+                                  out=out)
+
+        if out is not None:
+            cpts = buffers.store(cpts, out, len(knots), self.dimension)
         self._curve_points = cpts
+        self._cache['evalpts_params'] = knots
 
     # Evaluates the curve derivative using "CurveDerivsAlg1" algorithm
     def derivatives2(self, u=-1, order=0):
@@ -494,6 +547,174 @@ class Curve(Abstract.Curve):
 
         return ret_list
 
+    # Arc length
+    def length(self, start=0.0, stop=1.0):
+        """ Computes the arc length of the curve between the input parameters.
+
+        The arc length is integrated using adaptive Gauss-Legendre quadrature on each knot span. The cumulative lengths
+        at the knots are computed once and cached, therefore the consecutive calls only integrate the partial knot spans
+        containing the input parameters.
+
+        :param start: start parameter
+        :type start: float
+        :param stop: stop parameter
+        :type stop: float
+        :return: arc length
+        :rtype: float
+        """
+        # Check u parameters are correct
+        utilities.check_uv(start)
+        utilities.check_uv(stop)
+
+        return self._arc_length(stop) - self._arc_length(start)
+
+    def param_at_length(self, length, tol=1e-10):
+        """ Finds the parameter corresponding to the input arc length measured from the start of the curve.
+
+        The knot span containing the parameter is found by a binary search on the cached arc length table and the
+        parameter is computed by Newton iteration safeguarded with bisection.
+
+        :param length: arc length
+        :type length: float
+        :param tol: tolerance of the arc length at the computed parameter
+        :type tol: float
+        :return: parameter
+        :rtype: float
+        """
+        knots, lengths = self._arc_length_table()
+        if length < 0.0 or length > lengths[-1] + tol:
+            raise ValueError("Arc length must be between 0 and " + str(lengths[-1]))
+
+        # Find the knot span containing the arc length
+        span = min(bisect.bisect_right(lengths, length), len(lengths) - 1)
+        start = knots[span - 1]
+        stop = knots[span]
+        target = length - lengths[span - 1]
+        span_length = lengths[span] - lengths[span - 1]
+        if span_length <= tol:
+            return start
+
+        # Newton iteration, falls back to bisection if the update leaves the bracket
+        u = start + (stop - start) * min(target / span_length, 1.0)
+        low = start
+        high = stop
+        for _ in range(50):
+            diff = quadrature.integrate(self._speed, start, u, self._arc_length_order()) - target
+            if abs(diff) <= tol:
+                break
+            if diff > 0.0:
+                high = u
+            else:
+                low = u
+            speed = self._speed(u)
+            u_new = u - (diff / speed) if speed > 0.0 else low
+            if not low < u_new < high:
+                u_new = (low + high) / 2.0
+            u = u_new
+
+        return u
+
+    def evaluate_by_length(self, spacing):
+        """ Evaluates the curve at points equally spaced along the curve.
+
+        The distance between the consecutive points measured along the curve is equal to the ``spacing``, except the
+        last point, which is always the end point of the curve.
+
+        .. note:: The evaluated curve points are stored in :py:attr:`~evalpts`.
+
+        :param spacing: arc length between the consecutive points
+        :type spacing: float
+        """
+        # Check all parameters are set before the curve evaluation
+        self._check_variables()
+        if spacing <= 0.0:
+            raise ValueError("Spacing must be a positive number")
+
+        # Generate the parameters of the equally spaced points
+        total = self.length()
+        lengths = [i * spacing for i in range(int(total / spacing) + 1)]
+        if total - lengths[-1] > spacing * 1e-6:
+            lengths.append(total)
+        else:
+            lengths[-1] = total
+        knots = [self.param_at_length(arc_length) for arc_length in lengths]
+
+        # Clean up the curve points
+        self.reset(evalpts=True)
+
+        # Evaluate
+        evaluator, ctrlpts, dimension = self._evaluation_data()
+        cpts = evaluator.evaluate(knots=knots,
+                                  degree=self.degree,
+                                  knotvector=self.knotvector,
+                                  ctrlpts=ctrlpts,
+                                  dimension=dimension)
+
+        self._curve_points = cpts
+        self._cache['evalpts_params'] = knots
+
+    def _speed(self, u):
+        return utilities.vector_magnitude(self.derivatives(u, order=1)[1])
+
+    def _arc_length_order(self):
+        # The speed is not a polynomial, use more quadrature points than the exact rule for the derivative requires
+        return self._degree + 4
+
+    def _arc_length_table(self):
+        # Computes the cumulative arc lengths at the distinct knots, if it is not cached. The knot spans are bisected
+        # until the quadrature converges, so that the partial spans can be integrated with the same rule.
+        if self._cache['arc_length'] is None:
+            self._check_variables()
+            order = self._arc_length_order()
+            knots = sorted(set(self._knot_vector[self._degree:-self._degree]))
+            table_knots = [knots[0]]
+            lengths = [0.0]
+            for start, stop in zip(knots[0:-1], knots[1:]):
+                stack = [(start, stop, quadrature.integrate(self._speed, start, stop, order), 0)]
+                while stack:
+                    a, b, whole, depth = stack.pop()
+                    mid = (a + b) / 2.0
+                    left = quadrature.integrate(self._speed, a, mid, order)
+                    right = quadrature.integrate(self._speed, mid, b, order)
+                    if abs(left + right - whole) <= 1e-10 * (left + right) or depth >= 20:
+                        table_knots.extend([mid, b])
+                        lengths.extend([lengths[-1] + left, lengths[-1] + left + right])
+                    else:
+                        stack.append((mid, b, right, depth + 1))
+                        stack.append((a, mid, left, depth + 1))
+            self._cache['arc_length'] = (table_knots, lengths)
+        return self._cache['arc_length']
+
+    def span_elements(self, **kwargs):
+        """ Returns the isogeometric analysis data on the knot span elements of the curve.
+
+        The elements contain the non-zero basis functions, their derivatives, the control point connectivity and the
+        Jacobians at the quadrature points. The elements are computed once for each set of keyword arguments and cached
+        until the control points or the knot vector of the curve are changed. Please see
+        :py:func:`.quadrature.curve_elements` for the keyword arguments.
+
+        :return: list of elements
+        :rtype: list
+        """
+        # Check all parameters are set before the curve evaluation
+        self._check_variables()
+
+        num = kwargs.get('num', self._degree + 1)
+        cached = self._cache['span_elements'].get(num)
+        if cached is None or cached[0] != self._knot_vector:
+            profiling.count('cache.span_elements.misses')
+            cached = (list(self._knot_vector), quadrature.curve_elements(self, num=num))
+            self._cache['span_elements'][num] = cached
+        else:
+            profiling.count('cache.span_elements.hits')
+        return cached[1]
+
+    def _arc_length(self, u):
+        # Computes the arc length from the start of the curve to the input parameter
+        knots, lengths = self._arc_length_table()
+        span = min(max(bisect.bisect_right(knots, u), 1), len(knots) - 1)
+        return lengths[span - 1] + quadrature.integrate(self._speed, knots[span - 1], u, self._arc_length_order())
+
     # Knot insertion
     def insert_knot(self, u, r=1, check_r=True):
         """ Inserts the given knot and updates the control points array and the knot vector.
@@ -573,6 +794,130 @@ class Curve(Abstract.Curve):
         if check_r and self._curve_points:
             self.evaluate()
 
+    def remove_knot(self, u, r=1, **kwargs):
+        """ Removes the given knot and updates the control points array and the knot vector.
+
+        Implements Algorithm A5.8 of *The NURBS Book*. The knot is removed only if the curve shape changes less than
+        the tolerance, therefore the number of removals could be less than the requested number.
+
+        Keyword Arguments:
+            * ``tol``: maximum allowed deviation from the original curve. *Default: 0.0001*
+
+        :param u: knot to be removed
+        :type u: float
+        :param r: number of knot removals
+        :type r: int
+        :return: number of knots removed
+        :rtype: int
+        """
+        # Check all parameters are set before the curve evaluation
+        self._check_variables()
+        # Check u parameters are correct
+        utilities.check_uv(u)
+        # Check if the number of knot removals requested is valid
+        if not isinstance(r, int) or r < 0:
+            raise ValueError('Number of removals (r) must be a positive integer value')
+
+        s = helpers.find_multiplicity(u, self._knot_vector, tol=0.0)
+        if s == 0 or u in (self._knot_vector[0], self._knot_vector[-1]):
+            warnings.warn("Cannot remove knot " + str(u))
+            return 0
+
+        tol = self._knot_removal_tolerance(kwargs.get('tol', 0.0001))
+        is_evaluated = bool(self._curve_points)
+
+        # Algorithm A5.8
+        kv_new, ctrlpts_new = helpers.knot_removal(self._degree, self._knot_vector, self._control_points, u, r, tol=tol)
+        num_removed = len(self._knot_vector) - len(kv_new)
+        if num_removed < r:
+            warnings.warn("Knot " + str(u) + " could only be removed " + str(num_removed) + " times")
+        if num_removed == 0:
+            return 0
+
+        # Update class variables
+        self.set_ctrlpts(ctrlpts_new)
+        self._knot_vector = kv_new
+
+        # Evaluate curve again if it has already been evaluated before knot removal
+        if is_evaluated:
+            self.evaluate()
+
+        return num_removed
+
+    def reduce(self, tolerance=0.001):
+        """ Removes all knots that can be removed without changing the curve shape more than the tolerance.
+
+        The knots are removed one at a time using Algorithm A5.8 of *The NURBS Book*, while keeping track of the
+        accumulated deviation on each knot span of the original curve.
+
+        :param tolerance: maximum allowed deviation from the original curve
+        :type tolerance: float
+        :return: upper bound of the deviation between the reduced and the original curve
+        :rtype: float
+        """
+        # Check all parameters are set before the curve evaluation
+        self._check_variables()
+
+        tol = self._knot_removal_tolerance(tolerance)
+        is_evaluated = bool(self._curve_points)
+
+        kv_new, ctrlpts_new, error = helpers.reduce_curve(self._degree, self._knot_vector, self._control_points, tol)
+
+        # Update class variables
+        self.set_ctrlpts(ctrlpts_new)
+        self._knot_vector = kv_new
+
+        # Evaluate curve again if it has already been evaluated before the reduction
+        if is_evaluated:
+            self.evaluate()
+
+        return error * tolerance / tol if tol > 0 else error
+
+    def _knot_removal_tolerance(self, tolerance):
+        # Weighted control points require a smaller tolerance (Eq. 5.30 of The NURBS Book)
+        if not self._rational:
+            return tolerance
+        weights = [pt[-1] for pt in self._control_points]
+        dist_max = max([utilities.vector_magnitude([c / pt[-1] for c in pt[:-1]]) for pt in self._control_points])
+        return tolerance * min(weights) / (1.0 + dist_max)
+
+    # Knot refinement
+    def refine_knotvector(self, knots=()):
+        """ Inserts multiple knots and updates the control points array and the knot vector in a single pass.
+
+        Implements Algorithm A5.4 of *The NURBS Book*. Repeating a knot in the input list inserts it multiple times.
+
+        :param knots: knots to be inserted
+        :type knots: list, tuple
+        """
+        # Check all parameters are set before the curve evaluation
+        self._check_variables()
+
+        if not knots or not isinstance(knots, (list, tuple)):
+            raise ValueError("Input knots must be a list or a tuple of floats")
+
+        knot_list = sorted([float(k) for k in knots])
+        utilities.check_uv(knot_list[0])
+        utilities.check_uv(knot_list[-1])
+
+        # Check if the final knot multiplicities are valid
+        knot = helpers.check_multiplicity(self._degree, self._knot_vector, knot_list)
+        if knot is not None:
+            raise ValueError("Cannot insert knot " + str(knot) + " more than " + str(self._degree) + " times")
+
+        is_evaluated = bool(self._curve_points)
+
+        # Algorithm A5.4
+        kv_new, ctrlpts_new = helpers.knot_refinement(self._degree, self._knot_vector, self._control_points, knot_list)
+
+        # Update class variables
+        self.set_ctrlpts(ctrlpts_new)
+        self._knot_vector = kv_new
+
+        # Evaluate curve again if it has already been evaluated before knot refinement
+        if is_evaluated:
+            self.evaluate()
+
     def split(self, u=-1):
         """ Splits the curve at the input parametric coordinate.
 
@@ -640,21 +985,40 @@ class Curve(Abstract.Curve):
     def decompose(self):
         """ Decomposes the curve into Bezier curve segments of the same degree.
 
-        This operation does not modify the curve, instead it returns the split curve segments.
+        Implements Algorithm A5.6 of *The NURBS Book*, which extracts all Bezier segments in a single pass over the
+        control points.
+
+        This operation does not modify the curve, instead it returns the split curve segments. The segments are
+        complete curve objects and each segment owns a copy of its control points, i.e. the segments do not share a
+        coefficient buffer. This keeps the segments compatible with all curve operations, while the memory usage is
+        proportional to the number of segments times the degree. The segments use the evaluator and the sampling
+        settings of the curve.
 
         :return: a list of curve objects arranged in Bezier curve segments
         :rtype: Multi.MultiCurve
         """
+        # Check all parameters are set before the curve decomposition
+        self._check_variables()
+
+        # Algorithm A5.6
+        segments = helpers.decompose_curve(self._degree, self._knot_vector, self._control_points)
+
+        # All Bezier segments share the same knot vector
+        knot_vector = [0.0 for _ in range(self._degree + 1)] + [1.0 for _ in range(self._degree + 1)]
+
+        # The segments are already consistent, so there is no need to use the validating setters
         curve_list = Multi.MultiCurve()
-        curve = copy.deepcopy(self)
-        knots = curve.knotvector[curve.degree + 1:-(curve.degree + 1)]
-        while knots:
-            knot = knots[0]
-            curves = curve.split(u=knot)
-            curve_list.add(curves[0])
-            curve = curves[1]
-            knots = curve.knotvector[curve.degree + 1:-(curve.degree + 1)]
-        curve_list.add(curve)
+        for ctrlpts in segments:
+            curve = self.__class__()
+            curve._degree = self._degree
+            curve._dimension = self._dimension
+            curve._control_points = [list(pt) for pt in ctrlpts]
+            curve._knot_vector = list(knot_vector)
+            # Keep the evaluator and the sampling settings of the curve
+            curve._evaluator = self._evaluator
+            curve._delta = self._delta
+            curve._sample_size = self._sample_size
+            curve_list.add(curve)
 
         return curve_list
 
@@ -741,6 +1105,9 @@ class Surface(Abstract.Surface):
         self._surface_points = []
         self._bounding_box = []
         self._evaluator = evaluators.SurfaceEvaluator()
+        self._cache['quadrature'] = {}
+        self._cache['span_elements'] = {}
+        self._cache['evalpts_params'] = None
 
     def __str__(self):
         return "B-Spline Surface"
@@ -964,6 +1331,7 @@ class Surface(Abstract.Surface):
 
         # Clean up the surface points
         self.reset(evalpts=True)
+        self._cache['quadrature'].clear()
 
         # Set knot vector u
         self._knot_vector_u = [float(kv) for kv in value_normalized]
@@ -992,6 +1360,7 @@ class Surface(Abstract.Surface):
 
         # Clean up the surface points
         self.reset(evalpts=True)
+        self._cache['quadrature'].clear()
 
         # Set knot vector v
         self._knot_vector_v = [float(kv) for kv in value_normalized]
@@ -1055,12 +1424,17 @@ class Surface(Abstract.Surface):
         if reset_ctrlpts:
             del self._control_points[:]
             del self._control_points2D[:]
+            self._geometry_changed()
             self._control_points_size_u = 0
             self._control_points_size_v = 0
             del self._bounding_box[:]
+            self._cache['quadrature'].clear()
+            self._cache['span_elements'].clear()
 
         if reset_evalpts:
-            del self._surface_points[:]
+            # The evaluated points might be stored in a buffer, which is reused by the next evaluation
+            self._surface_points = []
+            self._cache['evalpts_params'] = None
 
     def transpose(self):
         """ Transposes the surface by swapping U and V directions. """
@@ -1086,6 +1460,8 @@ class Surface(Abstract.Surface):
 
         # Clean up the surface points
         self.reset(evalpts=True)
+        self._cache['quadrature'].clear()
+        self._cache['span_elements'].clear()
 
         # Save transposed data
         self._degree_u = degree_u_new
@@ -1097,6 +1473,10 @@ class Surface(Abstract.Surface):
         self._control_points_size_v = ctrlpts_new_size_v
         self._control_points2D = ctrlpts2d_new
 
+    def _evaluation_data(self):
+        # Returns the evaluator, the control points and the dimension to be used for the surface evaluation
+        return self._evaluator, self._control_points2D, self._dimension
+
     def surfpt(self, u, v):
         """ Evaluates the surface at the given (u,v) parameter.
 
@@ -1114,15 +1494,47 @@ class Surface(Abstract.Surface):
         utilities.check_uv(u, v)
 
         # Evaluate the surface
-        spt = self._evaluator.evaluate_single(knot_u=u, knot_v=v,
-                                              degree_u=self.degree_u, degree_v=self.degree_v,
-                                              knotvector_u=self.knotvector_u, knotvector_v=self.knotvector_v,
-                                              ctrlpts_size_u=self.ctrlpts_size_u, ctrlpts_size_v=self.ctrlpts_size_v,
-                                              ctrlpts=self._control_points2D,
-                                              dimension=self._dimension)
+        evaluator, ctrlpts, dimension = self._evaluation_data()
+        spt = evaluator.evaluate_single(knot_u=u, knot_v=v,
+                                        degree_u=self.degree_u, degree_v=self.degree_v,
+                                        knotvector_u=self.knotvector_u, knotvector_v=self.knotvector_v,
+                                        ctrlpts_size_u=self.ctrlpts_size_u, ctrlpts_size_v=self.ctrlpts_size_v,
+                                        ctrlpts=ctrlpts,
+                                        dimension=dimension)
 
         return spt
 
+    def prepare(self, **kwargs):
+        """ Generates a prepared evaluator for the repeated single point queries.
+
+        The prepared evaluator validates the surface once and evaluates the points and the derivatives with minimal
+        overhead. It is updated automatically when the surface is modified. Please see
+        :class:`.prepared.PreparedSurface` for details.
+
+        Keyword Arguments:
+            * ``polynomial``: converts the knot span patches to polynomials, see :class:`.prepared.PolynomialSurface`.
+              *Default: False*
+
+        :return: prepared evaluator
+        :rtype: prepared.PreparedSurface
+        """
+        if kwargs.get('polynomial', False):
+            return prepared.PolynomialSurface(self)
+        return prepared.PreparedSurface(self)
+
+    def pyramid(self, base_size=33):
+        """ Generates a level of detail pyramid of the evaluated surface points.
+
+        The surface is evaluated at the base level and the other levels are generated on demand by reusing the
+        evaluated points. Please see :class:`.lod.Pyramid` for details.
+
+        :param base_size: number of points of the base level in each direction
+        :type base_size: int
+        :return: level of detail pyramid
+        :rtype: lod.Pyramid
+        """
+        return lod.Pyramid(self, base_size)
+
     def evaluate(self, **kwargs):
         """ Evaluates the surface.
 
@@ -1133,10 +1545,20 @@ class Surface(Abstract.Surface):
         * ``start_v``: start parameter in v-direction
         * ``stop_v``: stop parameter in v-direction
 
+        * ``out``: writable buffer of double precision floats to store the evaluated points, e.g. ``array('d')``
+        * ``buffer``: if True, stores the evaluated points in a buffer owned by the surface. *Default: False*
+
         The ``start_u``, ``start_v`` and ``stop_u`` and ``stop_v`` parameters allow evaluation of a surface segment
         in the range  *[start_u, stop_u][start_v, stop_v]* i.e. the surface will also be evaluated at the ``stop_u``
         and ``stop_v`` parameter values.
 
+        The ``out`` and ``buffer`` parameters store the evaluated points contiguously in a buffer, which is wrapped by
+        a :class:`.buffers.PointBuffer` instance. The ``out`` buffer must contain at least *sample_size^2 * dimension*
+        elements. The buffer owned by the surface is reused by the next evaluations with ``buffer=True``, therefore
+        the points evaluated before are overwritten.
+        The evaluated points can be accessed without copying via :py:attr:`.buffers.PointBuffer.view`, e.g.
+        ``numpy.asarray(surf.evalpts.view)``, which is the supported zero-copy path. The view is flat on Python 2.x.
+
         .. note:: The evaluated surface points are stored in :py:attr:`~evalpts`.
 
         """
@@ -1160,14 +1582,94 @@ class Surface(Abstract.Surface):
         knots_u = utilities.linspace(start_u, stop_u, self.sample_size)
         knots_v = utilities.linspace(start_v, stop_v, self.sample_size)
 
-        spts = self._evaluator.evaluate(knots_u=knots_u, knots_v=knots_v,
-                                        degree_u=self.degree_u, degree_v=self.degree_v,
-                                        knotvector_u=self.knotvector_u, knotvector_v=self.knotvector_v,
-                                        ctrlpts_size_u=self.ctrlpts_size_u, ctrlpts_size_v=self.ctrlpts_size_v,
-                                        ctrlpts=self._control_points2D,
-                                        dimension=self._dimension)
-
+        evaluator, ctrlpts, dimension = self._evaluation_data()
+        num_points = len(knots_u) * len(knots_v)
+        out = self._output_buffer(num_points * self.dimension, **kwargs)
+        spts = evaluator.evaluate(knots_u=knots_u, knots_v=knots_v,
+                                  degree_u=self.degree_u, degree_v=self.degree_v,
+                                  knotvector_u=self.knotvector_u, knotvector_v=self.knotvector_v,
+                                  ctrlpts_size_u=self.ctrlpts_size_u, ctrlpts_size_v=self.ctrlpts_size_v,
+                                  ctrlpts=ctrlpts,
+                                  dimension=dimension,
+                                  out=out)
+
+        if out is not None:
+            spts = buffers.store(spts, out, num_points, self.dimension)
         self._surface_points = spts
+        self._cache['evalpts_params'] = (knots_u, knots_v)
+
+    def evaluate_to_file(self, file_name, **kwargs):
+        """ Evaluates the surface tile by tile and writes the evaluated points into a memory-mapped file.
+
+        This method is intended for very large sample sizes. The parametric grid is split into square tiles and each
+        tile is evaluated into a reusable buffer, which is then copied into the memory-mapped output file. Therefore,
+        the peak memory usage is bounded by the tile size instead of the number of evaluated points. Please see
+        :class:`.buffers.MappedPoints` for the file format.
+
+        Keyword arguments:
+
+        * ``sample_size``: number of evaluated points in each parametric direction. *Default: sample_size*
+        * ``tile_size``: number of points in each direction of a tile. *Default: 256*
+        * ``typecode``: ``d`` for double and ``f`` for single precision coordinates. *Default: d*
+        * ``start_u``, ``stop_u``, ``start_v`` and ``stop_v``: evaluation range, same as :py:meth:`~evaluate`
+
+        The evaluated points are not stored in :py:attr:`~evalpts`. The returned file object should be closed after use.
+
+        :param file_name: name of the output file
+        :type file_name: str
+        :return: evaluated points opened for reading
+        :rtype: buffers.MappedPoints
+        """
+        # Check all parameters are set before the surface evaluation
+        self._check_variables()
+
+        sample_size = kwargs.get('sample_size', self.sample_size)
+        tile_size = kwargs.get('tile_size', 256)
+        typecode = kwargs.get('typecode', 'd')
+        if sample_size < 2 or tile_size < 1:
+            raise ValueError("Sample size must be bigger than 1 and tile size must be a positive integer")
+
+        # Find evaluation start and stop parameter values
+        start_u = kwargs.get('start_u', self.knotvector_u[self.degree_u])
+        stop_u = kwargs.get('stop_u', self.knotvector_u[-(self.degree_u+1)])
+        start_v = kwargs.get('start_v', self.knotvector_v[self.degree_v])
+        stop_v = kwargs.get('stop_v', self.knotvector_v[-(self.degree_v+1)])
+
+        # Check if all the input parameters are in the range
+        utilities.check_uv(start_u, stop_u)
+        utilities.check_uv(start_v, stop_v)
+
+        # Compute knots in the range
+        knots_u = utilities.linspace(start_u, stop_u, sample_size)
+        knots_v = utilities.linspace(start_v, stop_v, sample_size)
+
+        evaluator, ctrlpts, dimension = self._evaluation_data()
+        points = buffers.create_point_file(file_name, len(knots_u), len(knots_v), self.dimension, typecode,
+                                           (start_u, stop_u, start_v, stop_v))
+        tile = buffers.allocate(tile_size * tile_size * self.dimension)
+        try:
+            for i in range(0, len(knots_u), tile_size):
+                tile_u = knots_u[i:(i + tile_size)]
+                for j in range(0, len(knots_v), tile_size):
+                    tile_v = knots_v[j:(j + tile_size)]
+                    spts = evaluator.evaluate(knots_u=tile_u, knots_v=tile_v,
+                                              degree_u=self.degree_u, degree_v=self.degree_v,
+                                              knotvector_u=self.knotvector_u, knotvector_v=self.knotvector_v,
+                                              ctrlpts_size_u=self.ctrlpts_size_u, ctrlpts_size_v=self.ctrlpts_size_v,
+                                              ctrlpts=ctrlpts,
+                                              dimension=dimension,
+                                              out=tile)
+                    buffers.store(spts, tile, len(tile_u) * len(tile_v), self.dimension)
+
+                    # Copy the rows of the tile into the file
+                    row_size = len(tile_v) * self.dimension
+                    for k in range(len(tile_u)):
+                        points.write(((i + k) * len(knots_v)) + j, tile[(k * row_size):((k + 1) * row_size)])
+            points.flush()
+        finally:
+            points.close()
+
+        return buffers.MappedPoints(file_name)
 
     # Evaluates n-th order surface derivatives at the given (u,v) parameter
     def derivatives(self, u=-1, v=-1, order=0):
@@ -1344,6 +1846,63 @@ class Surface(Abstract.Surface):
 
         return ret_list
 
+    def quadrature(self, **kwargs):
+        """ Returns the Gauss-Legendre quadrature on the knot span elements of the surface.
+
+        The quadrature tables are computed once for each set of keyword arguments and cached until the control points
+        or the knot vectors of the surface are changed. Please see :py:class:`.quadrature.SurfaceQuadrature` for the
+        keyword arguments and the available integrals.
+
+        :return: surface quadrature
+        :rtype: quadrature.SurfaceQuadrature
+        """
+        # Check all parameters are set before the surface evaluation
+        self._check_variables()
+
+        num_u = kwargs.get('num_u', self._degree_u + 2)
+        num_v = kwargs.get('num_v', self._degree_v + 2)
+        if (num_u, num_v) not in self._cache['quadrature']:
+            profiling.count('cache.quadrature.misses')
+            self._cache['quadrature'][(num_u, num_v)] = quadrature.SurfaceQuadrature(self, num_u=num_u, num_v=num_v)
+        else:
+            profiling.count('cache.quadrature.hits')
+        return self._cache['quadrature'][(num_u, num_v)]
+
+    def area(self):
+        """ Computes the surface area using Gauss-Legendre quadrature.
+
+        :return: surface area
+        :rtype: float
+        """
+        return self.quadrature().area()
+
+    def span_elements(self, **kwargs):
+        """ Returns the isogeometric analysis data on the knot span elements of the surface.
+
+        The elements contain the non-zero basis functions, their derivatives, the control point connectivity and the
+        Jacobians at the quadrature points. The elements are computed once for each set of keyword arguments and cached
+        until the control points or the knot vectors of the surface are changed. Please see
+        :py:func:`.quadrature.surface_elements` for the keyword arguments.
+
+        :return: list of elements
+        :rtype: list
+        """
+        # Check all parameters are set before the surface evaluation
+        self._check_variables()
+
+        num_u = kwargs.get('num_u', self._degree_u + 1)
+        num_v = kwargs.get('num_v', self._degree_v + 1)
+        knot_vectors = (self._knot_vector_u, self._knot_vector_v)
+        cached = self._cache['span_elements'].get((num_u, num_v))
+        if cached is None or cached[0] != knot_vectors:
+            profiling.count('cache.span_elements.misses')
+            cached = ((list(self._knot_vector_u), list(self._knot_vector_v)),
+                      quadrature.surface_elements(self, num_u=num_u, num_v=num_v))
+            self._cache['span_elements'][(num_u, num_v)] = cached
+        else:
+            profiling.count('cache.span_elements.hits')
+        return cached[1]
+
     # Insert knot 'r' times at the given (u, v) parametric coordinates
     def insert_knot(self, u=None, v=None, ru=1, rv=1, check_r=True):
         """ Inserts the given knots and updates the control points array and the knot vectors.
@@ -1522,6 +2081,205 @@ class Surface(Abstract.Surface):
         if check_r and self._surface_points:
             self.evaluate()
 
+    # Knot removal
+    def remove_knot(self, u=None, v=None, ru=1, rv=1, **kwargs):
+        """ Removes the given knots and updates the control points array and the knot vectors.
+
+        Implements Algorithm A5.8 of *The NURBS Book* (surface version). The knot is removed from all rows (or
+        columns) of the control points grid together, only if the surface shape changes less than the tolerance.
+        Therefore, the number of removals could be less than the requested number.
+
+        Keyword Arguments:
+            * ``tol``: maximum allowed deviation from the original surface. *Default: 0.0001*
+
+        :param u: knot to be removed in U-direction
+        :type u: float
+        :param v: knot to be removed in V-direction
+        :type v: float
+        :param ru: number of knot removals in U-direction
+        :type ru: int
+        :param rv: number of knot removals in V-direction
+        :type rv: int
+        :return: number of knots removed in U- and V-directions
+        :rtype: tuple
+        """
+        # Check all parameters are set before the surface evaluation
+        self._check_variables()
+
+        # Check if the parameter values are correctly defined
+        if u is not None or v is not None:
+            utilities.check_uv(u, v)
+
+        if not isinstance(ru, int) or ru < 0:
+            raise ValueError("Number of removals in U-direction must be a positive integer")
+        if not isinstance(rv, int) or rv < 0:
+            raise ValueError("Number of removals in V-direction must be a positive integer")
+
+        tol = self._knot_removal_tolerance(kwargs.get('tol', 0.0001))
+        is_evaluated = bool(self._surface_points)
+        kv_u = self._knot_vector_u
+        kv_v = self._knot_vector_v
+        size_u = self._control_points_size_u
+        size_v = self._control_points_size_v
+        dim = self._dimension
+        ctrlpts2d = self._control_points2D
+
+        # Algorithm A5.8, U-direction: each row of v control points is processed as a single point
+        if u is not None:
+            if helpers.find_multiplicity(u, kv_u, tol=0.0) == 0 or u in (kv_u[0], kv_u[-1]):
+                warnings.warn("Cannot remove knot " + str(u) + " in the U direction")
+            else:
+                rows = [[c for pt in ctrlpts2d[i] for c in pt] for i in range(size_u)]
+                kv_u, rows = helpers.knot_removal(self._degree_u, kv_u, rows, u, ru, tol=tol, dimension=dim)
+                size_u = len(rows)
+                ctrlpts2d = [[row[j * dim:(j + 1) * dim] for j in range(size_v)] for row in rows]
+                if self._control_points_size_u - size_u < ru:
+                    warnings.warn("Knot " + str(u) + " could only be removed " +
+                                  str(self._control_points_size_u - size_u) + " times in the U direction")
+
+        # Algorithm A5.8, V-direction: each column of u control points is processed as a single point
+        if v is not None:
+            if helpers.find_multiplicity(v, kv_v, tol=0.0) == 0 or v in (kv_v[0], kv_v[-1]):
+                warnings.warn("Cannot remove knot " + str(v) + " in the V direction")
+            else:
+                cols = [[c for i in range(size_u) for c in ctrlpts2d[i][j]] for j in range(size_v)]
+                kv_v, cols = helpers.knot_removal(self._degree_v, kv_v, cols, v, rv, tol=tol, dimension=dim)
+                size_v = len(cols)
+                ctrlpts2d = [[col[i * dim:(i + 1) * dim] for col in cols] for i in range(size_u)]
+                if self._control_points_size_v - size_v < rv:
+                    warnings.warn("Knot " + str(v) + " could only be removed " +
+                                  str(self._control_points_size_v - size_v) + " times in the V direction")
+
+        num_removed = (self._control_points_size_u - size_u, self._control_points_size_v - size_v)
+        if num_removed == (0, 0):
+            return num_removed
+
+        # Update class variables
+        self.set_ctrlpts([pt for row in ctrlpts2d for pt in row], size_u, size_v)
+        self._knot_vector_u = kv_u
+        self._knot_vector_v = kv_v
+
+        # Evaluate surface again if it has already been evaluated before knot removal
+        if is_evaluated:
+            self.evaluate()
+
+        return num_removed
+
+    def reduce(self, tolerance=0.001):
+        """ Removes all knots that can be removed without changing the surface shape more than the tolerance.
+
+        The knots are removed one at a time using Algorithm A5.8 of *The NURBS Book*, first in U-direction and then in
+        V-direction. Half of the tolerance is reserved for each direction and the unused part of the U-direction
+        tolerance is carried over to V-direction.
+
+        :param tolerance: maximum allowed deviation from the original surface
+        :type tolerance: float
+        :return: upper bound of the deviation between the reduced and the original surface
+        :rtype: float
+        """
+        # Check all parameters are set before the surface evaluation
+        self._check_variables()
+
+        tol = self._knot_removal_tolerance(tolerance)
+        is_evaluated = bool(self._surface_points)
+        size_u = self._control_points_size_u
+        size_v = self._control_points_size_v
+        dim = self._dimension
+
+        # U-direction: each row of v control points is processed as a single point
+        rows = [[c for pt in self._control_points2D[i] for c in pt] for i in range(size_u)]
+        kv_u, rows, error_u = helpers.reduce_curve(self._degree_u, self._knot_vector_u, rows, tol / 2.0,
+                                                   dimension=dim)
+        size_u = len(rows)
+
+        # V-direction: each column of u control points is processed as a single point
+        cols = [[c for row in rows for c in row[j * dim:(j + 1) * dim]] for j in range(size_v)]
+        kv_v, cols, error_v = helpers.reduce_curve(self._degree_v, self._knot_vector_v, cols, tol - error_u,
+                                                   dimension=dim)
+        size_v = len(cols)
+
+        # Update class variables
+        self.set_ctrlpts([col[i * dim:(i + 1) * dim] for i in range(size_u) for col in cols], size_u, size_v)
+        self._knot_vector_u = kv_u
+        self._knot_vector_v = kv_v
+
+        # Evaluate surface again if it has already been evaluated before the reduction
+        if is_evaluated:
+            self.evaluate()
+
+        error = error_u + error_v
+        return error * tolerance / tol if tol > 0 else error
+
+    def _knot_removal_tolerance(self, tolerance):
+        # Weighted control points require a smaller tolerance (Eq. 5.30 of The NURBS Book)
+        if not self._rational:
+            return tolerance
+        weights = [pt[-1] for pt in self._control_points]
+        dist_max = max([utilities.vector_magnitude([c / pt[-1] for c in pt[:-1]]) for pt in self._control_points])
+        return tolerance * min(weights) / (1.0 + dist_max)
+
+    def refine_knotvector(self, knots_u=(), knots_v=()):
+        """ Inserts multiple knots and updates the control points array and the knot vectors in a single pass.
+
+        Implements Algorithm A5.4 of *The NURBS Book* (surface version). All rows (or columns) of the control points
+        grid are refined together. Repeating a knot in the input lists inserts it multiple times.
+
+        :param knots_u: knots to be inserted in U-direction
+        :type knots_u: list, tuple
+        :param knots_v: knots to be inserted in V-direction
+        :type knots_v: list, tuple
+        """
+        # Check all parameters are set before the surface evaluation
+        self._check_variables()
+
+        if not isinstance(knots_u, (list, tuple)) or not isinstance(knots_v, (list, tuple)):
+            raise ValueError("Input knots must be a list or a tuple of floats")
+
+        knot_list_u = sorted([float(k) for k in knots_u])
+        knot_list_v = sorted([float(k) for k in knots_v])
+        for knot_list, kv, degree, direction in ((knot_list_u, self._knot_vector_u, self._degree_u, "U"),
+                                                 (knot_list_v, self._knot_vector_v, self._degree_v, "V")):
+            if not knot_list:
+                continue
+            utilities.check_uv(knot_list[0])
+            utilities.check_uv(knot_list[-1])
+            # Check if the final knot multiplicities are valid
+            knot = helpers.check_multiplicity(degree, kv, knot_list)
+            if knot is not None:
+                raise ValueError("Cannot insert knot " + str(knot) + " more than " + str(degree) +
+                                 " times in the " + direction + " direction")
+
+        is_evaluated = bool(self._surface_points)
+        kv_u = self._knot_vector_u
+        kv_v = self._knot_vector_v
+        size_u = self._control_points_size_u
+        size_v = self._control_points_size_v
+        dim = self._dimension
+        ctrlpts2d = self._control_points2D
+
+        # Algorithm A5.4, U-direction: each row of v control points is processed as a single point
+        if knot_list_u:
+            rows = [[c for pt in ctrlpts2d[i] for c in pt] for i in range(size_u)]
+            kv_u, rows = helpers.knot_refinement(self._degree_u, kv_u, rows, knot_list_u)
+            size_u = len(rows)
+            ctrlpts2d = [[row[j * dim:(j + 1) * dim] for j in range(size_v)] for row in rows]
+
+        # Algorithm A5.4, V-direction: each column of u control points is processed as a single point
+        if knot_list_v:
+            cols = [[c for i in range(size_u) for c in ctrlpts2d[i][j]] for j in range(size_v)]
+            kv_v, cols = helpers.knot_refinement(self._degree_v, kv_v, cols, knot_list_v)
+            size_v = len(cols)
+            ctrlpts2d = [[col[i * dim:(i + 1) * dim] for col in cols] for i in range(size_u)]
+
+        # Update class variables
+        self.set_ctrlpts([pt for row in ctrlpts2d for pt in row], size_u, size_v)
+        self._knot_vector_u = kv_u
+        self._knot_vector_v = kv_v
+
+        # Evaluate surface again if it has already been evaluated before knot refinement
+        if is_evaluated:
+            self.evaluate()
+
     def split_u(self, t=-1):
         """ Splits the surface at the input parametric coordinate in U-direction.
 
@@ -1675,37 +2433,59 @@ class Surface(Abstract.Surface):
     def decompose(self):
         """ Decomposes the surface into Bezier surface patches of the same degree.
 
-        This operation does not modify the surface, instead it returns the surface patches.
+        Implements Algorithm A5.6 of *The NURBS Book* in both parametric directions. All rows of the control points
+        grid are decomposed together in U-direction and then, all columns of each resulting strip are decomposed
+        together in V-direction.
+
+        This operation does not modify the surface, instead it returns the surface patches. The patches are
+        complete surface objects and each patch owns a copy of its control points, i.e. the patches do not share a
+        coefficient buffer. This keeps the patches compatible with all surface operations, while the memory usage is
+        proportional to the number of patches times the number of control points of a patch. The patches use the
+        evaluator and the sampling settings of the surface.
 
         :return: a list of surface objects arranged as Bezier surface patches
         :rtype: Multi.MultiSurface
         """
-        surf_list = []
-
-        # Work with an identical copy
-        surf = copy.deepcopy(self)
-
-        # U-direction
-        knots_u = surf.knotvector_u[surf.degree_u + 1:-(surf.degree_u + 1)]
-        while knots_u:
-            knot = knots_u[0]
-            surfs = surf.split_u(t=knot)
-            surf_list.append(surfs[0])
-            surf = surfs[1]
-            knots_u = surf.knotvector_u[surf.degree_u + 1:-(surf.degree_u + 1)]
-        surf_list.append(surf)
-
-        # Work on the split surfaces in V-direction
+        # Check all parameters are set before the surface decomposition
+        self._check_variables()
+
+        p = self._degree_u
+        q = self._degree_v
+        dim = self._dimension
+        size_v = self._control_points_size_v
+
+        # All Bezier patches share the same knot vectors
+        knot_vector_u = [0.0 for _ in range(p + 1)] + [1.0 for _ in range(p + 1)]
+        knot_vector_v = [0.0 for _ in range(q + 1)] + [1.0 for _ in range(q + 1)]
+
+        # U-direction: each row of v control points is processed as a single point
+        rows = [[c for pt in row for c in pt] for row in self._control_points2D]
+        strips = helpers.decompose_curve(p, self._knot_vector_u, rows)
+
         multi_surf = Multi.MultiSurface()
-        for surf in surf_list:
-            knots_v = surf.knotvector_v[surf.degree_v + 1:-(surf.degree_v + 1)]
-            while knots_v:
-                knot = knots_v[0]
-                surfs = surf.split_v(t=knot)
-                multi_surf.add(surfs[0])
-                surf = surfs[1]
-                knots_v = surf.knotvector_v[surf.degree_v + 1:-(surf.degree_v + 1)]
-            multi_surf.add(surf)
+        for strip in strips:
+            # V-direction: each column of u control points is processed as a single point
+            cols = [[c for row in strip for c in row[j * dim:(j + 1) * dim]] for j in range(size_v)]
+            patches = helpers.decompose_curve(q, self._knot_vector_v, cols)
+
+            # The patches are already consistent, so there is no need to use the validating setters
+            for patch in patches:
+                surf = self.__class__()
+                surf._degree_u = p
+                surf._degree_v = q
+                surf._dimension = dim
+                surf._control_points_size_u = p + 1
+                surf._control_points_size_v = q + 1
+                surf._control_points2D = [[col[i * dim:(i + 1) * dim] for col in patch] for i in range(p + 1)]
+                surf._control_points = [pt for row in surf._control_points2D for pt in row]
+                surf._knot_vector_u = list(knot_vector_u)
+                surf._knot_vector_v = list(knot_vector_v)
+                # Keep the evaluator and the sampling settings of the surface
+                surf._evaluator = self._evaluator
+                surf._delta_u = self._delta_u
+                surf._delta_v = self._delta_v
+                surf._sample_size = self._sample_size
+                multi_surf.add(surf)
 
         return multi_surf
 
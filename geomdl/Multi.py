@@ -10,6 +10,7 @@
 from . import warnings
 from . import Abstract
 from . import utilities
+from . import lod
 
 
 class MultiCurve(Abstract.Multi):
@@ -57,6 +58,18 @@ class MultiSurface(Abstract.Multi):
         super(MultiSurface, self).__init__()
         self._instance = Abstract.Surface
 
+    def pyramid(self, base_size=33):
+        """ Generates the level of detail pyramids of the contained surfaces.
+
+        Please see :class:`.lod.MultiPyramid` for details.
+
+        :param base_size: number of points of the base level in each direction
+        :type base_size: int
+        :return: level of detail pyramids
+        :rtype: lod.MultiPyramid
+        """
+        return lod.MultiPyramid(self, base_size)
+
     def render(self):
         """ Renders the surface the using the visualization component.
 
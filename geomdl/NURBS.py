@@ -133,6 +133,27 @@ class Curve(BSpline.Curve):
             del self._cache['ctrlpts'][:]
             del self._cache['weights'][:]
 
+    def _evaluation_data(self):
+        # Evaluates the curve using the non-rational evaluator and the unweighted control points, if all weights are
+        # equal. The result is the same since the weight function w(u) is constant.
+        weight, ctrlpts = self._uniform_weights()
+        if weight is not None:
+            evaluator = _nonrational_evaluator(self)
+            if evaluator is not None:
+                return evaluator, ctrlpts, self._dimension - 1
+        return super(Curve, self)._evaluation_data()
+
+    def _uniform_weights(self):
+        # Returns the weight and the unweighted control points, if all weights are equal. Otherwise, returns None for
+        # both. The result is cached until the curve geometry is changed.
+        cached = self._cache.get('uniform_weights')
+        if cached is None or cached[0] != self._version:
+            weight = _uniform_weight(self._control_points)
+            ctrlpts = None if weight is None else [[c / weight for c in pt[0:-1]] for pt in self._control_points]
+            cached = (self._version, weight, ctrlpts)
+            self._cache['uniform_weights'] = cached
+        return cached[1], cached[2]
+
     # Evaluates the rational curve derivative
     def derivatives(self, u=-1, order=0):
         """ Evaluates n-th order curve derivatives at the given parameter value.
@@ -147,6 +168,11 @@ class Curve(BSpline.Curve):
         # Call the parent function to evaluate A(u) and w(u) derivatives
         CKw = super(Curve, self).derivatives(u, order)
 
+        # If all weights are equal, w(u) is constant and its derivatives vanish
+        weight = self._uniform_weights()[0]
+        if weight is not None:
+            return [[val / weight for val in ckw[0:(self._dimension - 1)]] for ckw in CKw]
+
         # Algorithm A4.2
         CK = [[None for _ in range(self._dimension - 1)] for _ in range(order + 1)]
         for k in range(0, order + 1):
@@ -328,6 +354,29 @@ class Surface(BSpline.Surface):
             del self._cache['ctrlpts'][:]
             del self._cache['weights'][:]
 
+    def _evaluation_data(self):
+        # Evaluates the surface using the non-rational evaluator and the unweighted control points, if all weights are
+        # equal. The result is the same since the weight function w(u,v) is constant.
+        weight, ctrlpts2d = self._uniform_weights()
+        if weight is not None:
+            evaluator = _nonrational_evaluator(self)
+            if evaluator is not None:
+                return evaluator, ctrlpts2d, self._dimension - 1
+        return super(Surface, self)._evaluation_data()
+
+    def _uniform_weights(self):
+        # Returns the weight and the unweighted control points in [u][v] format, if all weights are equal. Otherwise,
+        # returns None for both. The result is cached until the surface geometry is changed.
+        cached = self._cache.get('uniform_weights')
+        if cached is None or cached[0] != self._version:
+            weight = _uniform_weight([pt for row in self._control_points2D for pt in row])
+            ctrlpts2d = None
+            if weight is not None:
+                ctrlpts2d = [[[c / weight for c in pt[0:-1]] for pt in row] for row in self._control_points2D]
+            cached = (self._version, weight, ctrlpts2d)
+            self._cache['uniform_weights'] = cached
+        return cached[1], cached[2]
+
     # Evaluates n-th order rational surface derivatives at the given (u, v) parameter
     def derivatives(self, u=-1, v=-1, order=0):
         """ Evaluates n-th order surface derivatives at the given (u, v) parameter pair from the rational surface.
@@ -355,6 +404,14 @@ class Surface(BSpline.Surface):
         # Generate an empty list of derivatives
         SKL = [[[None for _ in range(self._dimension)] for _ in range(dv + 1)] for _ in range(du + 1)]
 
+        # If all weights are equal, w(u,v) is constant and its derivatives vanish
+        weight = self._uniform_weights()[0]
+        if weight is not None:
+            for k in range(0, du + 1):
+                for l in range(0, min(order - k, dv) + 1):
+                    SKL[k][l][:] = [val / weight for val in SKLw[k][l][0:(self._dimension - 1)]]
+            return SKL
+
         for k in range(0, order + 1):
             for l in range(0, order - k + 1):
                 # Deep copying might seem a little overkill but we also want to avoid same pointer issues too
@@ -396,3 +453,24 @@ class Surface(BSpline.Surface):
             new_ctrlpts.append(temp)
 
         self.ctrlpts = new_ctrlpts
+
+
+def _uniform_weight(ctrlptsw):
+    # Returns the weight, if all weights of the weighted control points are equal. Otherwise, returns None.
+    if not ctrlptsw or not ctrlptsw[0][-1]:
+        return None
+    weight = ctrlptsw[0][-1]
+    for pt in ctrlptsw:
+        if pt[-1] != weight:
+            return None
+    return weight
+
+
+def _nonrational_evaluator(obj):
+    # Returns the non-rational counterpart of the evaluator of the NURBS object. The result is cached until the
+    # evaluator is changed.
+    cached = obj._cache.get('nonrational_evaluator')
+    if cached is None or cached[0] is not obj._evaluator:
+        cached = (obj._evaluator, evaluators.nonrational_evaluator(obj._evaluator))
+        obj._cache['nonrational_evaluator'] = cached
+    return cached[1]
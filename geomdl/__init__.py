@@ -19,3 +19,12 @@ import copy
 import warnings
 import struct
 import pickle
+import bisect
+import operator
+import heapq
+import multiprocessing
+import timeit
+import logging
+import json
+import mmap
+from collections import OrderedDict
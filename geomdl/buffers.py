@@ -0,0 +1,422 @@
+"""
+.. module:: buffers
+    :platform: Unix, Windows
+    :synopsis: Contiguous storage for the evaluated points
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import sys
+from . import struct
+from . import mmap
+from . import array
+
+# Header of the point files, i.e. magic string, byte order, type code, number of points in u- and v-directions,
+# dimension, parametric range in (start_u, stop_u, start_v, stop_v) format and padding
+_HEADER = struct.Struct('<8scc2xIII4d8x')
+
+# Size of the header of the point files in bytes
+HEADER_SIZE = _HEADER.size
+
+_MAGIC = b'GEOMDLPT'
+
+
+class PointBuffer(object):
+    """ Evaluated points stored in a contiguous buffer of double precision floats.
+
+    The coordinates are stored point by point, i.e. the coordinates of the i-th point are located between the indices
+    ``i * dimension`` and ``(i + 1) * dimension`` of the buffer. This class acts as a read-only sequence of points,
+    therefore it can be used in place of the lists of points returned by ``evalpts``. The points are returned as lists.
+
+    The underlying storage can be accessed without copying via the buffer protocol using :py:attr:`~view`, e.g.
+
+    .. code-block:: python
+
+        # Evaluate the surface into the buffer owned by the surface
+        surf.evaluate(buffer=True)
+
+        # Access the evaluated points as a numpy array in (number of points, dimension) shape without copying
+        points = numpy.asarray(surf.evalpts.view)
+
+    :py:attr:`~view` is the supported zero-copy access path. The instances implement ``__buffer__`` too, but it is only
+    used by Python 3.12 and later. On the older versions, ``memoryview(surf.evalpts)`` raises a TypeError and
+    ``numpy.asarray(surf.evalpts)`` copies the points via the sequence protocol. On Python 2.x, :py:attr:`~view` is a
+    flat buffer of the coordinates, please see its documentation.
+
+    :param data: writable buffer of double precision floats, e.g. ``array('d')``
+    :param size: number of points
+    :type size: int
+    :param dimension: dimension of the points
+    :type dimension: int
+    """
+
+    def __init__(self, data, size, dimension):
+        if len(data) < size * dimension:
+            raise ValueError("The buffer must contain at least " + str(size * dimension) + " elements")
+        self._data = data
+        self._size = size
+        self._dimension = dimension
+
+    def __str__(self):
+        return "PointBuffer(size=" + str(self._size) + ", dimension=" + str(self._dimension) + ")"
+
+    __repr__ = __str__
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[idx] for idx in range(*key.indices(self._size))]
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("Point index out of range")
+        start = key * self._dimension
+        return [self._data[idx] for idx in range(start, start + self._dimension)]
+
+    def __iter__(self):
+        data = self._data
+        dim = self._dimension
+        for start in range(0, self._size * dim, dim):
+            yield [data[idx] for idx in range(start, start + dim)]
+
+    def __eq__(self, other):
+        if isinstance(other, PointBuffer):
+            other = other.tolist()
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return self.tolist() == [list(pt) for pt in other]
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    __hash__ = None
+
+    # Buffer protocol support for Python 3.12 and later (PEP 688), older versions should use the view property
+    def __buffer__(self, flags):
+        return self.view
+
+    @property
+    def data(self):
+        """ Underlying buffer.
+
+        The buffer might be larger than the number of the stored coordinates, e.g. when a larger buffer is reused for a
+        smaller evaluation.
+
+        :getter: Gets the buffer
+        """
+        return self._data
+
+    @property
+    def size(self):
+        """ Number of points.
+
+        :getter: Gets the number of points
+        :type: int
+        """
+        return self._size
+
+    @property
+    def dimension(self):
+        """ Dimension of the points.
+
+        :getter: Gets the dimension
+        :type: int
+        """
+        return self._dimension
+
+    @property
+    def view(self):
+        """ Memory view of the stored coordinates.
+
+        The view is in *(size, dimension)* shape, if the Python version supports casting the memory views. Otherwise,
+        it is a flat view of the coordinates.
+
+        Python 2.x arrays do not support the memory views, therefore the view of an ``array`` is a flat read-only
+        ``buffer`` object of the coordinates on Python 2.x, e.g. ``numpy.frombuffer(pts.view).reshape(-1, 3)``
+        accesses the 3-dimensional points without copying.
+
+        :getter: Gets a memory view of the buffer without copying
+        :type: memoryview
+        """
+        count = self._size * self._dimension
+        if sys.version_info[0] < 3 and isinstance(self._data, array):
+            return buffer(self._data, 0, count * self._data.itemsize)
+        mv = memoryview(self._data)[0:count]
+        if hasattr(mv, 'cast') and self._size > 0:
+            return mv.cast('B').cast(mv.format, [self._size, self._dimension])
+        return mv
+
+    def tolist(self):
+        """ Converts the points to a list of lists.
+
+        :return: list of points
+        :rtype: list
+        """
+        return list(self)
+
+
+class MappedPoints(PointBuffer):
+    """ Evaluated surface points stored in a memory-mapped file.
+
+    The point files are generated by :py:meth:`.BSpline.Surface.evaluate_to_file`. The file starts with a header of
+    :data:`.HEADER_SIZE` bytes containing the number of points in u- and v-directions, the dimension, the type code
+    of the coordinates (``d`` for double and ``f`` for single precision) and the parametric range of the points.
+    The header is followed by the raw coordinates in the same order as ``evalpts``, i.e. v-direction varies the
+    fastest. The coordinates are stored in the native byte order of the machine generating the file.
+
+    The points are read from the file on access, therefore this class can be used for the point sets which do not fit
+    into the memory. The file is kept open until :py:meth:`~close` is called and this class can also be used as a
+    context manager. The memory views generated by :py:attr:`~view` and the rows returned by :py:meth:`~row` refer to
+    the mapped file without copying, therefore they must be released before closing the file.
+
+    Python 2.x memory views of the mapped files cannot be cast to the type of the coordinates, therefore the points are
+    read into the memory on opening the file and :py:meth:`~write` updates both the file and the points in the memory.
+
+    :param file_name: name of the point file
+    :type file_name: str
+    :param mode: ``r`` for read-only access, ``r+`` for read and write access
+    :type mode: str
+    """
+
+    def __init__(self, file_name, mode='r'):
+        if mode not in ('r', 'r+'):
+            raise ValueError("Mode must be 'r' or 'r+'")
+        self._file_name = file_name
+        self._file = open(file_name, mode + 'b')
+        try:
+            header = _HEADER.unpack(self._file.read(HEADER_SIZE))
+            if header[0] != _MAGIC:
+                raise ValueError("File " + str(file_name) + " is not a point file")
+            byteorder = '<' if sys.byteorder == 'little' else '>'
+            if header[1].decode('ascii') != byteorder:
+                raise ValueError("The byte order of the point file does not match the byte order of this machine")
+            self._typecode = header[2].decode('ascii')
+            self._size_u, self._size_v, dimension = header[3:6]
+            self._param_range = tuple(header[6:10])
+            access = mmap.ACCESS_READ if mode == 'r' else mmap.ACCESS_WRITE
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+        except Exception:
+            self._file.close()
+            raise
+        self._dimension = dimension
+        super(MappedPoints, self).__init__(self._map_data(), self._size_u * self._size_v, dimension)
+
+    def __str__(self):
+        return "MappedPoints(" + str(self._file_name) + ", size_u=" + str(self._size_u) + ", size_v=" + \
+               str(self._size_v) + ", dimension=" + str(self._dimension) + ")"
+
+    __repr__ = __str__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def file_name(self):
+        """ Name of the point file.
+
+        :getter: Gets the file name
+        :type: str
+        """
+        return self._file_name
+
+    @property
+    def size_u(self):
+        """ Number of points in u-direction.
+
+        :getter: Gets the number of points in u-direction
+        :type: int
+        """
+        return self._size_u
+
+    @property
+    def size_v(self):
+        """ Number of points in v-direction.
+
+        :getter: Gets the number of points in v-direction
+        :type: int
+        """
+        return self._size_v
+
+    @property
+    def typecode(self):
+        """ Type code of the stored coordinates, i.e. ``d`` for double and ``f`` for single precision.
+
+        :getter: Gets the type code
+        :type: str
+        """
+        return self._typecode
+
+    @property
+    def param_range(self):
+        """ Parametric range of the points.
+
+        :getter: Gets the range in (start_u, stop_u, start_v, stop_v) format
+        :type: tuple
+        """
+        return self._param_range
+
+    def _map_data(self):
+        # Returns the coordinates stored in the mapped file
+        if sys.version_info[0] < 3:
+            return self._read_data()
+        num_bytes = self._size_u * self._size_v * self._dimension * array(self._typecode).itemsize
+        return memoryview(self._mmap)[HEADER_SIZE:(HEADER_SIZE + num_bytes)].cast(self._typecode)
+
+    def _read_data(self):
+        # Reads the coordinates stored in the mapped file into the memory
+        data = array(self._typecode)
+        num_bytes = self._size_u * self._size_v * self._dimension * data.itemsize
+        raw = self._mmap[HEADER_SIZE:(HEADER_SIZE + num_bytes)]
+        if hasattr(data, 'frombytes'):
+            data.frombytes(raw)
+        else:
+            data.fromstring(raw)
+        return data
+
+    def row(self, index):
+        """ Returns the points of a row, i.e. the points with the same u parameter, without copying.
+
+        The returned points refer to the mapped file, therefore they must be deleted (or their :py:attr:`~data` must be
+        released) before closing the file.
+
+        :param index: index of the row
+        :type index: int
+        :return: points of the row
+        :rtype: PointBuffer
+        """
+        if not 0 <= index < self._size_u:
+            raise IndexError("Row index out of range")
+        start = index * self._size_v * self._dimension
+        return PointBuffer(self._data[start:(start + self._size_v * self._dimension)], self._size_v, self._dimension)
+
+    def write(self, index, values):
+        """ Writes the coordinates starting from the given point index.
+
+        :param index: index of the first point
+        :type index: int
+        :param values: flat list of the coordinates
+        :type values: list, array
+        """
+        if not isinstance(values, array) or values.typecode != self._typecode:
+            values = array(self._typecode, values)
+        start = HEADER_SIZE + (index * self._dimension * values.itemsize)
+        if start + (len(values) * values.itemsize) > HEADER_SIZE + (len(self) * self._dimension * values.itemsize):
+            raise IndexError("The values exceed the size of the point file")
+        self._mmap[start:(start + len(values) * values.itemsize)] = _to_bytes(values)
+        if not isinstance(self._data, memoryview):
+            # The points are read into the memory on Python 2.x
+            pos = index * self._dimension
+            self._data[pos:(pos + len(values))] = values
+
+    def flush(self):
+        """ Flushes the changes to the file. """
+        self._mmap.flush()
+
+    def close(self):
+        """ Closes the point file.
+
+        The memory views returned by :py:attr:`~view` and the rows returned by :py:meth:`~row` must be released
+        before closing the file. Otherwise, ``BufferError`` is raised and the file stays open.
+        """
+        if self._mmap is None:
+            return
+        if isinstance(self._data, memoryview):
+            # Releasing the data view fails, if there are memory views exported from it
+            self._data.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # There are live memory views created directly from the mapping, restore the data view
+            self._data = self._map_data()
+            raise
+        self._file.close()
+        self._mmap = None
+
+
+def create_point_file(file_name, size_u, size_v, dimension, typecode='d', param_range=(0.0, 1.0, 0.0, 1.0)):
+    """ Creates a point file filled with zeros and opens it for writing.
+
+    :param file_name: name of the point file
+    :type file_name: str
+    :param size_u: number of points in u-direction
+    :type size_u: int
+    :param size_v: number of points in v-direction
+    :type size_v: int
+    :param dimension: dimension of the points
+    :type dimension: int
+    :param typecode: ``d`` for double and ``f`` for single precision coordinates
+    :type typecode: str
+    :param param_range: parametric range in (start_u, stop_u, start_v, stop_v) format
+    :type param_range: tuple
+    :return: point file opened for reading and writing
+    :rtype: MappedPoints
+    """
+    if typecode not in ('d', 'f'):
+        raise ValueError("Type code must be 'd' or 'f'")
+    if size_u < 1 or size_v < 1 or dimension < 1:
+        raise ValueError("The number of points and the dimension must be positive")
+    byteorder = b'<' if sys.byteorder == 'little' else b'>'
+    header = _HEADER.pack(_MAGIC, byteorder, typecode.encode('ascii'), size_u, size_v, dimension,
+                          *[float(p) for p in param_range])
+    with open(file_name, 'wb') as fp:
+        fp.write(header)
+        fp.truncate(HEADER_SIZE + (size_u * size_v * dimension * array(typecode).itemsize))
+    return MappedPoints(file_name, 'r+')
+
+
+def allocate(size, buffer=None):
+    """ Allocates a buffer of double precision floats, reusing the input buffer when possible.
+
+    The input buffer is returned as it is, if it is large enough. Otherwise, it is extended in place. A new buffer is
+    allocated, if the input buffer cannot be extended, e.g. while it is exported via a memory view.
+
+    :param size: required number of elements
+    :type size: int
+    :param buffer: buffer to be reused
+    :type buffer: array
+    :return: buffer containing at least the required number of elements
+    :rtype: array
+    """
+    if buffer is None:
+        return array('d', [0.0]) * size
+    if len(buffer) < size:
+        try:
+            buffer.extend(array('d', [0.0]) * (size - len(buffer)))
+        except BufferError:
+            return array('d', [0.0]) * size
+    return buffer
+
+
+def store(points, out, size, dimension):
+    """ Stores the evaluated points in the output buffer.
+
+    The evaluators may write the points directly into the output buffer and return it. Otherwise, the returned points
+    are copied into the output buffer.
+
+    :param points: points returned by the evaluator
+    :param out: output buffer
+    :param size: number of points
+    :type size: int
+    :param dimension: dimension of the points
+    :type dimension: int
+    :return: evaluated points
+    :rtype: PointBuffer
+    """
+    if points is not out:
+        for idx, pt in enumerate(points):
+            out[(idx * dimension):((idx + 1) * dimension)] = array('d', pt)
+    return PointBuffer(out, size, dimension)
+
+
+def _to_bytes(values):
+    try:
+        return values.tobytes()
+    except AttributeError:
+        return values.tostring()  # Python 2.x
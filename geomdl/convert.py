@@ -9,7 +9,6 @@
 
 from . import BSpline
 from . import NURBS
-from . import compatibility
 
 
 def bspline_to_nurbs(obj):
@@ -34,20 +33,32 @@ def bspline_to_nurbs(obj):
 
 
 def bspline_to_nurbs_curve(bs_curve):
+    ctrlpts = bs_curve.ctrlpts
     nurbs_curve = NURBS.Curve()
     nurbs_curve.degree = bs_curve.degree
-    nurbs_curve.ctrlpts = bs_curve.ctrlpts
+    nurbs_curve.set_ctrlpts([list(pt) + [1.0] for pt in ctrlpts])
     nurbs_curve.knotvector = bs_curve.knotvector
+    _set_unit_weights(nurbs_curve, ctrlpts, [list(pt) for pt in ctrlpts])
     return nurbs_curve
 
 
 def bspline_to_nurbs_surface(bs_surface):
+    ctrlpts = bs_surface.ctrlpts
     nurbs_surface = NURBS.Surface()
     nurbs_surface.degree_u = bs_surface.degree_u
     nurbs_surface.degree_v = bs_surface.degree_v
-    nurbs_surface.ctrlpts_size_u = bs_surface.ctrlpts_size_u
-    nurbs_surface.ctrlpts_size_v = bs_surface.ctrlpts_size_v
-    nurbs_surface.ctrlpts = bs_surface.ctrlpts
+    nurbs_surface.set_ctrlpts([list(pt) + [1.0] for pt in ctrlpts], bs_surface.ctrlpts_size_u,
+                              bs_surface.ctrlpts_size_v)
     nurbs_surface.knotvector_u = bs_surface.knotvector_u
     nurbs_surface.knotvector_v = bs_surface.knotvector_v
+    _set_unit_weights(nurbs_surface, ctrlpts, [[list(pt) for pt in row] for row in bs_surface.ctrlpts2d])
     return nurbs_surface
+
+
+def _set_unit_weights(obj, ctrlpts, ctrlpts_eval):
+    # All weights are 1.0, therefore the caches of the NURBS object are populated using the B-Spline control points
+    # instead of separating the weighted control points on the first use. The control points in the evaluation format
+    # are used by the non-rational evaluation path of the NURBS object.
+    obj._cache['ctrlpts'] = list(ctrlpts)
+    obj._cache['weights'] = [1.0 for _ in range(len(ctrlpts))]
+    obj._cache['uniform_weights'] = (obj._version, 1.0, ctrlpts_eval)
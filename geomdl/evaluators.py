@@ -1,5 +1,38 @@
+"""
+.. module:: evaluators
+    :platform: Unix, Windows
+    :synopsis: Evaluation algorithms (evaluation strategies) for B-Spline and NURBS curves and surfaces
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import os
+from . import json
+from . import timeit
+from . import multiprocessing
+from . import array
 from .Abstract import Evaluator
 from . import helpers
+from . import utilities
+
+# Types of the geometries which can be evaluated
+KINDS = ('curve', 'surface', 'nurbs_curve', 'nurbs_surface')
+
+# Default location of the persisted calibration data of the automatic evaluator
+CALIBRATION_FILE = os.path.join(os.path.expanduser("~"), ".geomdl", "evaluators.json")
+
+# Default calibration data, i.e. time of a single multiply-add operation of the sequential evaluators and the overhead
+# of the process pool in seconds. The defaults are conservative, so that the process pool is only used for very large
+# evaluations before a calibration is made.
+CALIBRATION_DEFAULTS = dict(curve_unit_time=1e-6, surface_unit_time=5e-7, parallel_overhead=0.5)
+
+# Registered evaluators in {name: {kind: factory}} format
+_registry = {}
+
+# Current calibration data
+_calibration = dict(CALIBRATION_DEFAULTS)
+_calibration_loaded = False
 
 
 class CurveEvaluator(Evaluator):
@@ -40,6 +73,7 @@ class CurveEvaluator(Evaluator):
         knot_vector = kwargs.get('knotvector')
         control_points = kwargs.get('ctrlpts')
         dimension = kwargs.get('dimension')
+        out = kwargs.get('out', None)
 
         # Algorithm A3.1
         spans = helpers.find_spans(knot_vector, len(control_points), knots)
@@ -52,9 +86,12 @@ class CurveEvaluator(Evaluator):
                 cpt[:] = [crvpt + (basis[idx][i] * ctrlpt) for crvpt, ctrlpt in
                           zip(cpt, control_points[spans[idx] - degree + i])]
 
-            eval_points.append(cpt)
+            if out is None:
+                eval_points.append(cpt)
+            else:
+                out[(idx * dimension):((idx + 1) * dimension)] = array('d', cpt)
 
-        return eval_points
+        return eval_points if out is None else out
 
     def derivatives_single(self, **kwargs):
         pass
@@ -120,6 +157,7 @@ class SurfaceEvaluator(Evaluator):
         ctrlpts_size_u = kwargs.get('ctrlpts_size_u')
         ctrlpts_size_v = kwargs.get('ctrlpts_size_v')
         dimension = kwargs.get('dimension')
+        out = kwargs.get('out', None)
 
         # Algorithm A3.5
         spans_u = helpers.find_spans(knot_vector_u, ctrlpts_size_u, knots_u)
@@ -141,9 +179,13 @@ class SurfaceEvaluator(Evaluator):
                                    zip(temp, control_points2D[idx_u + k][idx_v])]
                     spt[:] = [pt + (basis_v[j][l] * tmp) for pt, tmp in zip(spt, temp)]
 
-                eval_points.append(spt)
+                if out is None:
+                    eval_points.append(spt)
+                else:
+                    idx = (i * len(knots_v) + j) * dimension
+                    out[idx:(idx + dimension)] = array('d', spt)
 
-        return eval_points
+        return eval_points if out is None else out
 
     def derivatives_single(self, **kwargs):
         pass
@@ -180,17 +222,21 @@ class NURBSCurveEvaluator(CurveEvaluator):
     def evaluate(self, **kwargs):
         """ Evaluates the curve. """
         dimension = kwargs.get('dimension')
+        out = kwargs.pop('out', None)
 
         # Algorithm A4.1
         cptw = super(NURBSCurveEvaluator, self).evaluate(**kwargs)
 
         # Divide by weight
         eval_points = []
-        for pt in cptw:
+        for idx, pt in enumerate(cptw):
             cpt = [float(c / pt[-1]) for c in pt[0:(dimension - 1)]]
-            eval_points.append(cpt)
+            if out is None:
+                eval_points.append(cpt)
+            else:
+                out[(idx * (dimension - 1)):((idx + 1) * (dimension - 1))] = array('d', cpt)
 
-        return eval_points
+        return eval_points if out is None else out
 
     def derivatives_single(self, **kwargs):
         pass
@@ -227,20 +273,404 @@ class NURBSSurfaceEvaluator(SurfaceEvaluator):
     def evaluate(self, **kwargs):
         """ Evaluates the surface. """
         dimension = kwargs.get('dimension')
+        out = kwargs.pop('out', None)
 
         # Algorithm A4.3
         cptw = super(NURBSSurfaceEvaluator, self).evaluate(**kwargs)
 
         # Divide by weight
         eval_points = []
-        for pt in cptw:
+        for idx, pt in enumerate(cptw):
             cpt = [float(c / pt[-1]) for c in pt[0:(dimension - 1)]]
-            eval_points.append(cpt)
+            if out is None:
+                eval_points.append(cpt)
+            else:
+                out[(idx * (dimension - 1)):((idx + 1) * (dimension - 1))] = array('d', cpt)
 
-        return eval_points
+        return eval_points if out is None else out
 
     def derivatives_single(self, **kwargs):
         pass
 
     def derivatives(self, **kwargs):
         pass
+
+
+class CurveEvaluatorParallel(CurveEvaluator):
+    """ Parallel B-Spline curve evaluation algorithms.
+
+    The evaluation parameters are split into chunks and the chunks are evaluated by :class:`.CurveEvaluator` using a
+    process pool. Since the process pool is created for each evaluation, this evaluator is only faster for very large
+    number of evaluated points.
+
+    :param processes: number of worker processes, defaults to the number of CPUs
+    :type processes: int
+    """
+
+    def __init__(self, processes=None):
+        super(CurveEvaluatorParallel, self).__init__()
+        self._name = "Parallel Curve Evaluator"
+        self._processes = processes if processes else multiprocessing.cpu_count()
+
+    def evaluate(self, **kwargs):
+        """ Evaluates the curve. """
+        return _evaluate_parallel(CurveEvaluator, kwargs, 'knots', self._processes)
+
+
+class SurfaceEvaluatorParallel(SurfaceEvaluator):
+    """ Parallel B-Spline surface evaluation algorithms.
+
+    The evaluation parameters in U-direction are split into chunks and the chunks are evaluated by
+    :class:`.SurfaceEvaluator` using a process pool.
+
+    :param processes: number of worker processes, defaults to the number of CPUs
+    :type processes: int
+    """
+
+    def __init__(self, processes=None):
+        super(SurfaceEvaluatorParallel, self).__init__()
+        self._name = "Parallel Surface Evaluator"
+        self._processes = processes if processes else multiprocessing.cpu_count()
+
+    def evaluate(self, **kwargs):
+        """ Evaluates the surface. """
+        return _evaluate_parallel(SurfaceEvaluator, kwargs, 'knots_u', self._processes)
+
+
+class NURBSCurveEvaluatorParallel(NURBSCurveEvaluator):
+    """ Parallel NURBS curve evaluation algorithms.
+
+    The evaluation parameters are split into chunks and the chunks are evaluated by :class:`.NURBSCurveEvaluator`
+    using a process pool.
+
+    :param processes: number of worker processes, defaults to the number of CPUs
+    :type processes: int
+    """
+
+    def __init__(self, processes=None):
+        super(NURBSCurveEvaluatorParallel, self).__init__()
+        self._name = "Parallel NURBS Curve Evaluator"
+        self._processes = processes if processes else multiprocessing.cpu_count()
+
+    def evaluate(self, **kwargs):
+        """ Evaluates the curve. """
+        return _evaluate_parallel(NURBSCurveEvaluator, kwargs, 'knots', self._processes)
+
+
+class NURBSSurfaceEvaluatorParallel(NURBSSurfaceEvaluator):
+    """ Parallel NURBS surface evaluation algorithms.
+
+    The evaluation parameters in U-direction are split into chunks and the chunks are evaluated by
+    :class:`.NURBSSurfaceEvaluator` using a process pool.
+
+    :param processes: number of worker processes, defaults to the number of CPUs
+    :type processes: int
+    """
+
+    def __init__(self, processes=None):
+        super(NURBSSurfaceEvaluatorParallel, self).__init__()
+        self._name = "Parallel NURBS Surface Evaluator"
+        self._processes = processes if processes else multiprocessing.cpu_count()
+
+    def evaluate(self, **kwargs):
+        """ Evaluates the surface. """
+        return _evaluate_parallel(NURBSSurfaceEvaluator, kwargs, 'knots_u', self._processes)
+
+
+class AutoEvaluator(Evaluator):
+    """ Automatic evaluator selection.
+
+    This evaluator selects the evaluator to be used for each evaluation using the number of evaluated points, the
+    degree, the dimension and the number of available CPUs. The evaluation time of the sequential and the parallel
+    evaluators is estimated by a cost model and the faster one is used. The single point evaluations always use the
+    sequential evaluator.
+
+    The cost model uses the calibration data which can be measured on the local machine using :func:`.calibrate` and
+    persisted for the later sessions. Please see :func:`.calibration` for details.
+
+    This evaluator is not the default evaluator of the curves and the surfaces, it should be enabled explicitly, e.g.
+    ``surf.evaluator = "auto"``. The parallel evaluator starts a process pool, therefore the scripts using this
+    evaluator must protect their entry point with ``if __name__ == '__main__':`` on the platforms using the *spawn*
+    start method, e.g. Windows and macOS.
+
+    :param kind: type of the geometry, i.e. ``curve``, ``surface``, ``nurbs_curve`` or ``nurbs_surface``
+    :type kind: str
+    """
+
+    def __init__(self, kind='curve'):
+        super(AutoEvaluator, self).__init__()
+        if kind not in KINDS:
+            raise ValueError("Kind must be one of " + ", ".join(KINDS))
+        self._kind = kind
+        self._name = "Auto " + " ".join([k.capitalize() if k != 'nurbs' else 'NURBS' for k in kind.split('_')]) + \
+                     " Evaluator"
+        self._evaluators = {}
+
+    @property
+    def kind(self):
+        """ Type of the geometry.
+
+        :getter: Gets the type of the geometry
+        :type: str
+        """
+        return self._kind
+
+    def select(self, **kwargs):
+        """ Selects the evaluator for the input evaluation arguments.
+
+        :return: name of the selected evaluator
+        :rtype: str
+        """
+        cores = multiprocessing.cpu_count()
+        # The worker processes of a process pool are not allowed to create another process pool
+        if cores < 2 or multiprocessing.current_process().daemon:
+            return 'sequential'
+        data = calibration()
+        if self._kind.endswith('curve'):
+            work = len(kwargs.get('knots')) * (kwargs.get('degree') + 1) * kwargs.get('dimension')
+            time_sequential = work * data['curve_unit_time']
+        else:
+            work = len(kwargs.get('knots_u')) * len(kwargs.get('knots_v')) * (kwargs.get('degree_u') + 1) * \
+                   (kwargs.get('degree_v') + 1) * kwargs.get('dimension')
+            time_sequential = work * data['surface_unit_time']
+        time_parallel = data['parallel_overhead'] + (time_sequential / cores)
+        return 'parallel' if time_parallel < time_sequential else 'sequential'
+
+    def evaluate_single(self, **kwargs):
+        """ Evaluates a single point using the sequential evaluator. """
+        return self._get('sequential').evaluate_single(**kwargs)
+
+    def evaluate(self, **kwargs):
+        """ Evaluates the points using the selected evaluator. """
+        return self._get(self.select(**kwargs)).evaluate(**kwargs)
+
+    def derivatives_single(self, **kwargs):
+        """ Evaluates the derivatives at a single parameter using the sequential evaluator. """
+        return self._get('sequential').derivatives_single(**kwargs)
+
+    def derivatives(self, **kwargs):
+        """ Evaluates the derivatives using the sequential evaluator. """
+        return self._get('sequential').derivatives(**kwargs)
+
+    def _get(self, name):
+        if name not in self._evaluators:
+            self._evaluators[name] = get_evaluator(name, self._kind)
+        return self._evaluators[name]
+
+
+def register_evaluator(name, kind, factory):
+    """ Registers an evaluator.
+
+    The registered evaluators can be retrieved by :func:`.get_evaluator` and they can also be assigned to the curves
+    and the surfaces by their names, e.g. ``curve.evaluator = "parallel"``.
+
+    :param name: name of the evaluator
+    :type name: str
+    :param kind: type of the geometry, i.e. ``curve``, ``surface``, ``nurbs_curve`` or ``nurbs_surface``
+    :type kind: str
+    :param factory: evaluator class or a function returning an evaluator instance
+    :type factory: callable
+    """
+    if kind not in KINDS:
+        raise ValueError("Kind must be one of " + ", ".join(KINDS))
+    _registry.setdefault(name, {})[kind] = factory
+
+
+def get_evaluator(name, kind):
+    """ Generates an instance of the registered evaluator.
+
+    :param name: name of the evaluator
+    :type name: str
+    :param kind: type of the geometry, i.e. ``curve``, ``surface``, ``nurbs_curve`` or ``nurbs_surface``
+    :type kind: str
+    :return: evaluator instance
+    :rtype: Abstract.Evaluator
+    """
+    if name not in _registry or kind not in _registry[name]:
+        raise ValueError("There is no evaluator named '" + str(name) + "' for the " + str(kind) + " type")
+    return _registry[name][kind]()
+
+
+def evaluator_names(kind):
+    """ Returns the names of the registered evaluators for the input geometry type.
+
+    :param kind: type of the geometry, i.e. ``curve``, ``surface``, ``nurbs_curve`` or ``nurbs_surface``
+    :type kind: str
+    :return: names of the evaluators
+    :rtype: list
+    """
+    return sorted([name for name in _registry if kind in _registry[name]])
+
+
+def nonrational_evaluator(evaluator):
+    """ Returns the non-rational counterpart of a rational evaluator.
+
+    The NURBS curves and surfaces with equal weights are evaluated by the non-rational counterpart of their evaluator
+    using the unweighted control points. Only the evaluators defined in this module have a counterpart; the
+    subclasses and the user-defined evaluators are always used as they are.
+
+    :param evaluator: rational evaluator instance
+    :type evaluator: Abstract.Evaluator
+    :return: non-rational evaluator instance, None if the input evaluator has no counterpart
+    :rtype: Abstract.Evaluator
+    """
+    if type(evaluator) is AutoEvaluator:
+        if not evaluator.kind.startswith('nurbs_'):
+            return None
+        return AutoEvaluator(evaluator.kind[len('nurbs_'):])
+    if type(evaluator) in _nonrational_parallel:
+        return _nonrational_parallel[type(evaluator)](evaluator._processes)
+    if type(evaluator) in _nonrational:
+        return _nonrational[type(evaluator)]()
+    return None
+
+
+def calibration():
+    """ Returns the calibration data of the automatic evaluator.
+
+    The calibration data is loaded from :data:`.CALIBRATION_FILE` on the first call, if the file exists. Otherwise,
+    the defaults in :data:`.CALIBRATION_DEFAULTS` are used. The data contains the following keys:
+
+    * ``curve_unit_time``: time of a single multiply-add operation of the sequential curve evaluator
+    * ``surface_unit_time``: time of a single multiply-add operation of the sequential surface evaluator
+    * ``parallel_overhead``: time of creating the process pool and transferring the data
+
+    :return: calibration data
+    :rtype: dict
+    """
+    global _calibration_loaded
+    if not _calibration_loaded:
+        _calibration_loaded = True
+        if os.path.isfile(CALIBRATION_FILE):
+            load_calibration(CALIBRATION_FILE)
+    return _calibration
+
+
+def load_calibration(file_name=CALIBRATION_FILE):
+    """ Loads the calibration data of the automatic evaluator from a JSON file.
+
+    :param file_name: input file name
+    :type file_name: str
+    """
+    global _calibration_loaded
+    with open(file_name, 'r') as fp:
+        data = json.load(fp)
+    for key in CALIBRATION_DEFAULTS:
+        if key in data:
+            _calibration[key] = float(data[key])
+    _calibration_loaded = True
+
+
+def save_calibration(file_name=CALIBRATION_FILE):
+    """ Saves the calibration data of the automatic evaluator to a JSON file.
+
+    :param file_name: output file name
+    :type file_name: str
+    """
+    directory = os.path.dirname(file_name)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(file_name, 'w') as fp:
+        json.dump(calibration(), fp, indent=2, sort_keys=True)
+
+
+def calibrate(**kwargs):
+    """ Calibrates the cost model of the automatic evaluator using micro-benchmarks.
+
+    The sequential evaluators are timed on small workloads and the overhead of the process pool is estimated by
+    comparing the parallel and the sequential evaluation times of the same workload.
+
+    Keyword Arguments:
+        * ``repeat``: number of repeated timing runs. *Default: 3*
+        * ``save``: saves the calibration data to :data:`.CALIBRATION_FILE`. *Default: False*
+
+    :return: calibration data
+    :rtype: dict
+    """
+    global _calibration_loaded
+    repeat = kwargs.get('repeat', 3)
+    degree = 3
+    ctrlpts = [[float(i), float(j), float((i * j) % 3)] for i in range(8) for j in range(8)]
+    knot_vector = utilities.generate_knot_vector(degree, 8)
+
+    knots = utilities.linspace(0.0, 1.0, 2000)
+    curve_args = dict(knots=knots, degree=degree, knotvector=knot_vector, ctrlpts=ctrlpts[0:8], dimension=3)
+    work = len(knots) * (degree + 1) * 3
+    time_sequential = _min_time(lambda: CurveEvaluator().evaluate(**curve_args), repeat)
+    _calibration['curve_unit_time'] = time_sequential / work
+
+    # The overhead includes creating the process pool and transferring the data to and from the worker processes
+    cores = multiprocessing.cpu_count()
+    time_parallel = _min_time(lambda: CurveEvaluatorParallel(cores).evaluate(**curve_args), repeat)
+    _calibration['parallel_overhead'] = max(time_parallel - (time_sequential / cores), 0.0)
+
+    knots = utilities.linspace(0.0, 1.0, 40)
+    surface_args = dict(knots_u=knots, knots_v=knots, degree_u=degree, degree_v=degree, knotvector_u=knot_vector,
+                        knotvector_v=knot_vector, ctrlpts=[ctrlpts[i * 8:(i + 1) * 8] for i in range(8)],
+                        ctrlpts_size_u=8, ctrlpts_size_v=8, dimension=3)
+    work = len(knots) * len(knots) * (degree + 1) * (degree + 1) * 3
+    _calibration['surface_unit_time'] = _min_time(lambda: SurfaceEvaluator().evaluate(**surface_args), repeat) / work
+
+    _calibration_loaded = True
+
+    if kwargs.get('save', False):
+        save_calibration(CALIBRATION_FILE)
+    return _calibration
+
+
+def _min_time(func, repeat):
+    # Measures the minimum run time of the function
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = timeit.default_timer()
+        func()
+        timings.append(timeit.default_timer() - start)
+    return min(timings)
+
+
+def _evaluate_chunk(args):
+    # Evaluates a chunk of the parameters in a worker process
+    evaluator_class, kwargs = args
+    return evaluator_class().evaluate(**kwargs)
+
+
+def _evaluate_parallel(evaluator_class, kwargs, key, processes):
+    # Splits the parameters into chunks and evaluates them using a process pool
+    knots = kwargs.get(key)
+    num_chunks = min(len(knots), processes)
+    if num_chunks < 2:
+        return evaluator_class().evaluate(**kwargs)
+    bounds = [(len(knots) * k) // num_chunks for k in range(num_chunks + 1)]
+    chunks = []
+    for start, stop in zip(bounds[0:-1], bounds[1:]):
+        chunk_kwargs = dict(kwargs)
+        chunk_kwargs[key] = knots[start:stop]
+        # The output buffer is filled by the caller using the returned points
+        chunk_kwargs.pop('out', None)
+        chunks.append((evaluator_class, chunk_kwargs))
+    pool = multiprocessing.Pool(processes)
+    try:
+        results = pool.map(_evaluate_chunk, chunks)
+    finally:
+        pool.close()
+        pool.join()
+    return [pt for res in results for pt in res]
+
+
+register_evaluator('sequential', 'curve', CurveEvaluator)
+register_evaluator('sequential', 'surface', SurfaceEvaluator)
+register_evaluator('sequential', 'nurbs_curve', NURBSCurveEvaluator)
+register_evaluator('sequential', 'nurbs_surface', NURBSSurfaceEvaluator)
+register_evaluator('parallel', 'curve', CurveEvaluatorParallel)
+register_evaluator('parallel', 'surface', SurfaceEvaluatorParallel)
+register_evaluator('parallel', 'nurbs_curve', NURBSCurveEvaluatorParallel)
+register_evaluator('parallel', 'nurbs_surface', NURBSSurfaceEvaluatorParallel)
+register_evaluator('auto', 'curve', lambda: AutoEvaluator('curve'))
+register_evaluator('auto', 'surface', lambda: AutoEvaluator('surface'))
+register_evaluator('auto', 'nurbs_curve', lambda: AutoEvaluator('nurbs_curve'))
+register_evaluator('auto', 'nurbs_surface', lambda: AutoEvaluator('nurbs_surface'))
+
+# Non-rational counterparts of the rational evaluators
+_nonrational = {NURBSCurveEvaluator: CurveEvaluator, NURBSSurfaceEvaluator: SurfaceEvaluator}
+_nonrational_parallel = {NURBSCurveEvaluatorParallel: CurveEvaluatorParallel,
+                         NURBSSurfaceEvaluatorParallel: SurfaceEvaluatorParallel}
@@ -8,12 +8,16 @@
 """
 
 from . import os
+from . import sys
 from . import warnings
 from . import struct
+from . import array
 from . import Abstract
 from . import NURBS
 from . import Multi
+from . import utilities
 from . import compatibility
+from . import buffers
 from .elements import Vertex, Triangle
 
 
@@ -112,47 +116,358 @@ def export_csv(obj, file_name, point_type='evalpts'):
         warnings.warn("File " + str(file_name) + " cannot be opened for writing.")
 
 
-def export_vtk(obj, file_name, point_type='evalpts'):
+def export_vtk(obj, file_name, point_type='evalpts', **kwargs):
     """ Exports control points or evaluated points as a VTK file (legacy format).
 
     Please see the following document for details: http://www.vtk.org/VTK/img/file-formats.pdf
 
-    :param obj: a curve or a surface object
-    :type obj: Abstract.Curve, Abstract.Surface
+    Surfaces are saved as a ``STRUCTURED_GRID`` dataset using the grid dimensions of the points, so that no
+    connectivity information is required. Curves are saved as a ``POLYDATA`` dataset with a single polyline.
+
+    Keyword Arguments:
+        * *binary* (``bool``): True if the VTK file is going to be saved in binary format. *Default: False*
+        * *point_data* (``list``, ``tuple``): names of the point data arrays to be computed and saved, i.e.
+          ``params``, ``normals`` and/or ``curvature``. Only available for the evaluated points.
+        * *user_data* (``dict``): additional point data arrays in *{name: values}* format
+
+    The evaluated points stored in a point file (:class:`.buffers.MappedPoints`) are also accepted as the input. In
+    this case, the points are written row by row without loading the whole file into the memory.
+
+    :param obj: a curve or a surface object, or a point file
+    :type obj: Abstract.Curve, Abstract.Surface, buffers.MappedPoints
     :param file_name: output file name
     :type file_name: str
     :param point_type: ``ctrlpts`` for control points or ``evalpts`` for evaluated points
     :type point_type: str
     """
+    binary = kwargs.get('binary', False)
+
+    if isinstance(obj, buffers.MappedPoints):
+        _export_vtk_mapped(obj, file_name, binary)
+        return
+
+    vtk_data = _prepare_vtk_data(obj, point_type, **kwargs)
+    if vtk_data is None:
+        return
+    points, dims, point_data = vtk_data
+    num_points = len(points)
+
+    # Prepare header
+    lines = ["# vtk DataFile Version 3.0", repr(obj), "BINARY" if binary else "ASCII"]
+    if dims[1] > 1:
+        lines.append("DATASET STRUCTURED_GRID")
+        lines.append("DIMENSIONS " + str(dims[0]) + " " + str(dims[1]) + " 1")
+    else:
+        lines.append("DATASET POLYDATA")
+    lines.append("POINTS " + str(num_points) + " float")
+
+    # Try opening the file for writing
+    try:
+        with open(file_name, 'wb') as fp:
+            fp.write(("\n".join(lines) + "\n").encode('ascii'))
+            _write_vtk_legacy_values(fp, _vtk_flatten_points(points), 'f', binary, 3)
+
+            # Polylines need connectivity information
+            if dims[1] == 1:
+                fp.write(("LINES 1 " + str(num_points + 1) + "\n").encode('ascii'))
+                _write_vtk_legacy_values(fp, [num_points] + list(range(num_points)), 'i', binary, num_points + 1)
+
+            if point_data:
+                fp.write(("POINT_DATA " + str(num_points) + "\n").encode('ascii'))
+                for name, values in point_data:
+                    num_comps = len(values[0]) if isinstance(values[0], (list, tuple)) else 1
+                    if name == 'normals':
+                        fp.write("NORMALS normals float\n".encode('ascii'))
+                    else:
+                        fp.write(("SCALARS " + name + " float " + str(num_comps) + "\n").encode('ascii'))
+                        fp.write("LOOKUP_TABLE default\n".encode('ascii'))
+                    flat = [c for val in values for c in val] if num_comps > 1 else values
+                    _write_vtk_legacy_values(fp, flat, 'f', binary, num_comps)
+    except IOError:
+        # Show a warning on failure to open file
+        warnings.warn("File " + str(file_name) + " cannot be opened for writing.")
+
+
+def export_vtk_xml(obj, file_name, point_type='evalpts', **kwargs):
+    """ Exports control points or evaluated points as a VTK XML file with appended raw binary data.
+
+    Surfaces are saved as a structured grid (``.vts``) and curves are saved as a polyline inside a poly data file
+    (``.vtp``). The file extension is not modified by this function. Please see the following document for details:
+    http://www.vtk.org/VTK/img/file-formats.pdf
+
+    Keyword Arguments:
+        * *point_data* (``list``, ``tuple``): names of the point data arrays to be computed and saved, i.e.
+          ``params``, ``normals`` and/or ``curvature``. Only available for the evaluated points.
+        * *user_data* (``dict``): additional point data arrays in *{name: values}* format
+
+    The evaluated points stored in a point file (:class:`.buffers.MappedPoints`) are also accepted as the input. In
+    this case, the points are written row by row without loading the whole file into the memory.
+
+    :param obj: a curve or a surface object, or a point file
+    :type obj: Abstract.Curve, Abstract.Surface, buffers.MappedPoints
+    :param file_name: output file name
+    :type file_name: str
+    :param point_type: ``ctrlpts`` for control points or ``evalpts`` for evaluated points
+    :type point_type: str
+    """
+    if isinstance(obj, buffers.MappedPoints):
+        _export_vtk_xml_mapped(obj, file_name)
+        return
+
+    vtk_data = _prepare_vtk_data(obj, point_type, **kwargs)
+    if vtk_data is None:
+        return
+    points, dims, point_data = vtk_data
+    num_points = len(points)
+
+    # Collect the data blocks to be appended to the end of the file
+    blocks = []
+    offset = [0]
+
+    def add_block(values, typecode, vtk_type, name, num_comps):
+        data = _vtk_to_bytes(values, typecode, big_endian=False)
+        xml = '<DataArray type="' + vtk_type + '" Name="' + name + '" NumberOfComponents="' + str(num_comps) + \
+              '" format="appended" offset="' + str(offset[0]) + '"/>'
+        blocks.append(struct.pack('<I', len(data)) + data)
+        offset[0] += 4 + len(data)
+        return xml
+
+    xml_pts = add_block(_vtk_flatten_points(points), 'f', "Float32", "Points", 3)
+    xml_pd = []
+    for name, values in point_data:
+        num_comps = len(values[0]) if isinstance(values[0], (list, tuple)) else 1
+        flat = [c for val in values for c in val] if num_comps > 1 else values
+        xml_pd.append(add_block(flat, 'f', "Float32", name, num_comps))
+
+    if dims[1] > 1:
+        extent = "0 " + str(dims[0] - 1) + " 0 " + str(dims[1] - 1) + " 0 0"
+        lines = ['<?xml version="1.0"?>',
+                 '<VTKFile type="StructuredGrid" version="0.1" byte_order="LittleEndian" header_type="UInt32">',
+                 '<StructuredGrid WholeExtent="' + extent + '">',
+                 '<Piece Extent="' + extent + '">']
+        lines += ['<PointData>'] + xml_pd + ['</PointData>']
+        lines += ['<Points>', xml_pts, '</Points>']
+        lines += ['</Piece>', '</StructuredGrid>']
+    else:
+        xml_conn = add_block(list(range(num_points)), 'i', "Int32", "connectivity", 1)
+        xml_offsets = add_block([num_points], 'i', "Int32", "offsets", 1)
+        lines = ['<?xml version="1.0"?>',
+                 '<VTKFile type="PolyData" version="0.1" byte_order="LittleEndian" header_type="UInt32">',
+                 '<PolyData>',
+                 '<Piece NumberOfPoints="' + str(num_points) + '" NumberOfVerts="0" NumberOfLines="1" '
+                 'NumberOfStrips="0" NumberOfPolys="0">']
+        lines += ['<PointData>'] + xml_pd + ['</PointData>']
+        lines += ['<Points>', xml_pts, '</Points>']
+        lines += ['<Lines>', xml_conn, xml_offsets, '</Lines>']
+        lines += ['</Piece>', '</PolyData>']
+
+    # Try opening the file for writing
+    try:
+        with open(file_name, 'wb') as fp:
+            fp.write(("\n".join(lines) + '\n<AppendedData encoding="raw">\n_').encode('ascii'))
+            for block in blocks:
+                fp.write(block)
+            fp.write('\n</AppendedData>\n</VTKFile>\n'.encode('ascii'))
+    except IOError:
+        # Show a warning on failure to open file
+        warnings.warn("File " + str(file_name) + " cannot be opened for writing.")
+
+
+# Exports a point file as a VTK structured grid (legacy format) row by row
+def _export_vtk_mapped(points, file_name, binary):
+    lines = ["# vtk DataFile Version 3.0", repr(points), "BINARY" if binary else "ASCII",
+             "DATASET STRUCTURED_GRID",
+             "DIMENSIONS " + str(points.size_v) + " " + str(points.size_u) + " 1",
+             "POINTS " + str(len(points)) + " float"]
+    try:
+        with open(file_name, 'wb') as fp:
+            fp.write(("\n".join(lines) + "\n").encode('ascii'))
+            for idx in range(points.size_u):
+                values = _vtk_row_values(points.row(idx))
+                if binary:
+                    fp.write(_vtk_to_bytes(values, 'f', big_endian=True))
+                else:
+                    _write_vtk_legacy_values(fp, values, 'f', False, 3)
+            if binary:
+                fp.write(b"\n")
+    except IOError:
+        # Show a warning on failure to open file
+        warnings.warn("File " + str(file_name) + " cannot be opened for writing.")
+
+
+# Exports a point file as a VTK XML structured grid row by row
+def _export_vtk_xml_mapped(points, file_name):
+    extent = "0 " + str(points.size_v - 1) + " 0 " + str(points.size_u - 1) + " 0 0"
+    # The size of the data block might exceed the range of a 32-bit header
+    lines = ['<?xml version="1.0"?>',
+             '<VTKFile type="StructuredGrid" version="0.1" byte_order="LittleEndian" header_type="UInt64">',
+             '<StructuredGrid WholeExtent="' + extent + '">',
+             '<Piece Extent="' + extent + '">',
+             '<PointData>', '</PointData>',
+             '<Points>',
+             '<DataArray type="Float32" Name="Points" NumberOfComponents="3" format="appended" offset="0"/>',
+             '</Points>',
+             '</Piece>', '</StructuredGrid>']
+    try:
+        with open(file_name, 'wb') as fp:
+            fp.write(("\n".join(lines) + '\n<AppendedData encoding="raw">\n_').encode('ascii'))
+            fp.write(struct.pack('<Q', len(points) * 3 * 4))
+            for idx in range(points.size_u):
+                fp.write(_vtk_to_bytes(_vtk_row_values(points.row(idx)), 'f', big_endian=False))
+            fp.write('\n</AppendedData>\n</VTKFile>\n'.encode('ascii'))
+    except IOError:
+        # Show a warning on failure to open file
+        warnings.warn("File " + str(file_name) + " cannot be opened for writing.")
+
+
+# Returns the flat coordinates of a row of a point file as 3-dimensional points
+def _vtk_row_values(row):
+    if row.dimension == 3:
+        return row.data
+    return _vtk_flatten_points(row)
+
+
+# Collects the points, grid dimensions and point data arrays for the VTK exporters
+def _prepare_vtk_data(obj, point_type, **kwargs):
+    point_data_names = kwargs.get('point_data', ())
+    user_data = kwargs.get('user_data', {})
+
     if not isinstance(obj, (Abstract.Curve, Abstract.Surface)):
         raise ValueError("Input object should be a curve or a surface")
 
-    # Pick correct points from the object
+    # Pick correct points from the object and find the grid dimensions
     if point_type == 'ctrlpts':
         points = obj.ctrlpts
+        if isinstance(obj, Abstract.Surface):
+            dims = (obj.ctrlpts_size_v, obj.ctrlpts_size_u)
+        else:
+            dims = (len(points), 1)
     elif point_type == 'evalpts' or point_type == 'curvepts' or point_type == 'surfpts':
         points = obj.evalpts
+        params = _vtk_evaluated_params(obj)
+        if isinstance(obj, Abstract.Surface):
+            dims = (len(params[1]), len(params[0]))
+        else:
+            dims = (len(points), 1)
     else:
         warnings.warn("Please choose a valid point type option")
-        return
+        return None
 
-    # Try opening the file for writing
+    point_data = []
+    if point_data_names:
+        if point_type == 'ctrlpts':
+            warnings.warn("Point data arrays can only be computed for the evaluated points")
+        else:
+            for name in point_data_names:
+                values = _vtk_point_data(obj, name, params)
+                if values is not None:
+                    point_data.append((name, values))
+    for name in sorted(user_data):
+        if len(user_data[name]) != len(points):
+            raise ValueError("Size of the point data array " + str(name) + " must match the number of points")
+        point_data.append((name, user_data[name]))
+
+    return points, dims, point_data
+
+
+# Returns the parameters of the evaluated points, i.e. the parameters used by the last evaluation of the object. The
+# surface parameters are returned in (knots_u, knots_v) format.
+def _vtk_evaluated_params(obj):
+    params = obj._cache.get('evalpts_params')
+    if params is not None:
+        return params
+    # Assume the default evaluation over the whole parametric domain
+    if isinstance(obj, Abstract.Surface):
+        return (utilities.linspace(obj.knotvector_u[obj.degree_u], obj.knotvector_u[-(obj.degree_u + 1)],
+                                   obj.sample_size),
+                utilities.linspace(obj.knotvector_v[obj.degree_v], obj.knotvector_v[-(obj.degree_v + 1)],
+                                   obj.sample_size))
+    return utilities.linspace(obj.knotvector[obj.degree], obj.knotvector[-(obj.degree + 1)], obj.sample_size)
+
+
+# Computes the built-in point data arrays at the evaluated points
+def _vtk_point_data(obj, name, params):
+    if isinstance(obj, Abstract.Surface):
+        params = [(u, v) for u in params[0] for v in params[1]]
+        if name == 'params':
+            return params
+        if name == 'normals':
+            return [obj.normal(u, v, True)[1] for u, v in params]
+        if name == 'curvature':
+            return [_surface_gaussian_curvature(obj, u, v) for u, v in params]
+    else:
+        if name == 'params':
+            return params
+        if name == 'normals':
+            return [_vtk_pad(obj.normal(u, True)[1]) for u in params]
+        if name == 'curvature':
+            return [_curve_curvature(obj, u) for u in params]
+    warnings.warn("Unknown point data array: " + str(name))
+    return None
+
+
+# Computes the curvature of a curve at the given parameter
+def _curve_curvature(curve, u):
+    ders = curve.derivatives(u, 2)
+    d1 = _vtk_pad(ders[1])
+    d2 = _vtk_pad(ders[2])
+    speed = utilities.vector_magnitude(d1)
+    if speed == 0.0:
+        return 0.0
+    return utilities.vector_magnitude(utilities.vector_cross(d1, d2)) / (speed ** 3)
+
+
+# Computes the Gaussian curvature of a surface at the given parameter pair
+def _surface_gaussian_curvature(surface, u, v):
+    skl = surface.derivatives(u, v, 2)
+    su, sv = skl[1][0], skl[0][1]
+    normal = utilities.vector_cross(su, sv)
+    normal_mag = utilities.vector_magnitude(normal)
+    if normal_mag == 0.0:
+        return 0.0
+    normal = [n / normal_mag for n in normal]
+    # First and second fundamental forms
+    e = utilities.vector_dot(su, su)
+    f = utilities.vector_dot(su, sv)
+    g = utilities.vector_dot(sv, sv)
+    l = utilities.vector_dot(skl[2][0], normal)
+    m = utilities.vector_dot(skl[1][1], normal)
+    n = utilities.vector_dot(skl[0][2], normal)
+    return ((l * n) - (m * m)) / ((e * g) - (f * f))
+
+
+# VTK points are always 3-dimensional
+def _vtk_pad(pt):
+    if len(pt) == 2:
+        return [pt[0], pt[1], 0.0]
+    return pt
+
+
+def _vtk_flatten_points(points):
+    if len(points[0]) == 2:
+        return [c for pt in points for c in (pt[0], pt[1], 0.0)]
+    return [c for pt in points for c in pt]
+
+
+# Converts a flat list of numbers to raw bytes using the given byte order
+def _vtk_to_bytes(values, typecode, big_endian):
+    arr = array(typecode, values)
+    if big_endian != (sys.byteorder == 'big'):
+        arr.byteswap()
     try:
-        with open(file_name, 'w') as fp:
-            # Write header to the file
-            fp.write("# vtk DataFile Version 3.0\n")
-            fp.write(repr(obj) + "\n")
-            fp.write("ASCII\nDATASET POLYDATA\n")
-            fp.write("POINTS " + str(len(points)) + " FLOAT\n")
+        return arr.tobytes()
+    except AttributeError:
+        return arr.tostring()  # Python 2.x
 
-            # Loop through points
-            for pt in points:
-                line = " ".join(str(c) for c in pt) + "\n"
-                fp.write(line)
 
-    except IOError:
-        # Show a warning on failure to open file
-        warnings.warn("File " + str(file_name) + " cannot be opened for writing.")
+# Writes the values as big-endian binary (as required by legacy VTK) or as ASCII text
+def _write_vtk_legacy_values(fp, values, typecode, binary, line_size=1):
+    if binary:
+        fp.write(_vtk_to_bytes(values, typecode, big_endian=True))
+        fp.write(b"\n")
+    else:
+        lines = [" ".join(str(v) for v in values[i:i + line_size]) for i in range(0, len(values), line_size)]
+        fp.write(("\n".join(lines) + "\n").encode('ascii'))
 
 
 # Saves surface(s) as a .obj file
@@ -189,11 +504,18 @@ def save_stl(surf_in, file_name, **kwargs):
         * *binary* (``bool``): True if the saved STL file is going to be in binary format
         * *vertex_spacing* (``int``): size of the triangle edge in terms of points sampled on the surface
 
+    The evaluated points stored in a point file (:class:`.buffers.MappedPoints`) are also accepted as the input. Such
+    inputs can only be saved in binary format and the triangles are generated row by row without loading the whole
+    file into the memory.
     """
     binary = kwargs.get('binary', True)
     vertex_spacing = kwargs.get('vertex_spacing', 2)
 
-    if isinstance(surf_in, Multi.MultiSurface):
+    if isinstance(surf_in, buffers.MappedPoints):
+        if not binary:
+            raise ValueError("Point files can only be saved as binary STL files")
+        save_stl_binary_mapped(surf_in, file_name=file_name, vertex_spacing=vertex_spacing)
+    elif isinstance(surf_in, Multi.MultiSurface):
         if binary:
             save_stl_binary_multi(surf_in, file_name=file_name, vertex_spacing=vertex_spacing)
         else:
@@ -613,6 +935,57 @@ def save_stl_binary_multi(surface_list, **kwargs):
         print("Cannot open " + str(file_name) + " for writing")
 
 
+def save_stl_binary_mapped(points, **kwargs):
+    """ Saves the points stored in a point file as a binary .stl file.
+
+    The triangles are generated for each pair of the consecutive rows of points, therefore the peak memory usage is
+    bounded by the size of a row.
+
+    :param points: point file
+    :type points: buffers.MappedPoints
+
+    Keyword Arguments:
+        * file_name (str): name of the output file
+        * vertex_spacing (int): size of the triangle edge in terms of points sampled on the surface
+
+    """
+    # Get keyword arguments
+    file_name = kwargs.get('file_name', 'default.stl')
+    vertex_spacing = kwargs.get('vertex_spacing', 2)
+
+    # Input validity checking
+    if not isinstance(points, buffers.MappedPoints):
+        raise ValueError("Input is not a point file")
+    if vertex_spacing < 1 or not isinstance(vertex_spacing, int):
+        raise ValueError("Vertex spacing must be an integer value and it must be bigger than zero")
+    rows = range(0, points.size_u, vertex_spacing)
+    cols = range(0, points.size_v, vertex_spacing)
+    if len(rows) < 2 or len(cols) < 2:
+        raise ValueError("Vertex spacing is too large for the number of points")
+    if points.dimension != 3:
+        raise ValueError("STL files can only store 3-dimensional points")
+
+    # Create the file and start saving triangulated surface points
+    try:
+        with open(file_name, 'wb') as fp:
+            fp.write(b'\0' * 80)  # header
+            fp.write(struct.pack('<i', 2 * (len(rows) - 1) * (len(cols) - 1)))  # number of triangles
+            prev_row = None
+            for idx in rows:
+                row = points.row(idx)
+                cur_row = [row[j] for j in cols]
+                if prev_row is not None:
+                    vertices, triangles = _gen_triangles_vertices(prev_row + cur_row, len(cols), 2, 1)
+                    for t in triangles:
+                        fp.write(struct.pack('<3f', *t.normal))  # normal
+                        for v in t.vertices:
+                            fp.write(struct.pack('<3f', *v.data))  # vertices
+                        fp.write(b'\0\0')  # attribute byte count
+                prev_row = cur_row
+    except IOError:
+        print("Cannot open " + str(file_name) + " for writing")
+
+
 def save_off_single(surface, **kwargs):
     """ Saves a single surface as a .off file.
 
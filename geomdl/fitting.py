@@ -0,0 +1,528 @@
+"""
+.. module:: fitting
+    :platform: Unix, Windows
+    :synopsis: Curve and surface fitting (interpolation and approximation) algorithms
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import math
+from . import bisect
+from . import multiprocessing
+from . import BSpline
+from . import NURBS
+from . import helpers
+from . import linalg
+from . import quadrature
+
+
+def interpolate_curve(points, degree, **kwargs):
+    """ Interpolates a B-Spline curve through the data points.
+
+    Implements Algorithm A9.1 of *The NURBS Book*. The parameters of the data points are computed using the chord
+    length or the centripetal method and the knot vector is generated by averaging the parameters (Eq. 9.8). The
+    collocation matrix has at most ``degree + 1`` non-zero elements on each row, therefore the linear system is
+    solved using a banded LU decomposition in O(n * degree^2) operations.
+
+    Keyword Arguments:
+        * ``centripetal``: activates the centripetal parameterization method. *Default: False*
+
+    :param points: data points
+    :type points: list, tuple
+    :param degree: degree of the output curve
+    :type degree: int
+    :return: interpolated B-Spline curve
+    :rtype: BSpline.Curve
+    """
+    num_points = len(points)
+    if degree < 1 or num_points < degree + 1:
+        raise ValueError("Number of data points should be at least degree + 1")
+
+    # Compute the parameters and the knot vector
+    params = compute_params_curve(points, kwargs.get('centripetal', False))
+    kv = compute_knot_vector(degree, num_points, params)
+
+    # Solve the linear system for the control points
+    lu = linalg.BandedLU(collocation_matrix(degree, kv, params), degree, degree)
+    ctrlpts = lu.solve(points)
+
+    # Generate the curve. The knot vector setter rounds the knots, so the computed knots are assigned directly.
+    curve = BSpline.Curve()
+    curve.degree = degree
+    curve.ctrlpts = ctrlpts
+    curve._knot_vector = kv
+    return curve
+
+
+def compute_params_curve(points, centripetal=False):
+    """ Computes the parameters of the data points using the chord length or the centripetal method.
+
+    Please refer to Eq. 9.5 and Eq. 9.6 of *The NURBS Book* for details.
+
+    :param points: data points
+    :type points: list, tuple
+    :param centripetal: activates the centripetal parameterization method
+    :type centripetal: bool
+    :return: parameters of the data points
+    :rtype: list
+    """
+    # Distances between the consecutive data points
+    dists = [math.sqrt(sum([(c2 - c1) ** 2 for c1, c2 in zip(pt1, pt2)])) for pt1, pt2 in zip(points[0:-1], points[1:])]
+    if centripetal:
+        dists = [math.sqrt(d) for d in dists]
+    total = sum(dists)
+    if total == 0.0:
+        raise ValueError("The data points must not be coincident")
+
+    params = [0.0]
+    for d in dists:
+        params.append(params[-1] + (d / total))
+    params[-1] = 1.0
+    return params
+
+
+def compute_knot_vector(degree, num_points, params):
+    """ Computes the knot vector by averaging the parameters of the data points.
+
+    Please refer to Eq. 9.8 of *The NURBS Book* for details.
+
+    :param degree: degree
+    :type degree: int
+    :param num_points: number of data points
+    :type num_points: int
+    :param params: parameters of the data points
+    :type params: list, tuple
+    :return: knot vector
+    :rtype: list
+    """
+    kv = [0.0 for _ in range(degree + 1)]
+    for i in range(num_points - degree - 1):
+        kv.append(sum(params[i + 1:i + degree + 1]) / degree)
+    kv += [1.0 for _ in range(degree + 1)]
+    return kv
+
+
+def interpolate_surface(points, size_u, size_v, degree_u, degree_v, **kwargs):
+    """ Interpolates a B-Spline surface through the grid of data points.
+
+    Implements Algorithm A9.4 of *The NURBS Book*. The collocation matrices of the U- and V-directions are factored
+    once using the banded LU decomposition. The rows of the data grid are interpolated in V-direction first, then the
+    columns of the resulting grid are interpolated in U-direction. All rows (or columns) are solved at once, as if
+    they were a single system with vector-valued right-hand side.
+
+    The data points should be ordered like the control points, i.e. the V-direction index changes fastest. If the
+    weights of the data points are provided, the homogeneous data points are interpolated and a NURBS surface is
+    returned, which passes through the data points.
+
+    The batched solutions can be distributed to a process pool using the ``processes`` keyword argument. This is
+    useful for very large grids only, since the data has to be copied to the worker processes.
+
+    Keyword Arguments:
+        * ``centripetal``: activates the centripetal parameterization method. *Default: False*
+        * ``weights``: weights of the data points. *Default: None*
+        * ``processes``: number of worker processes. *Default: None (no process pool)*
+
+    :param points: data points
+    :type points: list, tuple
+    :param size_u: number of data points in U-direction
+    :type size_u: int
+    :param size_v: number of data points in V-direction
+    :type size_v: int
+    :param degree_u: degree of the output surface in U-direction
+    :type degree_u: int
+    :param degree_v: degree of the output surface in V-direction
+    :type degree_v: int
+    :return: interpolated surface
+    :rtype: BSpline.Surface or NURBS.Surface
+    """
+    if len(points) != size_u * size_v:
+        raise ValueError("Number of data points should be equal to size_u * size_v")
+    if degree_u < 1 or size_u < degree_u + 1 or degree_v < 1 or size_v < degree_v + 1:
+        raise ValueError("Number of data points should be at least degree + 1 in each direction")
+    weights = kwargs.get('weights', None)
+    processes = kwargs.get('processes', None)
+
+    # Compute the parameters and the knot vectors
+    params_u, params_v = compute_params_surface(points, size_u, size_v, kwargs.get('centripetal', False))
+    kv_u = compute_knot_vector(degree_u, size_u, params_u)
+    kv_v = compute_knot_vector(degree_v, size_v, params_v)
+
+    # Factor the collocation matrices once
+    lu_u = linalg.BandedLU(collocation_matrix(degree_u, kv_u, params_u), degree_u, degree_u)
+    lu_v = linalg.BandedLU(collocation_matrix(degree_v, kv_v, params_v), degree_v, degree_v)
+
+    if weights is not None:
+        points = [[c * w for c in pt] + [w] for pt, w in zip(points, weights)]
+
+    pool = multiprocessing.Pool(processes) if processes else None
+    try:
+        ctrlpts = _solve_grid(lu_u, lu_v, points, size_u, size_v, pool, 4 * (processes or 1))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return _make_surface(degree_u, degree_v, kv_u, kv_v, ctrlpts, size_u, size_v, weights is not None)
+
+
+def approximate_curve(points, degree, **kwargs):
+    """ Approximates a B-Spline curve to the data points using the least squares method.
+
+    Please refer to Section 9.4.1 of *The NURBS Book* for details. Unlike Algorithm A9.7, all control points are
+    computed by the least squares method, i.e. the curve does not necessarily pass through the end points. The normal
+    equations are banded, therefore they are solved using a banded LU decomposition.
+
+    The optional smoothing term adds the integral of the squared second derivative of the curve (first derivative for
+    linear curves) multiplied by the smoothing weight to the least squares functional.
+
+    Keyword Arguments:
+        * ``ctrlpts_size``: number of control points. *Default: number of data points - 1*
+        * ``centripetal``: activates the centripetal parameterization method. *Default: False*
+        * ``smoothing``: weight of the smoothing term. *Default: 0*
+
+    :param points: data points
+    :type points: list, tuple
+    :param degree: degree of the output curve
+    :type degree: int
+    :return: approximated B-Spline curve
+    :rtype: BSpline.Curve
+    """
+    num_points = len(points)
+    num_ctrlpts = kwargs.get('ctrlpts_size', num_points - 1)
+    if degree < 1 or num_ctrlpts < degree + 1 or num_ctrlpts > num_points:
+        raise ValueError("Number of control points should be between degree + 1 and the number of data points")
+
+    # Compute the parameters and the knot vector
+    params = compute_params_curve(points, kwargs.get('centripetal', False))
+    kv = compute_knot_vector_approximation(degree, num_ctrlpts, params)
+
+    # Solve the normal equations for the control points
+    system = _LeastSquaresSystem(degree, kv, num_ctrlpts, params, kwargs.get('smoothing', 0.0))
+    ctrlpts = system.solve(points)
+
+    # Generate the curve. The knot vector setter rounds the knots, so the computed knots are assigned directly.
+    curve = BSpline.Curve()
+    curve.degree = degree
+    curve.ctrlpts = ctrlpts
+    curve._knot_vector = kv
+    return curve
+
+
+def approximate_surface(points, size_u, size_v, degree_u, degree_v, **kwargs):
+    """ Approximates a B-Spline surface to the grid of data points using the least squares method.
+
+    Please refer to Section 9.4.3 of *The NURBS Book* for details. The tensor product structure of the data is used
+    for solving the problem separably: the rows of the data grid are approximated in V-direction first, then the
+    columns of the resulting grid are approximated in U-direction. The normal equations of each direction are factored
+    once and solved for all rows (or columns) at once.
+
+    The data points should be ordered like the control points, i.e. the V-direction index changes fastest. The
+    smoothing term is applied in each direction, as described in :func:`.approximate_curve`.
+
+    Keyword Arguments:
+        * ``ctrlpts_size_u``: number of control points in U-direction. *Default: size_u - 1*
+        * ``ctrlpts_size_v``: number of control points in V-direction. *Default: size_v - 1*
+        * ``centripetal``: activates the centripetal parameterization method. *Default: False*
+        * ``smoothing``: weight of the smoothing term. *Default: 0*
+
+    :param points: data points
+    :type points: list, tuple
+    :param size_u: number of data points in U-direction
+    :type size_u: int
+    :param size_v: number of data points in V-direction
+    :type size_v: int
+    :param degree_u: degree of the output surface in U-direction
+    :type degree_u: int
+    :param degree_v: degree of the output surface in V-direction
+    :type degree_v: int
+    :return: approximated B-Spline surface
+    :rtype: BSpline.Surface
+    """
+    if len(points) != size_u * size_v:
+        raise ValueError("Number of data points should be equal to size_u * size_v")
+    num_u = kwargs.get('ctrlpts_size_u', size_u - 1)
+    num_v = kwargs.get('ctrlpts_size_v', size_v - 1)
+    if degree_u < 1 or num_u < degree_u + 1 or num_u > size_u or \
+            degree_v < 1 or num_v < degree_v + 1 or num_v > size_v:
+        raise ValueError("Number of control points should be between degree + 1 and the number of data points")
+    smoothing = kwargs.get('smoothing', 0.0)
+
+    # Compute the parameters and the knot vectors
+    params_u, params_v = compute_params_surface(points, size_u, size_v, kwargs.get('centripetal', False))
+    kv_u = compute_knot_vector_approximation(degree_u, num_u, params_u)
+    kv_v = compute_knot_vector_approximation(degree_v, num_v, params_v)
+
+    # Approximate the rows, then the columns
+    system_u = _LeastSquaresSystem(degree_u, kv_u, num_u, params_u, smoothing)
+    system_v = _LeastSquaresSystem(degree_v, kv_v, num_v, params_v, smoothing)
+    ctrlpts = _solve_grid(system_u, system_v, points, size_u, size_v)
+
+    return _make_surface(degree_u, degree_v, kv_u, kv_v, ctrlpts, num_u, num_v)
+
+
+def approximate_surface_scattered(points, params, degree_u, degree_v, ctrlpts_size_u, ctrlpts_size_v, **kwargs):
+    """ Approximates a B-Spline surface to the scattered data points using the least squares method.
+
+    The normal equations are assembled directly in the band storage format, therefore the memory usage depends on the
+    number of control points and the degrees, not on the number of data points. The knot vectors are uniform.
+
+    The optional smoothing term adds the thin plate energy of the surface in the parametric domain (the integral of
+    ``S_uu^2 + 2 S_uv^2 + S_vv^2``) multiplied by the smoothing weight to the least squares functional. The smoothing
+    term also regularizes the problem, when some knot spans do not contain any data points.
+
+    Keyword Arguments:
+        * ``smoothing``: weight of the smoothing term. *Default: 0*
+
+    :param points: data points
+    :type points: list, tuple
+    :param params: (u, v) parameters of the data points
+    :type params: list, tuple
+    :param degree_u: degree of the output surface in U-direction
+    :type degree_u: int
+    :param degree_v: degree of the output surface in V-direction
+    :type degree_v: int
+    :param ctrlpts_size_u: number of control points in U-direction
+    :type ctrlpts_size_u: int
+    :param ctrlpts_size_v: number of control points in V-direction
+    :type ctrlpts_size_v: int
+    :return: approximated B-Spline surface
+    :rtype: BSpline.Surface
+    """
+    if len(points) != len(params):
+        raise ValueError("Number of data points and parameters should be the same")
+    if degree_u < 1 or ctrlpts_size_u < degree_u + 1 or degree_v < 1 or ctrlpts_size_v < degree_v + 1:
+        raise ValueError("Number of control points should be at least degree + 1")
+    smoothing = kwargs.get('smoothing', 0.0)
+    kv_u = _uniform_knot_vector(degree_u, ctrlpts_size_u)
+    kv_v = _uniform_knot_vector(degree_v, ctrlpts_size_v)
+
+    # The control points are ordered with the V-direction index changing fastest, therefore the band width of the
+    # normal matrix is degree_u * ctrlpts_size_v + degree_v
+    width = (degree_u * ctrlpts_size_v) + degree_v
+    num = ctrlpts_size_u * ctrlpts_size_v
+    band = linalg.band_matrix(num, width, width)
+    dim = len(points[0])
+    rhs = [[0.0 for _ in range(dim)] for _ in range(num)]
+
+    # Assemble the normal equations
+    spans_u = _find_spans(degree_u, kv_u, ctrlpts_size_u, [uv[0] for uv in params])
+    spans_v = _find_spans(degree_v, kv_v, ctrlpts_size_v, [uv[1] for uv in params])
+    for pt, (u, v), span_u, span_v in zip(points, params, spans_u, spans_v):
+        basis_u = helpers.basis_function(degree_u, kv_u, span_u, u)
+        basis_v = helpers.basis_function(degree_v, kv_v, span_v, v)
+        indices = [(span_u - degree_u + k) * ctrlpts_size_v + span_v - degree_v + l
+                   for k in range(degree_u + 1) for l in range(degree_v + 1)]
+        values = [bu * bv for bu in basis_u for bv in basis_v]
+        for idx1, val1 in zip(indices, values):
+            row = band[idx1]
+            for idx2, val2 in zip(indices, values):
+                row[idx2 - idx1 + width] += val1 * val2
+            rhs_row = rhs[idx1]
+            for c in range(dim):
+                rhs_row[c] += val1 * pt[c]
+
+    # Add the thin plate energy
+    if smoothing:
+        order_u = min(2, degree_u)
+        order_v = min(2, degree_v)
+        gram_u = [_gram_matrix(degree_u, kv_u, ctrlpts_size_u, d) for d in range(order_u + 1)]
+        gram_v = [_gram_matrix(degree_v, kv_v, ctrlpts_size_v, d) for d in range(order_v + 1)]
+        terms = [(gram_u[order_u], gram_v[0], 1.0), (gram_u[0], gram_v[order_v], 1.0),
+                 (gram_u[1], gram_v[1], 2.0 if order_u == order_v == 2 else 0.0)]
+        for i1 in range(ctrlpts_size_u):
+            for i2 in range(max(0, i1 - degree_u), min(ctrlpts_size_u, i1 + degree_u + 1)):
+                for j1 in range(ctrlpts_size_v):
+                    row = band[i1 * ctrlpts_size_v + j1]
+                    for j2 in range(max(0, j1 - degree_v), min(ctrlpts_size_v, j1 + degree_v + 1)):
+                        value = sum([f * gu[i1][i2 - i1 + degree_u] * gv[j1][j2 - j1 + degree_v]
+                                     for gu, gv, f in terms if f])
+                        row[(i2 - i1) * ctrlpts_size_v + j2 - j1 + width] += smoothing * value
+
+    ctrlpts = linalg.BandedLU(band, width, width).solve(rhs)
+    return _make_surface(degree_u, degree_v, kv_u, kv_v, ctrlpts, ctrlpts_size_u, ctrlpts_size_v)
+
+
+def compute_params_surface(points, size_u, size_v, centripetal=False):
+    """ Computes the parameters of the grid of data points.
+
+    The parameters of each row and column of the grid are computed using :func:`.compute_params_curve` and averaged
+    as described in Section 9.2.5 of *The NURBS Book*.
+
+    :param points: data points, the V-direction index changes fastest
+    :type points: list, tuple
+    :param size_u: number of data points in U-direction
+    :type size_u: int
+    :param size_v: number of data points in V-direction
+    :type size_v: int
+    :param centripetal: activates the centripetal parameterization method
+    :type centripetal: bool
+    :return: parameters in U- and V-directions
+    :rtype: tuple
+    """
+    params_u = [0.0 for _ in range(size_u)]
+    for j in range(size_v):
+        params = compute_params_curve([points[i * size_v + j] for i in range(size_u)], centripetal)
+        params_u = [p1 + (p2 / size_v) for p1, p2 in zip(params_u, params)]
+    params_v = [0.0 for _ in range(size_v)]
+    for i in range(size_u):
+        params = compute_params_curve(points[i * size_v:(i + 1) * size_v], centripetal)
+        params_v = [p1 + (p2 / size_u) for p1, p2 in zip(params_v, params)]
+    params_u[-1] = 1.0
+    params_v[-1] = 1.0
+    return params_u, params_v
+
+
+def compute_knot_vector_approximation(degree, num_ctrlpts, params):
+    """ Computes the knot vector for least squares approximation.
+
+    Please refer to Eq. 9.68 and Eq. 9.69 of *The NURBS Book* for details. The knots are placed such that every knot
+    span contains at least one parameter.
+
+    :param degree: degree
+    :type degree: int
+    :param num_ctrlpts: number of control points
+    :type num_ctrlpts: int
+    :param params: parameters of the data points
+    :type params: list, tuple
+    :return: knot vector
+    :rtype: list
+    """
+    num_points = len(params)
+    d = float(num_points) / (num_ctrlpts - degree)
+    kv = [0.0 for _ in range(degree + 1)]
+    for j in range(1, num_ctrlpts - degree):
+        i = int(j * d)
+        alpha = (j * d) - i
+        kv.append(((1.0 - alpha) * params[i - 1]) + (alpha * params[i]))
+    kv += [1.0 for _ in range(degree + 1)]
+    return kv
+
+
+def collocation_matrix(degree, knot_vector, params):
+    """ Computes the B-Spline collocation matrix in the band storage format.
+
+    The element ``(i, j)`` of the matrix is the value of the j-th basis function at the i-th parameter. The matrix
+    is stored as described in :func:`.linalg.band_matrix` with ``degree`` sub- and super-diagonals, which is
+    sufficient when the parameters satisfy the Schoenberg-Whitney conditions (e.g. the knot vector is computed by
+    :func:`.compute_knot_vector`).
+
+    :param degree: degree
+    :type degree: int
+    :param knot_vector: knot vector
+    :type knot_vector: list, tuple
+    :param params: parameters
+    :type params: list, tuple
+    :return: collocation matrix
+    :rtype: list
+    """
+    num = len(params)
+    band = linalg.band_matrix(num, degree, degree)
+    spans = _find_spans(degree, knot_vector, num, params)
+    for i, (span, u) in enumerate(zip(spans, params)):
+        row = band[i]
+        for k, value in enumerate(helpers.basis_function(degree, knot_vector, span, u)):
+            offset = span - degree + k - i + degree
+            if 0 <= offset <= 2 * degree:
+                row[offset] = value
+            elif value != 0.0:
+                raise ValueError("The parameters do not satisfy the Schoenberg-Whitney conditions")
+    return band
+
+
+def _find_spans(degree, knot_vector, num_ctrlpts, knots):
+    # Finds the knot spans of the knots using binary search
+    return [min(max(bisect.bisect_right(knot_vector, knot) - 1, degree), num_ctrlpts - 1) for knot in knots]
+
+
+def _uniform_knot_vector(degree, num_ctrlpts):
+    num_spans = num_ctrlpts - degree
+    return [0.0 for _ in range(degree)] + [float(i) / num_spans for i in range(num_spans + 1)] + \
+        [1.0 for _ in range(degree)]
+
+
+def _gram_matrix(degree, knot_vector, num_ctrlpts, order):
+    # Computes the integrals of the products of the basis function derivatives in the band storage format
+    gram = linalg.band_matrix(num_ctrlpts, degree, degree)
+    for span, _, weights, ders in quadrature.basis_tables(degree, knot_vector, num_ctrlpts, degree + 1, order):
+        for w, bfd in zip(weights, ders):
+            values = bfd[order]
+            for a in range(degree + 1):
+                row = gram[span - degree + a]
+                for b in range(degree + 1):
+                    row[b - a + degree] += w * values[a] * values[b]
+    return gram
+
+
+def _make_surface(degree_u, degree_v, kv_u, kv_v, ctrlpts, size_u, size_v, rational=False):
+    # The knot vector setters round the knots, so the computed knots are assigned directly
+    surf = NURBS.Surface() if rational else BSpline.Surface()
+    surf.degree_u = degree_u
+    surf.degree_v = degree_v
+    surf.set_ctrlpts(ctrlpts, size_u, size_v)
+    surf._knot_vector_u = kv_u
+    surf._knot_vector_v = kv_v
+    return surf
+
+
+def _solve_grid(system_u, system_v, points, size_u, size_v, pool=None, num_chunks=1):
+    # Solves the tensor product problem separably. All rows of the grid are solved at once by concatenating their
+    # coordinates, and the same is done for the columns of the intermediate grid.
+    dim = len(points[0])
+    cols = [[c for i in range(size_u) for c in points[i * size_v + j]] for j in range(size_v)]
+    temp = _solve_batch(system_v, cols, pool, num_chunks)
+    rows = [[c for j in range(system_v.size) for c in temp[j][i * dim:(i + 1) * dim]] for i in range(size_u)]
+    res = _solve_batch(system_u, rows, pool, num_chunks)
+    return [res[i][j * dim:(j + 1) * dim] for i in range(system_u.size) for j in range(system_v.size)]
+
+
+def _solve_batch(system, vectors, pool=None, num_chunks=1):
+    # Splits the components of the right-hand side vectors into chunks and solves them in the process pool
+    if pool is None:
+        return system.solve(vectors)
+    length = len(vectors[0])
+    num_chunks = min(length, num_chunks)
+    bounds = [(length * k) // num_chunks for k in range(num_chunks + 1)]
+    chunks = [(system, [vec[start:stop] for vec in vectors]) for start, stop in zip(bounds[0:-1], bounds[1:])]
+    results = pool.map(_solve_chunk, chunks)
+    return [[c for res in results for c in res[i]] for i in range(system.size)]
+
+
+def _solve_chunk(args):
+    system, vectors = args
+    return system.solve(vectors)
+
+
+class _LeastSquaresSystem(object):
+    # Factored normal equations of the least squares curve approximation problem
+
+    def __init__(self, degree, knot_vector, num_ctrlpts, params, smoothing=0.0):
+        self._degree = degree
+        self._size = num_ctrlpts
+        self._spans = _find_spans(degree, knot_vector, num_ctrlpts, params)
+        self._basis = [helpers.basis_function(degree, knot_vector, span, u) for span, u in zip(self._spans, params)]
+        band = linalg.band_matrix(num_ctrlpts, degree, degree)
+        for span, basis in zip(self._spans, self._basis):
+            for a in range(degree + 1):
+                row = band[span - degree + a]
+                for b in range(degree + 1):
+                    row[b - a + degree] += basis[a] * basis[b]
+        if smoothing:
+            gram = _gram_matrix(degree, knot_vector, num_ctrlpts, min(2, degree))
+            band = [[b + (smoothing * g) for b, g in zip(row_b, row_g)] for row_b, row_g in zip(band, gram)]
+        self._lu = linalg.BandedLU(band, degree, degree)
+
+    @property
+    def size(self):
+        return self._size
+
+    def solve(self, points):
+        # Multiplies the data with the transpose of the collocation matrix and solves the normal equations
+        dim = len(points[0])
+        rhs = [[0.0 for _ in range(dim)] for _ in range(self._size)]
+        for pt, span, basis in zip(points, self._spans, self._basis):
+            for a in range(self._degree + 1):
+                value = basis[a]
+                rhs_row = rhs[span - self._degree + a]
+                rhs_row[:] = [r + (value * c) for r, c in zip(rhs_row, pt)]
+        return self._lu.solve(rhs)
@@ -7,6 +7,9 @@
 
 """
 
+from . import math
+from . import bisect
+
 
 def find_span_binsearch(degree=0, knot_vector=(), control_points_size=0, knot=0, tol=0.001):
     """ Finds the span of the knot over the input knot vector using binary search.
@@ -264,3 +267,397 @@ def find_multiplicity(knot, knot_vector, **kwargs):
             mult += 1
 
     return mult
+
+
+def check_multiplicity(degree, knot_vector, knot_list):
+    """ Checks if the knot multiplicities stay valid after inserting the knots in the list.
+
+    The internal knots can be repeated at most ``degree`` times and the knots on the domain boundaries cannot be
+    inserted.
+
+    :param degree: degree
+    :type degree: int
+    :param knot_vector: knot vector
+    :type knot_vector: list, tuple
+    :param knot_list: sorted list of knots to be inserted
+    :type knot_list: list, tuple
+    :return: the first knot violating the multiplicity rule or None
+    :rtype: float
+    """
+    # The knots on the domain boundaries cannot be inserted
+    for knot in (knot_list[0], knot_list[-1]):
+        if knot <= knot_vector[degree] or knot >= knot_vector[-(degree + 1)]:
+            return knot
+
+    merged = sorted(list(knot_vector[degree + 1:-(degree + 1)]) + list(knot_list))
+    mult = 0
+    for idx, knot in enumerate(merged):
+        mult = mult + 1 if idx > 0 and knot == merged[idx - 1] else 1
+        if mult > degree:
+            return knot
+    return None
+
+
+def knot_refinement(degree, knot_vector, ctrlpts, knot_list):
+    """ Inserts multiple knots into the knot vector in a single pass.
+
+    Implementation of Algorithm A5.4 from The NURBS Book by Piegl & Tiller.
+
+    The control points are treated as flat lists of coordinates, i.e. a complete row of surface control points can be
+    concatenated into a single list to refine all rows at the same time.
+
+    :param degree: degree
+    :type degree: int
+    :param knot_vector: knot vector
+    :type knot_vector: list, tuple
+    :param ctrlpts: control points
+    :type ctrlpts: list, tuple
+    :param knot_list: sorted list of knots to be inserted
+    :type knot_list: list, tuple
+    :return: refined knot vector and control points
+    :rtype: tuple
+    """
+    n = len(ctrlpts) - 1
+    m = n + degree + 1
+    r = len(knot_list) - 1
+
+    a = find_span(knot_vector, len(ctrlpts), knot_list[0])
+    b = find_span(knot_vector, len(ctrlpts), knot_list[r]) + 1
+
+    # Initialize new knot vector and control points arrays
+    UQ = [None for _ in range(m + r + 2)]
+    Q = [None for _ in range(n + r + 2)]
+
+    # Save unaltered control points and knots
+    for j in range(0, a - degree + 1):
+        Q[j] = ctrlpts[j]
+    for j in range(b - 1, n + 1):
+        Q[j + r + 1] = ctrlpts[j]
+    for j in range(0, a + 1):
+        UQ[j] = knot_vector[j]
+    for j in range(b + degree, m + 1):
+        UQ[j + r + 1] = knot_vector[j]
+
+    # Insert the knots, starting from the last one
+    i = b + degree - 1
+    k = b + degree + r
+    for j in range(r, -1, -1):
+        while knot_list[j] <= knot_vector[i] and i > a:
+            Q[k - degree - 1] = ctrlpts[i - degree - 1]
+            UQ[k] = knot_vector[i]
+            k -= 1
+            i -= 1
+        Q[k - degree - 1] = Q[k - degree]
+        for l in range(1, degree + 1):
+            idx = k - degree + l
+            alpha = UQ[k + l] - knot_list[j]
+            if abs(alpha) == 0.0:
+                Q[idx - 1] = Q[idx]
+            else:
+                alpha = alpha / (UQ[k + l] - knot_vector[i - degree + l])
+                Q[idx - 1] = [alpha * elem1 + (1.0 - alpha) * elem2 for elem1, elem2 in zip(Q[idx - 1], Q[idx])]
+        UQ[k] = knot_list[j]
+        k -= 1
+
+    return UQ, Q
+
+
+def decompose_curve(degree, knot_vector, ctrlpts):
+    """ Decomposes the curve into Bezier segments in a single pass.
+
+    Implementation of Algorithm A5.6 from The NURBS Book by Piegl & Tiller.
+
+    The control points are treated as flat lists of coordinates, i.e. a complete row of surface control points can be
+    concatenated into a single list to decompose all rows at the same time.
+
+    :param degree: degree
+    :type degree: int
+    :param knot_vector: knot vector
+    :type knot_vector: list, tuple
+    :param ctrlpts: control points
+    :type ctrlpts: list, tuple
+    :return: list of Bezier segments, each containing (degree + 1) control points
+    :rtype: list
+    """
+    m = len(ctrlpts) + degree
+    a = degree
+    b = degree + 1
+    nb = 0
+    alphas = [0.0 for _ in range(degree + 1)]
+
+    # Number of Bezier segments is equal to the number of non-zero knot spans
+    num_segments = 0
+    for i in range(degree, m - degree):
+        if knot_vector[i] != knot_vector[i + 1]:
+            num_segments += 1
+
+    # Initialize the Bezier segments array
+    Q = [[None for _ in range(degree + 1)] for _ in range(num_segments)]
+    for i in range(0, degree + 1):
+        Q[nb][i] = ctrlpts[i]
+
+    while b < m:
+        i = b
+        while b < m and knot_vector[b + 1] == knot_vector[b]:
+            b += 1
+        mult = b - i + 1
+        if mult < degree:
+            # Compute the alphas
+            numer = knot_vector[b] - knot_vector[a]
+            for j in range(degree, mult, -1):
+                alphas[j - mult - 1] = numer / (knot_vector[a + j] - knot_vector[a])
+            # Insert the knot (degree - mult) times
+            r = degree - mult
+            for j in range(1, r + 1):
+                save = r - j
+                s = mult + j
+                for k in range(degree, s - 1, -1):
+                    alpha = alphas[k - s]
+                    Q[nb][k] = [alpha * elem1 + (1.0 - alpha) * elem2 for elem1, elem2 in zip(Q[nb][k], Q[nb][k - 1])]
+                if b < m:
+                    # Control point of the next segment
+                    Q[nb + 1][save] = Q[nb][degree]
+        nb += 1
+        if b < m:
+            # Initialize the next segment
+            for i in range(degree - mult, degree + 1):
+                Q[nb][i] = ctrlpts[b - degree + i]
+            a = b
+            b += 1
+
+    return Q
+
+
+def point_distance(pt1, pt2, dimension):
+    """ Computes the maximum distance between the points stored in two flat lists of coordinates.
+
+    :param pt1: first list of coordinates
+    :type pt1: list, tuple
+    :param pt2: second list of coordinates
+    :type pt2: list, tuple
+    :param dimension: number of coordinates of a single point
+    :type dimension: int
+    :return: maximum of the distances between the corresponding points
+    :rtype: float
+    """
+    dist = 0.0
+    for idx in range(0, len(pt1), dimension):
+        d = math.sqrt(sum([(c1 - c2) ** 2 for c1, c2 in zip(pt1[idx:idx + dimension], pt2[idx:idx + dimension])]))
+        dist = max(dist, d)
+    return dist
+
+
+def knot_removal_error(degree, knot_vector, ctrlpts, knot, **kwargs):
+    """ Computes the deviation caused by removing the knot from the knot vector once.
+
+    Uses the removability check of Algorithm A5.8 from The NURBS Book by Piegl & Tiller. The returned value is an upper
+    bound of the distance between the curves before and after the knot removal.
+
+    Keyword Arguments:
+        * ``dimension``: number of coordinates of a single point. *Default: length of a control point*
+
+    :param degree: degree
+    :type degree: int
+    :param knot_vector: knot vector
+    :type knot_vector: list, tuple
+    :param ctrlpts: control points
+    :type ctrlpts: list, tuple
+    :param knot: knot to be removed
+    :type knot: float
+    :return: deviation
+    :rtype: float
+    """
+    dim = kwargs.get('dimension', len(ctrlpts[0]))
+
+    r = find_span(knot_vector, len(ctrlpts), knot)
+    s = find_multiplicity(knot, knot_vector, tol=0.0)
+    first = r - degree
+    last = r - s
+    off = first - 1
+
+    temp = [None for _ in range(last - off + 2)]
+    temp[0] = ctrlpts[off]
+    temp[last + 1 - off] = ctrlpts[last + 1]
+    i = first
+    j = last
+    ii = 1
+    jj = last - off
+    while j - i > 0:
+        alfi = (knot - knot_vector[i]) / (knot_vector[i + degree + 1] - knot_vector[i])
+        alfj = (knot - knot_vector[j]) / (knot_vector[j + degree + 1] - knot_vector[j])
+        temp[ii] = [(pt - (1.0 - alfi) * tpt) / alfi for pt, tpt in zip(ctrlpts[i], temp[ii - 1])]
+        temp[jj] = [(pt - alfj * tpt) / (1.0 - alfj) for pt, tpt in zip(ctrlpts[j], temp[jj + 1])]
+        i += 1
+        ii += 1
+        j -= 1
+        jj -= 1
+
+    if j - i < 0:
+        return point_distance(temp[ii - 1], temp[jj + 1], dim)
+    alfi = (knot - knot_vector[i]) / (knot_vector[i + degree + 1] - knot_vector[i])
+    ptn = [alfi * tpt1 + (1.0 - alfi) * tpt2 for tpt1, tpt2 in zip(temp[ii + 1], temp[ii - 1])]
+    return point_distance(ctrlpts[i], ptn, dim)
+
+
+def knot_removal(degree, knot_vector, ctrlpts, knot, num=1, **kwargs):
+    """ Removes the knot from the knot vector, as long as the curve shape stays within the tolerance.
+
+    Implementation of Algorithm A5.8 from The NURBS Book by Piegl & Tiller.
+
+    The control points are treated as flat lists of coordinates, i.e. a complete row of surface control points can be
+    concatenated into a single list to remove the knot from all rows at the same time. In that case, the deviation is
+    the maximum of the deviations of the individual points.
+
+    Keyword Arguments:
+        * ``tol``: maximum allowed deviation. *Default: 0.0001*
+        * ``dimension``: number of coordinates of a single point. *Default: length of a control point*
+
+    :param degree: degree
+    :type degree: int
+    :param knot_vector: knot vector
+    :type knot_vector: list, tuple
+    :param ctrlpts: control points
+    :type ctrlpts: list, tuple
+    :param knot: knot to be removed
+    :type knot: float
+    :param num: maximum number of knot removals
+    :type num: int
+    :return: knot vector and control points after knot removal
+    :rtype: tuple
+    """
+    tol = kwargs.get('tol', 0.0001)
+    dim = kwargs.get('dimension', len(ctrlpts[0]))
+
+    n = len(ctrlpts) - 1
+    m = n + degree + 1
+    order = degree + 1
+    r = find_span(knot_vector, len(ctrlpts), knot)
+    s = find_multiplicity(knot, knot_vector, tol=0.0)
+    fout = (2 * r - s - degree) // 2
+    first = r - degree
+    last = r - s
+
+    UQ = list(knot_vector)
+    Q = list(ctrlpts)
+    temp = [None for _ in range(2 * degree + 1)]
+
+    t = 0
+    while t < min(num, s):
+        # Difference in index between temp and Q
+        off = first - 1
+        temp[0] = Q[off]
+        temp[last + 1 - off] = Q[last + 1]
+        i = first
+        j = last
+        ii = 1
+        jj = last - off
+
+        # Compute new control points for one removal step
+        while j - i > t:
+            alfi = (knot - UQ[i]) / (UQ[i + order + t] - UQ[i])
+            alfj = (knot - UQ[j - t]) / (UQ[j + order] - UQ[j - t])
+            temp[ii] = [(pt - (1.0 - alfi) * tpt) / alfi for pt, tpt in zip(Q[i], temp[ii - 1])]
+            temp[jj] = [(pt - alfj * tpt) / (1.0 - alfj) for pt, tpt in zip(Q[j], temp[jj + 1])]
+            i += 1
+            ii += 1
+            j -= 1
+            jj -= 1
+
+        # Check if the knot is removable
+        if j - i < t:
+            dist = point_distance(temp[ii - 1], temp[jj + 1], dim)
+        else:
+            alfi = (knot - UQ[i]) / (UQ[i + order + t] - UQ[i])
+            ptn = [alfi * tpt1 + (1.0 - alfi) * tpt2 for tpt1, tpt2 in zip(temp[ii + t + 1], temp[ii - 1])]
+            dist = point_distance(Q[i], ptn, dim)
+        if dist > tol:
+            break
+
+        # Successful removal, save the new control points
+        i = first
+        j = last
+        while j - i > t:
+            Q[i] = temp[i - off]
+            Q[j] = temp[j - off]
+            i += 1
+            j -= 1
+
+        first -= 1
+        last += 1
+        t += 1
+
+    if t == 0:
+        return UQ, Q
+
+    # Shift knots
+    for k in range(r + 1, m + 1):
+        UQ[k - t] = UQ[k]
+
+    # Shift control points, Q[j] to Q[i] will be overwritten
+    j = fout
+    i = j
+    for k in range(1, t):
+        if k % 2 == 1:
+            i += 1
+        else:
+            j -= 1
+    for k in range(i + 1, n + 1):
+        Q[j] = Q[k]
+        j += 1
+
+    return UQ[:-t], Q[:-t]
+
+
+def reduce_curve(degree, knot_vector, ctrlpts, tol, **kwargs):
+    """ Removes all knots that can be removed without exceeding the deviation bound.
+
+    Knots are removed one at a time using Algorithm A5.8 from The NURBS Book by Piegl & Tiller. The deviation caused by
+    each removal is accumulated over the knot spans it affects, and a knot is only removed if the accumulated deviation
+    on all of these spans stays within the tolerance.
+
+    Keyword Arguments:
+        * ``dimension``: number of coordinates of a single point. *Default: length of a control point*
+
+    :param degree: degree
+    :type degree: int
+    :param knot_vector: knot vector
+    :type knot_vector: list, tuple
+    :param ctrlpts: control points
+    :type ctrlpts: list, tuple
+    :param tol: maximum allowed deviation
+    :type tol: float
+    :return: knot vector, control points and the upper bound of the deviation
+    :rtype: tuple
+    """
+    dim = kwargs.get('dimension', len(ctrlpts[0]))
+
+    # Accumulated deviations on the non-zero knot spans of the input knot vector
+    knots = sorted(set(knot_vector[degree:-degree]))
+    errors = [0.0 for _ in range(len(knots) - 1)]
+
+    UQ = list(knot_vector)
+    Q = list(ctrlpts)
+
+    removed = True
+    while removed:
+        removed = False
+        for knot in sorted(set(UQ[degree + 1:-(degree + 1)])):
+            # The knot could be removed completely in this pass
+            if knot not in UQ:
+                continue
+            dist = knot_removal_error(degree, UQ, Q, knot, dimension=dim)
+
+            # Find the knot spans affected by the removal
+            r = find_span(UQ, len(Q), knot)
+            s = find_multiplicity(knot, UQ, tol=0.0)
+            start = bisect.bisect_right(knots, UQ[r - degree]) - 1
+            stop = bisect.bisect_left(knots, UQ[r - s + degree + 1])
+            if max(errors[start:stop] + [0.0]) + dist > tol:
+                continue
+
+            UQ, Q = knot_removal(degree, UQ, Q, knot, tol=dist, dimension=dim)
+            for idx in range(start, stop):
+                errors[idx] += dist
+            removed = True
+
+    return UQ, Q, max(errors) if errors else 0.0
@@ -0,0 +1,706 @@
+"""
+.. module:: intersection
+    :platform: Unix, Windows
+    :synopsis: Intersection queries on curves and surfaces
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import math
+from . import heapq
+from . import Abstract
+from . import utilities
+from . import spatial
+
+
+class SurfaceRayCaster(object):
+    """ Intersects rays with a surface.
+
+    The surface is decomposed into Bezier patches once and a bounding volume hierarchy is built over the control point
+    bounding boxes of the patches. Due to the convex hull property, a ray cannot hit a patch without entering its
+    bounding box. For each ray, the patches are visited in the order of the ray entering their bounding boxes. Each
+    patch is recursively subdivided into quarters using de Casteljau algorithm and the pieces missed by the ray are
+    discarded. The pieces hit by the ray are visited in the order of the ray entering them and when a piece is flat (or
+    the maximum subdivision depth is reached), the intersection point is computed using Newton iteration on the ray
+    represented as the intersection of two planes. The iteration starts from the center of the piece and it is
+    restricted to the parametric domain of the piece. Therefore, the first hit found is the closest one.
+
+    The ray caster does not track the changes on the surface. It should be created again after modifying the surface.
+
+    Keyword Arguments:
+        * ``tol``: tolerance of the intersection point. *Default: 1e-8*
+        * ``max_iter``: maximum number of Newton iterations. *Default: 20*
+        * ``flatness``: maximum deviation of a piece from its bilinear approximation, relative to the size of the
+          surface. *Default: 1e-2*
+        * ``max_depth``: maximum subdivision depth of the patches. *Default: 10*
+
+    :param obj: 3D surface
+    :type obj: Abstract.Surface
+    """
+
+    def __init__(self, obj, **kwargs):
+        if not isinstance(obj, Abstract.Surface):
+            raise TypeError("The input must be an instance of a Surface")
+        if obj.dimension != 3:
+            raise ValueError("Ray casting requires a 3D surface")
+        self._obj = obj
+        self._tol = kwargs.get('tol', 1e-8)
+        self._max_iter = kwargs.get('max_iter', 20)
+        self._max_depth = kwargs.get('max_depth', 10)
+
+        # Bezier patches as (u-range, v-range, bounding box, control points) tuples
+        self._patches = _surface_patches(obj)
+        self._flatness = kwargs.get('flatness', 1e-2) * \
+            _bbox_diagonal(_bbox([pt for patch in self._patches for row in patch[3] for pt in row], obj.rational))
+
+        # Build the hierarchy over the patch bounding boxes
+        self._bvh = spatial.BoundingVolumeHierarchy([self._expand(patch[2]) for patch in self._patches])
+
+    @property
+    def surface(self):
+        """ Surface object.
+
+        :getter: Gets the surface object
+        :type: Abstract.Surface
+        """
+        return self._obj
+
+    @property
+    def bvh(self):
+        """ Bounding volume hierarchy over the Bezier patches of the surface.
+
+        :getter: Gets the bounding volume hierarchy
+        :type: spatial.BoundingVolumeHierarchy
+        """
+        return self._bvh
+
+    def intersect(self, origin, direction):
+        """ Finds the closest intersection of the ray with the surface.
+
+        :param origin: origin of the ray
+        :type origin: list, tuple
+        :param direction: direction of the ray
+        :type direction: list, tuple
+        :return: ray parameter, surface parameters, point and unit normal of the hit or None, if there is no hit
+        :rtype: tuple
+        """
+        planes = self._ray_planes(origin, direction)
+        dir_sq = utilities.vector_dot(direction, direction)
+
+        hit = None
+        for t_entry, idx in self._bvh.ray_intersect(origin, direction):
+            # Patches are visited in increasing order of the ray parameter
+            if hit is not None and t_entry > hit[0]:
+                break
+            res = self._intersect_patch(idx, origin, direction, dir_sq, planes,
+                                        float('inf') if hit is None else hit[0])
+            if res is not None and (hit is None or res[0] < hit[0]):
+                hit = res
+        return hit
+
+    def intersect_rays(self, rays):
+        """ Finds the closest intersections of the rays with the surface.
+
+        :param rays: list of rays, each defined by its origin and its direction
+        :type rays: list, tuple
+        :return: list of hits, see :py:meth:`intersect` for the contents
+        :rtype: list
+        """
+        return [self.intersect(origin, direction) for origin, direction in rays]
+
+    @staticmethod
+    def _ray_planes(origin, direction):
+        # Represent the ray as the intersection of two planes, N1 . P + d1 = 0 and N2 . P + d2 = 0
+        if abs(direction[0]) > abs(direction[1]) and abs(direction[0]) > abs(direction[2]):
+            n1 = [direction[1], -direction[0], 0.0]
+        else:
+            n1 = [0.0, direction[2], -direction[1]]
+        n1 = utilities.vector_normalize(n1)
+        n2 = utilities.vector_normalize(utilities.vector_cross(direction, n1))
+        return (n1, -utilities.vector_dot(n1, origin)), (n2, -utilities.vector_dot(n2, origin))
+
+    def _expand(self, bbox):
+        # Flat patches should still be hit by the rays parallel to them
+        return [c - self._tol for c in bbox[0]], [c + self._tol for c in bbox[1]]
+
+    def _intersect_patch(self, idx, origin, direction, dir_sq, planes, t_max):
+        # Visit the pieces of the patch in increasing order of the ray parameter
+        rational = self._obj.rational
+        counter = 0
+        heap = [(0.0, counter, self._patches[idx], 0)]
+        hit = None
+        while heap:
+            t_entry, _, piece, depth = heapq.heappop(heap)
+            if t_entry > t_max or (hit is not None and t_entry > hit[0]):
+                break
+            deviation = _surface_deviation(piece[3], rational)
+            if depth >= self._max_depth or deviation <= self._flatness:
+                res = self._newton(piece[0], piece[1], origin, direction, dir_sq, planes)
+                # A grazing ray might hit a flat piece twice, therefore the hit is accepted only if the angle between
+                # the ray and the tangent plane is big compared to the deviation of the piece from a bilinear patch
+                if res is not None and (depth >= self._max_depth or abs(utilities.vector_dot(res[3], direction)) *
+                                        _bbox_diagonal(piece[2]) > 4.0 * deviation * math.sqrt(dir_sq)):
+                    if hit is None or res[0] < hit[0]:
+                        hit = res
+                    continue
+                if depth >= self._max_depth:
+                    continue
+            # Subdivide the piece, if it is not flat or the iteration cannot find an acceptable hit
+            for sub in _split_patch(piece, rational):
+                res = spatial.ray_box_intersection(origin, direction, self._expand(sub[2]), t_max)
+                if res is not None and not self._separated(sub[3], planes):
+                    counter += 1
+                    heapq.heappush(heap, (res[0], counter, sub, depth + 1))
+        return hit
+
+    def _separated(self, ctrlpts2d, planes):
+        # Checks if all control points are on the same side of one of the planes defining the ray. Due to the convex
+        # hull property, the ray cannot hit the piece in this case. This test is much tighter than the bounding box test.
+        rational = self._obj.rational
+        points = [_euclidean(pt, rational) for row in ctrlpts2d for pt in row]
+        for normal, dist in planes:
+            values = [utilities.vector_dot(normal, pt) + dist for pt in points]
+            if min(values) > self._tol or max(values) < -self._tol:
+                return True
+        return False
+
+    def _newton(self, range_u, range_v, origin, direction, dir_sq, planes):
+        # Newton iteration restricted to the parametric domain of the piece
+        (n1, d1), (n2, d2) = planes
+        u = (range_u[0] + range_u[1]) / 2.0
+        v = (range_v[0] + range_v[1]) / 2.0
+        for _ in range(self._max_iter):
+            skl = self._obj.derivatives(u, v, order=1)
+            pt = skl[0][0]
+            f1 = utilities.vector_dot(n1, pt) + d1
+            f2 = utilities.vector_dot(n2, pt) + d2
+            if abs(f1) <= self._tol and abs(f2) <= self._tol:
+                t = utilities.vector_dot([c - o for c, o in zip(pt, origin)], direction) / dir_sq
+                if t < 0.0:
+                    return None
+                normal = utilities.vector_cross(skl[1][0], skl[0][1])
+                if any(normal):
+                    normal = utilities.vector_normalize(normal)
+                return t, (u, v), pt, normal
+
+            # Solve the 2x2 system for the parameter update
+            j00 = utilities.vector_dot(n1, skl[1][0])
+            j01 = utilities.vector_dot(n1, skl[0][1])
+            j10 = utilities.vector_dot(n2, skl[1][0])
+            j11 = utilities.vector_dot(n2, skl[0][1])
+            det = (j00 * j11) - (j01 * j10)
+            if det == 0.0:
+                return None
+            u_new = u - (((f1 * j11) - (f2 * j01)) / det)
+            v_new = v - (((f2 * j00) - (f1 * j10)) / det)
+            # Stop if the iteration moves far away from the piece, the neighboring pieces are checked separately
+            if not (range_u[0] - (range_u[1] - range_u[0]) <= u_new <= range_u[1] + (range_u[1] - range_u[0]) and
+                    range_v[0] - (range_v[1] - range_v[0]) <= v_new <= range_v[1] + (range_v[1] - range_v[0])):
+                return None
+            u_new = min(max(u_new, range_u[0]), range_u[1])
+            v_new = min(max(v_new, range_v[0]), range_v[1])
+            if u_new == u and v_new == v:
+                return None
+            u = u_new
+            v = v_new
+        return None
+
+
+def ray_cast(obj, rays, **kwargs):
+    """ Finds the closest intersections of the rays with the surface.
+
+    This is a convenience function creating a :py:class:`.SurfaceRayCaster` instance with the keyword arguments and
+    casting the rays. Please create a ray caster instance directly to reuse the bounding volume hierarchy between
+    consecutive calls.
+
+    :param obj: 3D surface
+    :type obj: Abstract.Surface
+    :param rays: list of rays, each defined by its origin and its direction
+    :type rays: list, tuple
+    :return: list of hits, see :py:meth:`.SurfaceRayCaster.intersect` for the contents
+    :rtype: list
+    """
+    return SurfaceRayCaster(obj, **kwargs).intersect_rays(rays)
+
+
+def intersect_curves(obj1, obj2, **kwargs):
+    """ Finds the intersection points of two curves.
+
+    Both curves are decomposed into Bezier segments, which are recursively subdivided into halves using de Casteljau
+    algorithm. The segment pairs with non-overlapping control point bounding boxes are discarded. When both segments
+    of a pair are flat (or the maximum subdivision depth is reached), the intersection of their chords is used as the
+    initial guess of a Newton iteration on the original curves.
+
+    Keyword Arguments:
+        * ``tol``: maximum distance between the curves at the intersection points. *Default: 1e-8*
+        * ``flatness``: maximum deviation of a segment from its chord, relative to the size of the curves.
+          *Default: 1e-3*
+        * ``max_depth``: maximum subdivision depth. *Default: 20*
+        * ``max_iter``: maximum number of Newton iterations. *Default: 20*
+
+    :param obj1: first curve
+    :type obj1: Abstract.Curve
+    :param obj2: second curve
+    :type obj2: Abstract.Curve
+    :return: list of (parameter on the first curve, parameter on the second curve, intersection point) tuples
+    :rtype: list
+    """
+    if not isinstance(obj1, Abstract.Curve) or not isinstance(obj2, Abstract.Curve):
+        raise TypeError("The inputs must be instances of a Curve")
+    if obj1.dimension != obj2.dimension:
+        raise ValueError("The curves must have the same dimension")
+    tol = kwargs.get('tol', 1e-8)
+    max_depth = kwargs.get('max_depth', 20)
+    max_iter = kwargs.get('max_iter', 20)
+    flatness = kwargs.get('flatness', 1e-3) * _bbox_diagonal(_bbox_merge(obj1.bbox, obj2.bbox))
+
+    segments1 = _curve_segments(obj1)
+    segments2 = _curve_segments(obj2)
+
+    # Subdivide overlapping segment pairs until they are flat
+    results = []
+    stack = [(seg1, seg2, 0) for seg1 in segments1 for seg2 in segments2]
+    while stack:
+        seg1, seg2, depth = stack.pop()
+        if not _bbox_overlap(seg1[1], seg2[1], tol):
+            continue
+        flat1 = _is_flat_curve(seg1[2], flatness, obj1.rational)
+        flat2 = _is_flat_curve(seg2[2], flatness, obj2.rational)
+        if (flat1 and flat2) or depth >= max_depth:
+            u1, u2 = _chord_intersection(seg1, seg2, obj1.rational, obj2.rational)
+            res = _newton_curves(obj1, obj2, u1, u2, tol, max_iter)
+            if res is not None and not any([_distance(res[2], r[2]) <= 10 * tol for r in results]):
+                results.append(res)
+            continue
+        # Subdivide the segment which is not flat or the longer one
+        if flat2 or (not flat1 and _bbox_diagonal(seg1[1]) >= _bbox_diagonal(seg2[1])):
+            for seg in _split_segment(seg1, obj1.rational):
+                stack.append((seg, seg2, depth + 1))
+        else:
+            for seg in _split_segment(seg2, obj2.rational):
+                stack.append((seg1, seg, depth + 1))
+
+    return sorted(results)
+
+
+def intersect_surfaces(obj1, obj2, **kwargs):
+    """ Finds the intersection curves of two 3D surfaces.
+
+    Both surfaces are decomposed into Bezier patches, which are recursively subdivided into quarters using de
+    Casteljau algorithm. The patch pairs with non-overlapping control point bounding boxes are discarded. When both
+    patches of a pair are flat (or the maximum subdivision depth is reached), the centers of the patches are moved onto
+    the intersection using Newton iteration. The intersection curves are traced from these points by marching along
+    the intersection direction with a predictor-corrector scheme.
+
+    Each intersection curve is returned as a list of (point, (u, v) on the first surface, (u, v) on the second
+    surface) tuples. The first and the last points of the closed intersection curves are the same.
+
+    Keyword Arguments:
+        * ``tol``: maximum distance between the surfaces at the intersection points. *Default: 1e-8*
+        * ``step``: distance between the consecutive points of the intersection curves, relative to the size of the
+          surfaces. *Default: 1e-2*
+        * ``flatness``: maximum deviation of a patch from a bilinear patch, relative to the size of the surfaces.
+          *Default: 1e-2*
+        * ``max_depth``: maximum subdivision depth. *Default: 10*
+        * ``max_iter``: maximum number of Newton iterations. *Default: 20*
+        * ``max_points``: maximum number of points on an intersection curve. *Default: 10000*
+
+    :param obj1: first surface
+    :type obj1: Abstract.Surface
+    :param obj2: second surface
+    :type obj2: Abstract.Surface
+    :return: list of intersection curves
+    :rtype: list
+    """
+    if not isinstance(obj1, Abstract.Surface) or not isinstance(obj2, Abstract.Surface):
+        raise TypeError("The inputs must be instances of a Surface")
+    if obj1.dimension != 3 or obj2.dimension != 3:
+        raise ValueError("Surface intersection requires 3D surfaces")
+    tol = kwargs.get('tol', 1e-8)
+    max_depth = kwargs.get('max_depth', 10)
+    max_iter = kwargs.get('max_iter', 20)
+    max_points = kwargs.get('max_points', 10000)
+    size = _bbox_diagonal(_bbox_merge(obj1.bbox, obj2.bbox))
+    flatness = kwargs.get('flatness', 1e-2) * size
+    step = kwargs.get('step', 1e-2) * size
+
+    patches1 = _surface_patches(obj1)
+    patches2 = _surface_patches(obj2)
+
+    # Subdivide overlapping patch pairs until they are flat and collect the initial points of the marching
+    seeds = []
+    stack = [(patch1, patch2, 0) for patch1 in patches1 for patch2 in patches2]
+    while stack:
+        patch1, patch2, depth = stack.pop()
+        if not _bbox_overlap(patch1[2], patch2[2], tol):
+            continue
+        flat1 = _is_flat_surface(patch1[3], flatness, obj1.rational)
+        flat2 = _is_flat_surface(patch2[3], flatness, obj2.rational)
+        if (flat1 and flat2) or depth >= max_depth:
+            seeds.append([(patch1[0][0] + patch1[0][1]) / 2.0, (patch1[1][0] + patch1[1][1]) / 2.0,
+                          (patch2[0][0] + patch2[0][1]) / 2.0, (patch2[1][0] + patch2[1][1]) / 2.0])
+            continue
+        # Subdivide the patch which is not flat or the larger one
+        if flat2 or (not flat1 and _bbox_diagonal(patch1[2]) >= _bbox_diagonal(patch2[2])):
+            for patch in _split_patch(patch1, obj1.rational):
+                stack.append((patch, patch2, depth + 1))
+        else:
+            for patch in _split_patch(patch2, obj2.rational):
+                stack.append((patch1, patch, depth + 1))
+
+    # Trace the intersection curves starting from the seeds which are not on the already traced curves
+    curves = []
+    for seed in seeds:
+        params = _newton_surfaces(obj1, obj2, seed, tol, max_iter)
+        if params is None:
+            continue
+        point = obj1.surfpt(params[0], params[1])
+        if any([_distance(point, pt[0]) < step for curve in curves for pt in curve]):
+            continue
+        curve = _march_surfaces(obj1, obj2, params, step, tol, max_iter, max_points)
+        if curve:
+            curves.append(curve)
+
+    return curves
+
+
+def _curve_segments(obj):
+    # Returns the Bezier segments of the curve as (parameter range, bounding box, control points) tuples
+    knots = sorted(set(obj.knotvector))
+    segments = []
+    for (u0, u1), segment in zip(zip(knots[0:-1], knots[1:]), obj.decompose()):
+        ctrlpts = [list(pt) for pt in (segment.ctrlptsw if obj.rational else segment.ctrlpts)]
+        segments.append(((u0, u1), _bbox(ctrlpts, obj.rational), ctrlpts))
+    return segments
+
+
+def _surface_patches(obj):
+    # Returns the Bezier patches of the surface as (u-range, v-range, bounding box, control points) tuples
+    knots_u = sorted(set(obj.knotvector_u))
+    knots_v = sorted(set(obj.knotvector_v))
+    domains = [((u0, u1), (v0, v1)) for u0, u1 in zip(knots_u[0:-1], knots_u[1:])
+               for v0, v1 in zip(knots_v[0:-1], knots_v[1:])]
+    patches = []
+    for (range_u, range_v), patch in zip(domains, obj.decompose()):
+        ctrlpts2d = [[list(pt) for pt in row] for row in patch.ctrlpts2d]
+        patches.append((range_u, range_v, _bbox([pt for row in ctrlpts2d for pt in row], obj.rational), ctrlpts2d))
+    return patches
+
+
+def _de_casteljau_split(ctrlpts):
+    # Splits the Bezier curve at the parametric mid-point
+    left = [ctrlpts[0]]
+    right = [ctrlpts[-1]]
+    pts = ctrlpts
+    while len(pts) > 1:
+        pts = [[(c1 + c2) / 2.0 for c1, c2 in zip(pt1, pt2)] for pt1, pt2 in zip(pts[0:-1], pts[1:])]
+        left.append(pts[0])
+        right.append(pts[-1])
+    return left, right[::-1]
+
+
+def _split_segment(segment, rational):
+    (u0, u1), _, ctrlpts = segment
+    um = (u0 + u1) / 2.0
+    left, right = _de_casteljau_split(ctrlpts)
+    return ((u0, um), _bbox(left, rational), left), ((um, u1), _bbox(right, rational), right)
+
+
+def _split_patch(patch, rational):
+    # Splits the Bezier patch into four pieces at the parametric mid-point
+    (u0, u1), (v0, v1), _, ctrlpts2d = patch
+    um = (u0 + u1) / 2.0
+    vm = (v0 + v1) / 2.0
+
+    # Split in U-direction, i.e. split each column
+    cols = [_de_casteljau_split([row[j] for row in ctrlpts2d]) for j in range(len(ctrlpts2d[0]))]
+    halves = [[[col[k][i] for col in cols] for i in range(len(ctrlpts2d))] for k in range(2)]
+
+    pieces = []
+    for (ua, ub), half in zip(((u0, um), (um, u1)), halves):
+        # Split in V-direction, i.e. split each row
+        rows = [_de_casteljau_split(row) for row in half]
+        for (va, vb), k in zip(((v0, vm), (vm, v1)), range(2)):
+            ctrlpts = [row[k] for row in rows]
+            pieces.append(((ua, ub), (va, vb), _bbox([pt for row in ctrlpts for pt in row], rational), ctrlpts))
+    return pieces
+
+
+def _euclidean(pt, rational):
+    if rational:
+        return [c / pt[-1] for c in pt[0:-1]]
+    return pt
+
+
+def _bbox(ctrlpts, rational):
+    if rational:
+        ctrlpts = [_euclidean(pt, rational) for pt in ctrlpts]
+    return utilities.evaluate_bounding_box(ctrlpts)
+
+
+def _bbox_merge(bbox1, bbox2):
+    return ([min(c1, c2) for c1, c2 in zip(bbox1[0], bbox2[0])],
+            [max(c1, c2) for c1, c2 in zip(bbox1[1], bbox2[1])])
+
+
+def _bbox_diagonal(bbox):
+    return _distance(bbox[0], bbox[1])
+
+
+def _bbox_overlap(bbox1, bbox2, tol):
+    for min1, max1, min2, max2 in zip(bbox1[0], bbox1[1], bbox2[0], bbox2[1]):
+        if min1 > max2 + tol or min2 > max1 + tol:
+            return False
+    return True
+
+
+def _distance(pt1, pt2):
+    return math.sqrt(sum([(c1 - c2) ** 2 for c1, c2 in zip(pt1, pt2)]))
+
+
+def _point_line_distance(pt, start, end):
+    direction = [c2 - c1 for c1, c2 in zip(start, end)]
+    length_sq = utilities.vector_dot(direction, direction)
+    if length_sq == 0.0:
+        return _distance(pt, start)
+    t = utilities.vector_dot([c - s for c, s in zip(pt, start)], direction) / length_sq
+    return _distance(pt, [s + (t * d) for s, d in zip(start, direction)])
+
+
+def _is_flat_curve(ctrlpts, flatness, rational):
+    # Checks the distances of the control points to the chord
+    pts = [_euclidean(pt, rational) for pt in ctrlpts]
+    return all([_point_line_distance(pt, pts[0], pts[-1]) <= flatness for pt in pts[1:-1]])
+
+
+def _is_flat_surface(ctrlpts2d, flatness, rational):
+    return _surface_deviation(ctrlpts2d, rational) <= flatness
+
+
+def _surface_deviation(ctrlpts2d, rational):
+    # Returns the maximum distance of the control points to the bilinear patch defined by the corner points
+    ctrlpts2d = [[_euclidean(pt, rational) for pt in row] for row in ctrlpts2d]
+    size_u = len(ctrlpts2d)
+    size_v = len(ctrlpts2d[0])
+    p00 = ctrlpts2d[0][0]
+    p01 = ctrlpts2d[0][-1]
+    p10 = ctrlpts2d[-1][0]
+    p11 = ctrlpts2d[-1][-1]
+    deviation = 0.0
+    for i in range(size_u):
+        s = float(i) / (size_u - 1)
+        for j in range(size_v):
+            t = float(j) / (size_v - 1)
+            pt = [((1 - s) * (1 - t) * c00) + ((1 - s) * t * c01) + (s * (1 - t) * c10) + (s * t * c11)
+                  for c00, c01, c10, c11 in zip(p00, p01, p10, p11)]
+            deviation = max(deviation, _distance(pt, ctrlpts2d[i][j]))
+    return deviation
+
+
+def _chord_intersection(seg1, seg2, rational1, rational2):
+    # Finds the parameters of the closest points on the chords of the segments
+    p0 = _euclidean(seg1[2][0], rational1)
+    q0 = _euclidean(seg2[2][0], rational2)
+    d1 = [c2 - c1 for c1, c2 in zip(p0, _euclidean(seg1[2][-1], rational1))]
+    d2 = [c2 - c1 for c1, c2 in zip(q0, _euclidean(seg2[2][-1], rational2))]
+    r = [c1 - c2 for c1, c2 in zip(p0, q0)]
+    a = utilities.vector_dot(d1, d1)
+    b = utilities.vector_dot(d1, d2)
+    c = utilities.vector_dot(d2, d2)
+    d = utilities.vector_dot(d1, r)
+    e = utilities.vector_dot(d2, r)
+    denom = (a * c) - (b * b)
+    s = min(max(((b * e) - (c * d)) / denom, 0.0), 1.0) if denom != 0.0 else 0.5
+    t = min(max(((a * e) - (b * d)) / denom, 0.0), 1.0) if denom != 0.0 else 0.5
+    (u0, u1), (w0, w1) = seg1[0], seg2[0]
+    return u0 + (s * (u1 - u0)), w0 + (t * (w1 - w0))
+
+
+def _gauss_solve(a, b):
+    # Solves the linear system using Gaussian elimination with partial pivoting, returns None if it is singular
+    size = len(b)
+    m = [list(row) + [bi] for row, bi in zip(a, b)]
+    for k in range(size):
+        piv = max(range(k, size), key=lambda i: abs(m[i][k]))
+        if abs(m[piv][k]) < 1e-14:
+            return None
+        m[k], m[piv] = m[piv], m[k]
+        for i in range(k + 1, size):
+            factor = m[i][k] / m[k][k]
+            for j in range(k, size + 1):
+                m[i][j] -= factor * m[k][j]
+    x = [0.0 for _ in range(size)]
+    for k in range(size - 1, -1, -1):
+        x[k] = (m[k][size] - sum([m[k][j] * x[j] for j in range(k + 1, size)])) / m[k][k]
+    return x
+
+
+def _min_norm_step(jac, rhs):
+    # Computes the minimum norm solution of the under-determined system, i.e. J^T (J J^T)^-1 rhs
+    jjt = [[utilities.vector_dot(row1, row2) for row2 in jac] for row1 in jac]
+    y = _gauss_solve(jjt, rhs)
+    if y is None:
+        return None
+    return [sum([jac[i][k] * y[i] for i in range(len(jac))]) for k in range(len(jac[0]))]
+
+
+def _clamp(value):
+    return min(max(value, 0.0), 1.0)
+
+
+def _newton_curves(obj1, obj2, u1, u2, tol, max_iter):
+    # Minimizes the distance between the curve points using Gauss-Newton iteration
+    for _ in range(max_iter):
+        ders1 = obj1.derivatives(u1, order=1)
+        ders2 = obj2.derivatives(u2, order=1)
+        diff = [c1 - c2 for c1, c2 in zip(ders1[0], ders2[0])]
+        if utilities.vector_magnitude(diff) <= tol:
+            return u1, u2, list(ders1[0])
+        # Normal equations of the least squares problem [C1'(u1), -C2'(u2)] [du1, du2]^T = -diff
+        a11 = utilities.vector_dot(ders1[1], ders1[1])
+        a12 = -utilities.vector_dot(ders1[1], ders2[1])
+        a22 = utilities.vector_dot(ders2[1], ders2[1])
+        b1 = -utilities.vector_dot(ders1[1], diff)
+        b2 = utilities.vector_dot(ders2[1], diff)
+        delta = _gauss_solve([[a11, a12], [a12, a22]], [b1, b2])
+        if delta is None:
+            return None
+        u1_new = _clamp(u1 + delta[0])
+        u2_new = _clamp(u2 + delta[1])
+        if u1_new == u1 and u2_new == u2:
+            break
+        u1 = u1_new
+        u2 = u2_new
+    return None
+
+
+def _surface_jacobian(obj1, obj2, params):
+    # Returns the points, the first derivatives and the Jacobian of S1(u1, v1) - S2(u2, v2)
+    skl1 = obj1.derivatives(params[0], params[1], order=1)
+    skl2 = obj2.derivatives(params[2], params[3], order=1)
+    diff = [c1 - c2 for c1, c2 in zip(skl1[0][0], skl2[0][0])]
+    jac = [[skl1[1][0][k], skl1[0][1][k], -skl2[1][0][k], -skl2[0][1][k]] for k in range(3)]
+    return skl1, skl2, diff, jac
+
+
+def _newton_surfaces(obj1, obj2, params, tol, max_iter, plane=None):
+    # Moves the parameters onto the intersection using minimum norm Newton steps.
+    # The optional plane (point, normal) is added as a constraint, which makes the system square.
+    params = list(params)
+    for _ in range(max_iter):
+        skl1, skl2, diff, jac = _surface_jacobian(obj1, obj2, params)
+        rhs = [-d for d in diff]
+        if plane is not None:
+            dist = utilities.vector_dot([c - p for c, p in zip(skl1[0][0], plane[0])], plane[1])
+            rhs.append(-dist)
+            jac.append([utilities.vector_dot(skl1[1][0], plane[1]), utilities.vector_dot(skl1[0][1], plane[1]),
+                        0.0, 0.0])
+            if utilities.vector_magnitude(diff) <= tol and abs(dist) <= tol:
+                return params
+        elif utilities.vector_magnitude(diff) <= tol:
+            return params
+        delta = _gauss_solve(jac, rhs) if plane is not None else _min_norm_step(jac, rhs)
+        if delta is None:
+            return None
+        params_new = [_clamp(p + d) for p, d in zip(params, delta)]
+        if params_new == params:
+            return None
+        params = params_new
+    return None
+
+
+def _march_direction(obj1, obj2, params):
+    # Returns the tangent of the intersection curve and the parameter derivatives along it
+    skl1, skl2, _, _ = _surface_jacobian(obj1, obj2, params)
+    normal1 = utilities.vector_cross(skl1[1][0], skl1[0][1])
+    normal2 = utilities.vector_cross(skl2[1][0], skl2[0][1])
+    tangent = utilities.vector_cross(normal1, normal2)
+    if utilities.vector_magnitude(tangent) < 1e-12:
+        return None
+    tangent = utilities.vector_normalize(tangent)
+
+    # Least squares parameter steps corresponding to the unit tangent on each surface
+    steps = []
+    for su, sv in ((skl1[1][0], skl1[0][1]), (skl2[1][0], skl2[0][1])):
+        a = [[utilities.vector_dot(su, su), utilities.vector_dot(su, sv)],
+             [utilities.vector_dot(su, sv), utilities.vector_dot(sv, sv)]]
+        res = _gauss_solve(a, [utilities.vector_dot(su, tangent), utilities.vector_dot(sv, tangent)])
+        if res is None:
+            return None
+        steps.extend(res)
+    return tangent, steps
+
+
+def _march_surfaces(obj1, obj2, params, step, tol, max_iter, max_points):
+    # Traces the intersection curve in both directions starting from the parameters
+    start = obj1.surfpt(params[0], params[1])
+    first = (start, (params[0], params[1]), (params[2], params[3]))
+    initial = _march_direction(obj1, obj2, params)
+    if initial is None:
+        return [first]
+
+    # The traced points are stored in a grid of step-sized cells as (point, sign of the branch, index) tuples, the
+    # start point is the point 0 of both branches
+    grid = {}
+    _grid_add(grid, step, (start, None, 0))
+    branches = []
+    for sign in (1.0, -1.0):
+        branch = []
+        current = list(params)
+        point = start
+        previous = [sign * t for t in initial[0]]
+        while len(branch) < max_points:
+            direction = _march_direction(obj1, obj2, current)
+            if direction is None:
+                break
+            # Keep the orientation of the tangent consistent with the previous step, the cross product of the
+            # surface normals flips at the crossings and the tangential regions of the intersection curves
+            orient = 1.0 if utilities.vector_dot(direction[0], previous) >= 0.0 else -1.0
+            tangent = [orient * t for t in direction[0]]
+            guess = [_clamp(p + (orient * step * d)) for p, d in zip(current, direction[1])]
+            target = [p + (step * t) for p, t in zip(point, tangent)]
+            params_new = _newton_surfaces(obj1, obj2, guess, tol, max_iter, plane=(target, tangent))
+            if params_new is None:
+                # The plane does not cut the intersection curve inside the domain, try to reach the boundary
+                params_new = _newton_surfaces(obj1, obj2, guess, tol, max_iter)
+                if params_new is None or params_new == current:
+                    break
+            point_new = obj1.surfpt(params_new[0], params_new[1])
+            if _distance(point_new, point) < tol:
+                break
+            # Stop when the curve returns to the traced points, i.e. the curve is closed or the corrector jumped back
+            index = len(branch) + 1
+            returned = [pt for pt in _grid_near(grid, step, point_new)
+                        if (pt[1] not in (None, sign) or pt[2] < index - 2) and _distance(point_new, pt[0]) <= step]
+            if returned:
+                if sign > 0 and any([pt[1] in (None, sign) and pt[2] <= 2 for pt in returned]):
+                    return [first] + branch + [first]
+                break
+            branch.append((point_new, (params_new[0], params_new[1]), (params_new[2], params_new[3])))
+            _grid_add(grid, step, (point_new, sign, index))
+            current = params_new
+            point = point_new
+            previous = tangent
+        branches.append(branch)
+
+    return branches[1][::-1] + [first] + branches[0]
+
+
+def _grid_cell(step, pt):
+    return tuple([int(math.floor(c / step)) for c in pt])
+
+
+def _grid_add(grid, step, item):
+    grid.setdefault(_grid_cell(step, item[0]), []).append(item)
+
+
+def _grid_near(grid, step, pt):
+    # Returns the items in the cells around the point, which contain all items closer than the step size
+    cell = _grid_cell(step, pt)
+    items = []
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            for k in (-1, 0, 1):
+                items.extend(grid.get((cell[0] + i, cell[1] + j, cell[2] + k), []))
+    return items
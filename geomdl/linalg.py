@@ -0,0 +1,126 @@
+"""
+.. module:: linalg
+    :platform: Unix, Windows
+    :synopsis: Linear algebra routines for the banded systems of the fitting algorithms
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+
+def band_matrix(size, lower, upper):
+    """ Generates a zero band matrix.
+
+    The band matrix is stored row by row. The element ``(i, j)`` of the matrix is stored at ``band[i][j - i + lower]``,
+    therefore each row has ``lower + upper + 1`` elements.
+
+    :param size: number of rows (and columns) of the matrix
+    :type size: int
+    :param lower: number of sub-diagonals
+    :type lower: int
+    :param upper: number of super-diagonals
+    :type upper: int
+    :return: band matrix
+    :rtype: list
+    """
+    return [[0.0 for _ in range(lower + upper + 1)] for _ in range(size)]
+
+
+class BandedLU(object):
+    """ LU decomposition of a band matrix.
+
+    The factorization is computed without pivoting, which is stable for the diagonally dominant, totally positive and
+    symmetric positive definite matrices, e.g. the B-spline collocation matrices and the normal equations of the
+    least squares fitting problems. The factors stay inside the band, therefore the decomposition takes
+    O(n * lower * upper) and each solution takes O(n * (lower + upper)) operations.
+
+    The factorization is computed once and can be reused to solve the systems with different right-hand sides.
+
+    :param band: band matrix, see :func:`.band_matrix` for the storage format
+    :type band: list
+    :param lower: number of sub-diagonals
+    :type lower: int
+    :param upper: number of super-diagonals
+    :type upper: int
+    """
+
+    def __init__(self, band, lower, upper):
+        self._lower = lower
+        self._upper = upper
+        self._lu = [list(row) for row in band]
+        self._factorize()
+
+    @property
+    def size(self):
+        """ Number of rows (and columns) of the matrix.
+
+        :getter: Gets the size of the matrix
+        :type: int
+        """
+        return len(self._lu)
+
+    def _factorize(self):
+        lu = self._lu
+        lower = self._lower
+        size = len(lu)
+        for k in range(size):
+            row_k = lu[k]
+            pivot = row_k[lower]
+            if pivot == 0.0:
+                raise ValueError("The matrix is singular")
+            stop = min(k + self._upper, size - 1)
+            for i in range(k + 1, min(k + lower, size - 1) + 1):
+                row_i = lu[i]
+                offset = k - i + lower
+                factor = row_i[offset] / pivot
+                row_i[offset] = factor
+                if factor == 0.0:
+                    continue
+                # Element (i, j) is at index j - i + lower, element (k, j) is at index j - k + lower
+                shift = k - i
+                for j in range(lower + 1, stop - k + lower + 1):
+                    row_i[j + shift] -= factor * row_k[j]
+
+    def solve(self, rhs):
+        """ Solves the linear system for the right-hand side.
+
+        The right-hand side can be a list of numbers or a list of vectors, e.g. a list of points. In the latter case,
+        the system is solved for all components of the vectors at once.
+
+        :param rhs: right-hand side
+        :type rhs: list, tuple
+        :return: solution
+        :rtype: list
+        """
+        if len(rhs) != len(self._lu):
+            raise ValueError("The right-hand side must have " + str(len(self._lu)) + " elements")
+        if rhs and isinstance(rhs[0], (list, tuple)):
+            return self._solve([list(r) for r in rhs])
+        return [x[0] for x in self._solve([[r] for r in rhs])]
+
+    def _solve(self, x):
+        lu = self._lu
+        lower = self._lower
+        size = len(lu)
+
+        # Forward substitution with the unit lower triangular factor
+        for i in range(size):
+            row_i = lu[i]
+            x_i = x[i]
+            for j in range(max(0, i - lower), i):
+                factor = row_i[j - i + lower]
+                if factor != 0.0:
+                    x_i[:] = [c_i - (factor * c_j) for c_i, c_j in zip(x_i, x[j])]
+
+        # Back substitution with the upper triangular factor
+        for i in range(size - 1, -1, -1):
+            row_i = lu[i]
+            x_i = x[i]
+            for j in range(i + 1, min(i + self._upper, size - 1) + 1):
+                factor = row_i[j - i + lower]
+                if factor != 0.0:
+                    x_i[:] = [c_i - (factor * c_j) for c_i, c_j in zip(x_i, x[j])]
+            pivot = row_i[lower]
+            x_i[:] = [c_i / pivot for c_i in x_i]
+
+        return x
@@ -0,0 +1,268 @@
+"""
+.. module:: lod
+    :platform: Unix, Windows
+    :synopsis: Multi-resolution level of detail pyramids of the evaluated surface points
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import array
+from . import buffers
+from . import profiling
+from . import tiles
+
+
+class Pyramid(object):
+    """ Level of detail pyramid of the evaluated surface points.
+
+    The surface is evaluated on a uniform grid of ``base_size x base_size`` points at the level 0. The finer levels,
+    i.e. the positive levels, double the number of intervals of the previous level in each direction. Since the points
+    of a level are a subset of the points of the next finer level, only the new rows and columns are evaluated. The
+    coarser levels, i.e. the negative levels, are generated by subsampling the base level without any evaluations.
+    The levels are generated on demand and cached until the surface is modified.
+
+    .. code-block:: python
+
+        pyramid = surf.pyramid(base_size=33)
+
+        # Generate the coarser level with 9 x 9 points by subsampling
+        coarse = pyramid.level(-2)
+
+        # Generate the finer level with 65 x 65 points by evaluating only the new points
+        fine = pyramid.level(1)
+
+    :param obj: surface
+    :type obj: BSpline.Surface or NURBS.Surface
+    :param base_size: number of points of the base level in each direction
+    :type base_size: int
+    """
+
+    def __init__(self, obj, base_size=33):
+        if base_size < 2:
+            raise ValueError("Base size must be bigger than 1")
+        self._obj = obj
+        self._base_size = base_size
+        self._levels = {}
+        self._version = None
+
+    def __len__(self):
+        return len(self._levels)
+
+    @property
+    def surface(self):
+        """ Surface bound to the pyramid.
+
+        :getter: Gets the surface
+        :type: BSpline.Surface or NURBS.Surface
+        """
+        return self._obj
+
+    @property
+    def base_size(self):
+        """ Number of points of the base level in each direction.
+
+        :getter: Gets the base size
+        :type: int
+        """
+        return self._base_size
+
+    @property
+    def min_level(self):
+        """ Coarsest available level.
+
+        The coarser levels can be generated as long as the number of intervals of the base level is divisible by 2.
+
+        :getter: Gets the coarsest level
+        :type: int
+        """
+        level = 0
+        intervals = self._base_size - 1
+        while intervals % 2 == 0:
+            intervals //= 2
+            level -= 1
+        return level
+
+    def sample_size(self, level):
+        """ Returns the number of points of the level in each direction.
+
+        :param level: level of detail
+        :type level: int
+        :return: number of points in each direction
+        :rtype: int
+        """
+        if level < self.min_level:
+            raise ValueError("Level " + str(level) + " is coarser than the coarsest level " + str(self.min_level))
+        if level < 0:
+            return ((self._base_size - 1) // (2 ** -level)) + 1
+        return ((self._base_size - 1) * (2 ** level)) + 1
+
+    def select_level(self, sample_size):
+        """ Selects the coarsest level with at least the given number of points in each direction.
+
+        :param sample_size: required number of points in each direction
+        :type sample_size: int
+        :return: level of detail
+        :rtype: int
+        """
+        level = self.min_level
+        while self.sample_size(level) < sample_size:
+            level += 1
+        return level
+
+    def clear(self):
+        """ Removes all levels from the pyramid. """
+        self._levels.clear()
+
+    def level(self, level=0):
+        """ Returns the evaluated points of the level, generating the level if necessary.
+
+        :param level: level of detail, 0 is the base level
+        :type level: int
+        :return: evaluated points of the level in the same order as ``evalpts``
+        :rtype: tiles.Window
+        """
+        size = self.sample_size(level)
+        if self._version != self._obj._version:
+            self.clear()
+            self._version = self._obj._version
+        if level in self._levels:
+            profiling.count('cache.lod.hits')
+            return self._levels[level]
+        profiling.count('cache.lod.misses')
+
+        if level == 0:
+            data = self._evaluate(self._params(size, 'u'), self._params(size, 'v'))
+        elif level < 0:
+            data = self._subsample(self.level(0), 2 ** -level)
+        else:
+            data = self._refine(self.level(level - 1))
+
+        dimension = self._obj.dimension
+        window = tiles.Window(data, self._params(size, 'u'), self._params(size, 'v'), dimension, level)
+        self._levels[level] = window
+        return window
+
+    def _domain(self, direction):
+        obj = self._obj
+        if direction == 'u':
+            return obj.knotvector_u[obj.degree_u], obj.knotvector_u[-(obj.degree_u + 1)]
+        return obj.knotvector_v[obj.degree_v], obj.knotvector_v[-(obj.degree_v + 1)]
+
+    def _params(self, size, direction):
+        # Parameters of the grid points. The parameter of the i-th point of a level is computed exactly the same as the
+        # parameter of the (2 * i)-th point of the next finer level.
+        start, stop = self._domain(direction)
+        params = [start + (stop - start) * float(idx) / (size - 1) for idx in range(size - 1)]
+        params.append(stop)
+        return params
+
+    def _evaluate(self, knots_u, knots_v):
+        obj = self._obj
+        out = buffers.allocate(len(knots_u) * len(knots_v) * obj.dimension)
+        if not knots_u or not knots_v:
+            return out
+        evaluator, ctrlpts, dimension = obj._evaluation_data()
+        spts = evaluator.evaluate(knots_u=knots_u, knots_v=knots_v,
+                                  degree_u=obj.degree_u, degree_v=obj.degree_v,
+                                  knotvector_u=obj.knotvector_u, knotvector_v=obj.knotvector_v,
+                                  ctrlpts_size_u=obj.ctrlpts_size_u, ctrlpts_size_v=obj.ctrlpts_size_v,
+                                  ctrlpts=ctrlpts,
+                                  dimension=dimension,
+                                  out=out)
+        buffers.store(spts, out, len(knots_u) * len(knots_v), obj.dimension)
+        return out
+
+    def _subsample(self, base, step):
+        # Copies every step-th point of the every step-th row of the base level
+        dim = base.dimension
+        data = base.data
+        out = array('d')
+        for i in range(0, base.size_u, step):
+            for j in range(0, base.size_v, step):
+                start = ((i * base.size_v) + j) * dim
+                out.extend(data[start:(start + dim)])
+        return out
+
+    def _refine(self, coarse):
+        # The even rows and columns of the finer level are the points of the coarser level, therefore only the odd rows
+        # and the odd columns of the even rows are evaluated
+        dim = coarse.dimension
+        size = (2 * coarse.size_u) - 1
+        knots_u = self._params(size, 'u')
+        knots_v = self._params(size, 'v')
+        rows = self._evaluate(knots_u[1::2], knots_v)
+        cols = self._evaluate(knots_u[0::2], knots_v[1::2])
+
+        out = buffers.allocate(size * size * dim)
+        row_size = size * dim
+        for i in range(size):
+            start = i * row_size
+            if i % 2 == 1:
+                offset = (i // 2) * row_size
+                out[start:(start + row_size)] = rows[offset:(offset + row_size)]
+                continue
+            ci = i // 2
+            for j in range(size):
+                pos = start + (j * dim)
+                if j % 2 == 0:
+                    offset = ((ci * coarse.size_v) + (j // 2)) * dim
+                    out[pos:(pos + dim)] = coarse.data[offset:(offset + dim)]
+                else:
+                    offset = ((ci * (coarse.size_v - 1)) + (j // 2)) * dim
+                    out[pos:(pos + dim)] = cols[offset:(offset + dim)]
+        return out
+
+
+class MultiPyramid(object):
+    """ Level of detail pyramids of the surfaces contained in a :class:`.Multi.MultiSurface` instance.
+
+    :param obj: surface container
+    :type obj: Multi.MultiSurface
+    :param base_size: number of points of the base level in each direction
+    :type base_size: int
+    """
+
+    def __init__(self, obj, base_size=33):
+        self._obj = obj
+        self._base_size = base_size
+        self._pyramids = []
+
+    def __len__(self):
+        return len(self._obj)
+
+    def __getitem__(self, index):
+        return self._pyramid(index)
+
+    @property
+    def base_size(self):
+        """ Number of points of the base level in each direction.
+
+        :getter: Gets the base size
+        :type: int
+        """
+        return self._base_size
+
+    def level(self, level=0):
+        """ Returns the evaluated points of the level for all surfaces.
+
+        :param level: level of detail, 0 is the base level
+        :type level: int
+        :return: list of the evaluated points of the surfaces
+        :rtype: list
+        """
+        return [self._pyramid(idx).level(level) for idx in range(len(self._obj))]
+
+    def clear(self):
+        """ Removes all levels from the pyramids. """
+        for pyramid in self._pyramids:
+            pyramid.clear()
+
+    def _pyramid(self, index):
+        # Regenerates the pyramid if the surface at the index is replaced
+        while len(self._pyramids) < len(self._obj):
+            self._pyramids.append(None)
+        surf = self._obj[index]
+        if self._pyramids[index] is None or self._pyramids[index].surface is not surf:
+            self._pyramids[index] = Pyramid(surf, self._base_size)
+        return self._pyramids[index]
@@ -0,0 +1,472 @@
+"""
+.. module:: prepared
+    :platform: Unix, Windows
+    :synopsis: Prepared (bound) evaluators for the repeated single point queries on curves and surfaces
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import bisect
+from . import operator
+from . import helpers
+from . import utilities
+
+
+class PreparedCurve(object):
+    """ Prepared evaluator of a curve for the repeated single point queries.
+
+    The curve is validated once and its degree, knot vector and control points are copied into the local storage.
+    Therefore, the queries skip the validation steps of :py:meth:`.BSpline.Curve.curvept`. The prepared evaluator is
+    updated automatically on the next query when the curve is modified.
+
+    The parameters are not checked against the parametric domain for performance reasons. Please use the
+    :py:meth:`.BSpline.Curve.prepare` method to generate instances of this class.
+
+    .. code-block:: python
+
+        evaluator = curve.prepare()
+        pt = evaluator(0.5)
+        ders = evaluator.derivatives(0.5, order=2)
+
+    :param obj: curve
+    :type obj: BSpline.Curve or NURBS.Curve
+    """
+
+    def __init__(self, obj):
+        self._obj = obj
+        self._version = None
+        self._update()
+
+    @property
+    def curve(self):
+        """ Curve bound to the evaluator.
+
+        :getter: Gets the curve
+        :type: BSpline.Curve or NURBS.Curve
+        """
+        return self._obj
+
+    def __call__(self, u):
+        """ Evaluates the curve at the given parameter.
+
+        :param u: parameter
+        :type u: float
+        :return: evaluated curve point
+        :rtype: list
+        """
+        if self._obj._version != self._version:
+            self._update()
+        degree = self._degree
+        knot_vector = self._knot_vector
+        span = bisect.bisect_right(knot_vector, u, degree + 1, self._num_ctrlpts) - 1
+        basis = helpers.basis_function(degree, knot_vector, span, u)
+        ctrlpts = self._ctrlpts[span - degree:span + 1]
+        pt = [sum([b * c for b, c in zip(basis, coords)]) for coords in zip(*ctrlpts)]
+        if self._rational:
+            return [c / pt[-1] for c in pt[0:-1]]
+        return pt
+
+    def derivatives(self, u, order=0):
+        """ Evaluates the curve derivatives at the given parameter.
+
+        Implements Algorithm A3.2 of *The NURBS Book* and Algorithm A4.2 for the rational curves.
+
+        :param u: parameter
+        :type u: float
+        :param order: derivative order
+        :type order: int
+        :return: a list containing up to {order}-th derivative of the curve
+        :rtype: list
+        """
+        if self._obj._version != self._version:
+            self._update()
+        degree = self._degree
+        knot_vector = self._knot_vector
+        du = min(degree, order)
+        span = bisect.bisect_right(knot_vector, u, degree + 1, self._num_ctrlpts) - 1
+        ders = helpers.basis_function_ders(degree, knot_vector, span, u, du)
+        coords = list(zip(*self._ctrlpts[span - degree:span + 1]))
+        CK = [[sum([b * c for b, c in zip(ders[k], crd)]) for crd in coords] for k in range(du + 1)]
+        CK += [[0.0 for _ in coords] for _ in range(du, order)]
+        if self._rational:
+            return _rational_curve_derivatives(CK, order)
+        return CK
+
+    def _update(self):
+        # Copies the curve data into the local storage
+        obj = self._obj
+        obj._check_variables()
+        self._degree = obj._degree
+        self._knot_vector = list(obj._knot_vector)
+        self._ctrlpts = [list(pt) for pt in obj._control_points]
+        self._num_ctrlpts = len(self._ctrlpts)
+        self._rational = obj._rational
+        self._version = obj._version
+
+
+class PolynomialCurve(PreparedCurve):
+    """ Prepared evaluator of a curve using the polynomial (power basis) representation of the knot spans.
+
+    Each knot span of the curve is a polynomial of the curve degree. On the first query in a knot span, the
+    coefficients of the span polynomial are computed from the curve derivatives at the start of the span,
+
+    .. math::
+
+        C(u) = \\sum_{j=0}^{p} a_j (u - u_i)^j, \\quad a_j = \\frac{C^{(j)}(u_i)}{j!}
+
+    and cached. Then, the points and the derivatives are evaluated using Horner's method after the span lookup, which
+    requires O(p * dimension) multiplications and no divisions. The homogeneous coordinates of the NURBS curves are
+    represented in the same way and divided by the weight after the evaluation.
+
+    This representation is useful for evaluating the same curve at many arbitrary parameters. It is updated
+    automatically on the next query when the curve is modified. Please use the :py:meth:`.BSpline.Curve.prepare`
+    method with ``polynomial=True`` to generate instances of this class.
+
+    :param obj: curve
+    :type obj: BSpline.Curve or NURBS.Curve
+    """
+
+    def __call__(self, u):
+        """ Evaluates the curve at the given parameter.
+
+        :param u: parameter
+        :type u: float
+        :return: evaluated curve point
+        :rtype: list
+        """
+        if self._obj._version != self._version:
+            self._update()
+        span = bisect.bisect_right(self._knot_vector, u, self._degree + 1, self._num_ctrlpts) - 1
+        coeffs = self._coefficients[span]
+        if coeffs is None:
+            coeffs = self._span_coefficients(span)
+        t = u - self._knot_vector[span]
+
+        # Horner's method
+        pt = coeffs[-1]
+        for a in coeffs[-2::-1]:
+            pt = [(c * t) + ca for c, ca in zip(pt, a)]
+        if self._rational:
+            w = pt[-1]
+            return [c / w for c in pt[0:-1]]
+        return list(pt)
+
+    def derivatives(self, u, order=0):
+        """ Evaluates the curve derivatives at the given parameter.
+
+        :param u: parameter
+        :type u: float
+        :param order: derivative order
+        :type order: int
+        :return: a list containing up to {order}-th derivative of the curve
+        :rtype: list
+        """
+        if self._obj._version != self._version:
+            self._update()
+        degree = self._degree
+        span = bisect.bisect_right(self._knot_vector, u, degree + 1, self._num_ctrlpts) - 1
+        coeffs = self._coefficients[span]
+        if coeffs is None:
+            coeffs = self._span_coefficients(span)
+        t = u - self._knot_vector[span]
+
+        CK = []
+        for k in range(min(degree, order) + 1):
+            # The k-th derivative has the coefficients (j + k)! / j! * a_{j+k}
+            factors = self._factors[k]
+            pt = [factors[degree - k] * c for c in coeffs[degree]]
+            for j in range(degree - k - 1, -1, -1):
+                pt = [(c * t) + (factors[j] * ca) for c, ca in zip(pt, coeffs[j + k])]
+            CK.append(pt)
+        CK += [[0.0 for _ in coeffs[0]] for _ in range(degree, order)]
+        if self._rational:
+            return _rational_curve_derivatives(CK, order)
+        return CK
+
+    def _update(self):
+        super(PolynomialCurve, self)._update()
+        degree = self._degree
+        # Coefficients are computed on demand, indexed by the knot span
+        self._coefficients = [None for _ in range(len(self._knot_vector))]
+        # Factors of the derivative coefficients, i.e. (j + k)! / j!
+        self._factors = [[float(utilities.binomial_coefficient(j + k, k)) * _factorial(k) for j in range(degree + 1)]
+                         for k in range(degree + 1)]
+
+    def _span_coefficients(self, span):
+        # Computes the power basis coefficients of the span, i.e. the derivatives at the start of the span divided by
+        # the factorials
+        degree = self._degree
+        knot = self._knot_vector[span]
+        ders = helpers.basis_function_ders(degree, self._knot_vector, span, knot, degree)
+        coords = list(zip(*self._ctrlpts[span - degree:span + 1]))
+        coeffs = [[sum([b * c for b, c in zip(ders[k], crd)]) / _factorial(k) for crd in coords]
+                  for k in range(degree + 1)]
+        self._coefficients[span] = coeffs
+        return coeffs
+
+
+class PreparedSurface(object):
+    """ Prepared evaluator of a surface for the repeated single point queries.
+
+    The surface is validated once and its degrees, knot vectors and control points are copied into the local storage.
+    Therefore, the queries skip the validation steps of :py:meth:`.BSpline.Surface.surfpt`. The prepared evaluator is
+    updated automatically on the next query when the surface is modified.
+
+    The parameters are not checked against the parametric domain for performance reasons. Please use the
+    :py:meth:`.BSpline.Surface.prepare` method to generate instances of this class.
+
+    .. code-block:: python
+
+        evaluator = surf.prepare()
+        pt = evaluator(0.5, 0.25)
+        ders = evaluator.derivatives(0.5, 0.25, order=1)
+
+    :param obj: surface
+    :type obj: BSpline.Surface or NURBS.Surface
+    """
+
+    def __init__(self, obj):
+        self._obj = obj
+        self._version = None
+        self._update()
+
+    @property
+    def surface(self):
+        """ Surface bound to the evaluator.
+
+        :getter: Gets the surface
+        :type: BSpline.Surface or NURBS.Surface
+        """
+        return self._obj
+
+    def __call__(self, u, v):
+        """ Evaluates the surface at the given (u, v) parameter pair.
+
+        :param u: parameter in the U direction
+        :type u: float
+        :param v: parameter in the V direction
+        :type v: float
+        :return: evaluated surface point
+        :rtype: list
+        """
+        if self._obj._version != self._version:
+            self._update()
+        degree_u = self._degree_u
+        degree_v = self._degree_v
+        span_u = bisect.bisect_right(self._knot_vector_u, u, degree_u + 1, self._size_u) - 1
+        span_v = bisect.bisect_right(self._knot_vector_v, v, degree_v + 1, self._size_v) - 1
+        basis_u = helpers.basis_function(degree_u, self._knot_vector_u, span_u, u)
+        basis_v = helpers.basis_function(degree_v, self._knot_vector_v, span_v, v)
+        temp = [[sum([b * c for b, c in zip(basis_v, coords)]) for coords in zip(*row[span_v - degree_v:span_v + 1])]
+                for row in self._ctrlpts[span_u - degree_u:span_u + 1]]
+        pt = [sum([b * c for b, c in zip(basis_u, coords)]) for coords in zip(*temp)]
+        if self._rational:
+            return [c / pt[-1] for c in pt[0:-1]]
+        return pt
+
+    def derivatives(self, u, v, order=0):
+        """ Evaluates the surface derivatives at the given (u, v) parameter pair.
+
+        Implements Algorithm A3.6 of *The NURBS Book* and Algorithm A4.4 for the rational surfaces.
+
+        :param u: parameter in the U direction
+        :type u: float
+        :param v: parameter in the V direction
+        :type v: float
+        :param order: derivative order
+        :type order: int
+        :return: A list SKL, where SKL[k][l] is the derivative of the surface w.r.t. u k times and v l times
+        :rtype: list
+        """
+        if self._obj._version != self._version:
+            self._update()
+        degree_u = self._degree_u
+        degree_v = self._degree_v
+        du = min(degree_u, order)
+        dv = min(degree_v, order)
+        span_u = bisect.bisect_right(self._knot_vector_u, u, degree_u + 1, self._size_u) - 1
+        span_v = bisect.bisect_right(self._knot_vector_v, v, degree_v + 1, self._size_v) - 1
+        ders_u = helpers.basis_function_ders(degree_u, self._knot_vector_u, span_u, u, du)
+        ders_v = helpers.basis_function_ders(degree_v, self._knot_vector_v, span_v, v, dv)
+        rows = [list(zip(*row[span_v - degree_v:span_v + 1]))
+                for row in self._ctrlpts[span_u - degree_u:span_u + 1]]
+        dimension = len(rows[0])
+
+        SKL = [[[0.0 for _ in range(dimension)] for _ in range(order + 1)] for _ in range(order + 1)]
+        for l in range(dv + 1):
+            # Derivatives w.r.t. v on each row of the control points
+            temp = list(zip(*[[sum([b * c for b, c in zip(ders_v[l], coords)]) for coords in row] for row in rows]))
+            for k in range(min(du, order - l) + 1):
+                SKL[k][l] = [sum([b * c for b, c in zip(ders_u[k], coords)]) for coords in temp]
+        if self._rational:
+            return _rational_surface_derivatives(SKL, order)
+        return SKL
+
+    def _update(self):
+        # Copies the surface data into the local storage
+        obj = self._obj
+        obj._check_variables()
+        self._degree_u = obj._degree_u
+        self._degree_v = obj._degree_v
+        self._knot_vector_u = list(obj._knot_vector_u)
+        self._knot_vector_v = list(obj._knot_vector_v)
+        self._size_u = obj._control_points_size_u
+        self._size_v = obj._control_points_size_v
+        self._ctrlpts = [[list(pt) for pt in row] for row in obj._control_points2D]
+        self._rational = obj._rational
+        self._version = obj._version
+
+
+class PolynomialSurface(PreparedSurface):
+    """ Prepared evaluator of a surface using the polynomial (power basis) representation of the knot span patches.
+
+    Each patch between the knot spans of the surface is a tensor product polynomial of the surface degrees. On the
+    first query in a patch, the coefficients of the patch polynomial are computed from the basis function derivatives
+    at the corner of the patch,
+
+    .. math::
+
+        S(u, v) = \\sum_{k=0}^{p} \\sum_{l=0}^{q} a_{k,l} (u - u_i)^k (v - v_j)^l
+
+    and cached. Then, the points and the derivatives are evaluated as the sums of the coefficients multiplied by the
+    powers of the local parameters, which skips the basis function computations. The homogeneous coordinates of the
+    NURBS surfaces are represented in the same way.
+
+    This representation is useful for evaluating the same surface at many arbitrary parameters, e.g. in the closest
+    point projection. It is updated automatically on the next query when the surface is modified. Please use the
+    :py:meth:`.BSpline.Surface.prepare` method with ``polynomial=True`` to generate instances of this class.
+
+    :param obj: surface
+    :type obj: BSpline.Surface or NURBS.Surface
+    """
+
+    def __call__(self, u, v):
+        """ Evaluates the surface at the given (u, v) parameter pair.
+
+        :param u: parameter in the U direction
+        :type u: float
+        :param v: parameter in the V direction
+        :type v: float
+        :return: evaluated surface point
+        :rtype: list
+        """
+        return self.derivatives(u, v, 0)[0][0]
+
+    def derivatives(self, u, v, order=0):
+        """ Evaluates the surface derivatives at the given (u, v) parameter pair.
+
+        :param u: parameter in the U direction
+        :type u: float
+        :param v: parameter in the V direction
+        :type v: float
+        :param order: derivative order
+        :type order: int
+        :return: A list SKL, where SKL[k][l] is the derivative of the surface w.r.t. u k times and v l times
+        :rtype: list
+        """
+        if self._obj._version != self._version:
+            self._update()
+        degree_u = self._degree_u
+        degree_v = self._degree_v
+        span_u = bisect.bisect_right(self._knot_vector_u, u, degree_u + 1, self._size_u) - 1
+        span_v = bisect.bisect_right(self._knot_vector_v, v, degree_v + 1, self._size_v) - 1
+        coeffs = self._coefficients.get((span_u, span_v))
+        if coeffs is None:
+            coeffs = self._patch_coefficients(span_u, span_v)
+        powers_u = self._powers(u - self._knot_vector_u[span_u], degree_u, order)
+        powers_v = self._powers(v - self._knot_vector_v[span_v], degree_v, order)
+
+        SKL = [[[0.0 for _ in range(len(coeffs))] for _ in range(order + 1)] for _ in range(order + 1)]
+        for l in range(len(powers_v)):
+            pv = powers_v[l]
+            for k in range(min(len(powers_u) - 1, order - l) + 1):
+                # Weights of the coefficients, ordered in the same way as the coefficients
+                weights = [a * b for a in powers_u[k] for b in pv]
+                SKL[k][l] = [sum(map(operator.mul, weights, coords)) for coords in coeffs]
+        if self._rational:
+            return _rational_surface_derivatives(SKL, order)
+        return SKL
+
+    def _update(self):
+        super(PolynomialSurface, self)._update()
+        # Coefficients are computed on demand, indexed by the knot spans
+        self._coefficients = {}
+        # Factors of the monomial derivatives, i.e. j! / (j - k)!
+        degree = max(self._degree_u, self._degree_v)
+        self._factors = [[float(_factorial(j)) / _factorial(j - k) if j >= k else 0.0 for j in range(degree + 1)]
+                         for k in range(degree + 1)]
+
+    def _powers(self, t, degree, order):
+        # Returns the k-th derivatives of the monomials for k = 0, ..., order
+        monomials = [1.0]
+        for _ in range(degree):
+            monomials.append(monomials[-1] * t)
+        powers = [monomials]
+        for k in range(1, min(degree, order) + 1):
+            factors = self._factors[k]
+            powers.append([0.0 for _ in range(k)] + [factors[j] * monomials[j - k] for j in range(k, degree + 1)])
+        return powers
+
+    def _patch_coefficients(self, span_u, span_v):
+        # Computes the power basis coefficients of the patch, i.e. the derivatives at the corner of the patch divided
+        # by the factorials
+        degree_u = self._degree_u
+        degree_v = self._degree_v
+        ders_u = helpers.basis_function_ders(degree_u, self._knot_vector_u, span_u, self._knot_vector_u[span_u],
+                                             degree_u)
+        ders_v = helpers.basis_function_ders(degree_v, self._knot_vector_v, span_v, self._knot_vector_v[span_v],
+                                             degree_v)
+        rows = [list(zip(*row[span_v - degree_v:span_v + 1]))
+                for row in self._ctrlpts[span_u - degree_u:span_u + 1]]
+
+        # Coefficients in v-direction for each row of the control points, then in u-direction. The coefficients are
+        # stored per coordinate in [k][l] order, i.e. the index of the coefficient a_{k,l} is k * (q + 1) + l
+        temp = [[[sum([b * c for b, c in zip(ders_v[l], coords)]) / _factorial(l) for coords in row]
+                 for l in range(degree_v + 1)] for row in rows]
+        coeffs = [[sum([ders_u[k][i] * temp[i][l][d] for i in range(degree_u + 1)]) / _factorial(k)
+                   for k in range(degree_u + 1) for l in range(degree_v + 1)] for d in range(len(rows[0]))]
+        self._coefficients[(span_u, span_v)] = coeffs
+        return coeffs
+
+
+def _rational_curve_derivatives(CKw, order):
+    # Algorithm A4.2
+    CK = []
+    for k in range(order + 1):
+        v = CKw[k][0:-1]
+        for i in range(1, k + 1):
+            factor = utilities.binomial_coefficient(k, i) * CKw[i][-1]
+            v = [tmp - (factor * drv) for tmp, drv in zip(v, CK[k - i])]
+        CK.append([tmp / CKw[0][-1] for tmp in v])
+    return CK
+
+
+def _rational_surface_derivatives(SKLw, order):
+    # Algorithm A4.4
+    dimension = len(SKLw[0][0]) - 1
+    SKL = [[[0.0 for _ in range(dimension)] for _ in range(order + 1)] for _ in range(order + 1)]
+    for k in range(order + 1):
+        for l in range(order - k + 1):
+            v = SKLw[k][l][0:-1]
+            for j in range(1, l + 1):
+                factor = utilities.binomial_coefficient(l, j) * SKLw[0][j][-1]
+                v = [tmp - (factor * drv) for tmp, drv in zip(v, SKL[k][l - j])]
+            for i in range(1, k + 1):
+                factor = utilities.binomial_coefficient(k, i) * SKLw[i][0][-1]
+                v = [tmp - (factor * drv) for tmp, drv in zip(v, SKL[k - i][l])]
+                v2 = [0.0 for _ in range(dimension)]
+                for j in range(1, l + 1):
+                    factor2 = utilities.binomial_coefficient(l, j) * SKLw[i][j][-1]
+                    v2 = [tmp + (factor2 * drv) for tmp, drv in zip(v2, SKL[k - i][l - j])]
+                v = [tmp - (utilities.binomial_coefficient(k, i) * tmp2) for tmp, tmp2 in zip(v, v2)]
+            SKL[k][l] = [tmp / SKLw[0][0][-1] for tmp in v]
+    return SKL
+
+
+def _factorial(num):
+    # Computes the factorial of the input number as a float
+    result = 1.0
+    for i in range(2, num + 1):
+        result *= i
+    return result
@@ -0,0 +1,299 @@
+"""
+.. module:: profiling
+    :platform: Unix, Windows
+    :synopsis: Opt-in instrumentation of the evaluation, knot manipulation and file export routines
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import timeit
+
+# Instrumented functions in (module name, class name, function name, phase, points) format. Class name is None for
+# the module-level functions. The points column defines how the number of processed points is counted: None for not
+# counting, an integer for a fixed number per call and "result" for the length of the returned list.
+TARGETS = (
+    ('helpers', None, 'find_span', 'span', 1),
+    ('helpers', None, 'find_span_binsearch', 'span', 1),
+    ('helpers', None, 'find_spans', 'span', 'result'),
+    ('helpers', None, 'basis_function', 'basis', 1),
+    ('helpers', None, 'basis_functions', 'basis', 'result'),
+    ('helpers', None, 'basis_function_all', 'basis', 1),
+    ('helpers', None, 'basis_function_ders', 'basis', 1),
+    ('helpers', None, 'knot_refinement', 'knot', None),
+    ('helpers', None, 'decompose_curve', 'knot', None),
+    ('helpers', None, 'knot_removal', 'knot', None),
+    ('helpers', None, 'knot_removal_error', 'knot', None),
+    ('evaluators', 'CurveEvaluator', 'evaluate_single', 'evaluate', 1),
+    ('evaluators', 'CurveEvaluator', 'evaluate', 'evaluate', 'result'),
+    ('evaluators', 'SurfaceEvaluator', 'evaluate_single', 'evaluate', 1),
+    ('evaluators', 'SurfaceEvaluator', 'evaluate', 'evaluate', 'result'),
+    ('evaluators', 'NURBSCurveEvaluator', 'evaluate_single', 'rational', 1),
+    ('evaluators', 'NURBSCurveEvaluator', 'evaluate', 'rational', 'result'),
+    ('evaluators', 'NURBSSurfaceEvaluator', 'evaluate_single', 'rational', 1),
+    ('evaluators', 'NURBSSurfaceEvaluator', 'evaluate', 'rational', 'result'),
+    ('evaluators', 'CurveEvaluatorParallel', 'evaluate', 'parallel', 'result'),
+    ('evaluators', 'SurfaceEvaluatorParallel', 'evaluate', 'parallel', 'result'),
+    ('evaluators', 'NURBSCurveEvaluatorParallel', 'evaluate', 'parallel', 'result'),
+    ('evaluators', 'NURBSSurfaceEvaluatorParallel', 'evaluate', 'parallel', 'result'),
+    ('BSpline', 'Curve', 'derivatives', 'derivatives', 1),
+    ('BSpline', 'Curve', 'derivatives2', 'derivatives', 1),
+    ('BSpline', 'Curve', 'derivatives_ctrlpts', 'derivatives', None),
+    ('BSpline', 'Curve', 'insert_knot', 'knot', None),
+    ('BSpline', 'Curve', 'remove_knot', 'knot', None),
+    ('BSpline', 'Curve', 'refine_knotvector', 'knot', None),
+    ('BSpline', 'Curve', 'split', 'knot', None),
+    ('BSpline', 'Curve', 'decompose', 'knot', None),
+    ('BSpline', 'Surface', 'derivatives', 'derivatives', 1),
+    ('BSpline', 'Surface', 'insert_knot', 'knot', None),
+    ('BSpline', 'Surface', 'remove_knot', 'knot', None),
+    ('BSpline', 'Surface', 'refine_knotvector', 'knot', None),
+    ('BSpline', 'Surface', 'split_u', 'knot', None),
+    ('BSpline', 'Surface', 'split_v', 'knot', None),
+    ('BSpline', 'Surface', 'decompose', 'knot', None),
+    ('NURBS', 'Curve', 'derivatives', 'derivatives', 1),
+    ('NURBS', 'Curve', 'derivatives2', 'derivatives', 1),
+    ('NURBS', 'Surface', 'derivatives', 'derivatives', 1),
+    ('exchange', None, '_gen_triangles_vertices', 'tessellate', None),
+    ('exchange', None, '_prepare_vtk_data', 'tessellate', None),
+    ('exchange', None, 'export_csv', 'write', None),
+    ('exchange', None, 'export_vtk', 'write', None),
+    ('exchange', None, 'export_vtk_xml', 'write', None),
+    ('exchange', None, 'save_obj_single', 'write', None),
+    ('exchange', None, 'save_obj_multi', 'write', None),
+    ('exchange', None, 'save_stl_ascii_single', 'write', None),
+    ('exchange', None, 'save_stl_ascii_multi', 'write', None),
+    ('exchange', None, 'save_stl_binary_single', 'write', None),
+    ('exchange', None, 'save_stl_binary_multi', 'write', None),
+    ('exchange', None, 'save_stl_binary_mapped', 'write', None),
+    ('exchange', None, 'save_off_single', 'write', None),
+    ('exchange', None, 'save_off_multi', 'write', None),
+)
+
+# Active profilers
+_profilers = []
+
+# Replaced functions in (owner, attribute name, original function) format
+_originals = []
+
+# Accumulated time of the callees of the instrumented functions which are being executed
+_stack = []
+
+
+class Stat(object):
+    """ Timing statistics of an instrumented function.
+
+    :param name: name of the function
+    :type name: str
+    :param phase: name of the phase of the function
+    :type phase: str
+    """
+
+    def __init__(self, name, phase):
+        self.name = name
+        self.phase = phase
+        self.calls = 0
+        self.points = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+
+    def __repr__(self):
+        return "Stat(" + self.name + ", calls=" + str(self.calls) + ", total_time=" + str(self.total_time) + ")"
+
+
+class Profiler(object):
+    """ Collects the timing statistics and the counters while it is active.
+
+    The instrumentation is installed when the first profiler is started and it is removed when the last profiler is
+    stopped. Therefore, the instrumented functions run without any overhead while profiling is disabled.
+
+    The statistics are collected per function. The total time of a function includes the time spent in the instrumented
+    functions it calls, whereas its self time excludes them. The phases are computed by adding up the self times of
+    the functions, e.g. ``span`` (span finding), ``basis`` (basis function evaluation), ``evaluate`` (control point
+    combination), ``rational`` (rational division), ``parallel`` (process pool evaluation), ``derivatives``, ``knot``
+    (knot operations), ``tessellate`` and ``write``.
+
+    This class can be used as a context manager:
+
+    .. code-block:: python
+
+        with profiling.Profiler() as prof:
+            surf.evaluate()
+        print(prof.report())
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._counters = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def active(self):
+        """ Checks if the profiler is active.
+
+        :getter: Returns True if the profiler is collecting statistics
+        :type: bool
+        """
+        return self in _profilers
+
+    @property
+    def stats(self):
+        """ Timing statistics of the instrumented functions.
+
+        :getter: Gets the statistics in *{function name: Stat}* format
+        :type: dict
+        """
+        return self._stats
+
+    @property
+    def counters(self):
+        """ Event counters, e.g. cache hits and misses.
+
+        :getter: Gets the counters in *{counter name: value}* format
+        :type: dict
+        """
+        return self._counters
+
+    def start(self):
+        """ Starts collecting the statistics. """
+        if self in _profilers:
+            return
+        if not _profilers:
+            _install()
+        _profilers.append(self)
+
+    def stop(self):
+        """ Stops collecting the statistics. """
+        if self not in _profilers:
+            return
+        _profilers.remove(self)
+        if not _profilers:
+            _uninstall()
+
+    def clear(self):
+        """ Clears the collected statistics and counters. """
+        self._stats.clear()
+        self._counters.clear()
+
+    def phases(self):
+        """ Computes the time spent in each phase.
+
+        :return: time spent in each phase in *{phase name: time}* format
+        :rtype: dict
+        """
+        phases = {}
+        for stat in self._stats.values():
+            phases[stat.phase] = phases.get(stat.phase, 0.0) + stat.self_time
+        return phases
+
+    def report(self):
+        """ Generates a plain text report of the collected statistics.
+
+        :return: report
+        :rtype: str
+        """
+        phases = self.phases()
+        total = sum(phases.values())
+        lines = ["%-16s %12s %8s" % ("Phase", "Time (s)", "%")]
+        for phase in sorted(phases, key=lambda p: -phases[p]):
+            lines.append("%-16s %12.6f %8.2f" % (phase, phases[phase], 100.0 * phases[phase] / total if total else 0.0))
+        lines.append("")
+        lines.append("%-52s %10s %10s %12s %12s" % ("Function", "Calls", "Points", "Total (s)", "Self (s)"))
+        for stat in sorted(self._stats.values(), key=lambda s: -s.self_time):
+            lines.append("%-52s %10d %10d %12.6f %12.6f" % (stat.name, stat.calls, stat.points, stat.total_time,
+                                                            stat.self_time))
+        if self._counters:
+            lines.append("")
+            lines.append("%-52s %10s" % ("Counter", "Value"))
+            for name in sorted(self._counters):
+                lines.append("%-52s %10d" % (name, self._counters[name]))
+        return "\n".join(lines)
+
+    def _record(self, name, phase, elapsed, child, points):
+        stat = self._stats.get(name)
+        if stat is None:
+            stat = Stat(name, phase)
+            self._stats[name] = stat
+        stat.calls += 1
+        stat.points += points
+        stat.total_time += elapsed
+        stat.self_time += elapsed - child
+
+
+def profile():
+    """ Generates a profiler to be used as a context manager.
+
+    :return: profiler
+    :rtype: Profiler
+    """
+    return Profiler()
+
+
+def count(name, value=1):
+    """ Increments the counter on the active profilers.
+
+    This function returns immediately if profiling is disabled.
+
+    :param name: name of the counter
+    :type name: str
+    :param value: increment
+    :type value: int
+    """
+    for prof in _profilers:
+        prof._counters[name] = prof._counters.get(name, 0) + value
+
+
+def _install():
+    # Replaces the target functions with the instrumented ones
+    from . import helpers, evaluators, BSpline, NURBS, exchange
+    modules = dict(helpers=helpers, evaluators=evaluators, BSpline=BSpline, NURBS=NURBS, exchange=exchange)
+    for module_name, class_name, func_name, phase, points in TARGETS:
+        owner = modules[module_name] if class_name is None else getattr(modules[module_name], class_name)
+        # Skip the inherited methods, they are instrumented on the parent class
+        if class_name is not None and func_name not in owner.__dict__:
+            continue
+        original = getattr(owner, func_name) if class_name is None else owner.__dict__[func_name]
+        name = module_name + "." + (class_name + "." if class_name else "") + func_name
+        _originals.append((owner, func_name, original))
+        setattr(owner, func_name, _instrument(original, name, phase, points))
+
+
+def _uninstall():
+    # Restores the original functions
+    while _originals:
+        owner, func_name, original = _originals.pop()
+        setattr(owner, func_name, original)
+    del _stack[:]
+
+
+def _instrument(func, name, phase, points):
+    timer = timeit.default_timer
+
+    def wrapper(*args, **kwargs):
+        _stack.append(0.0)
+        start = timer()
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            elapsed = timer() - start
+            child = _stack.pop() if _stack else 0.0
+            if _stack:
+                _stack[-1] += elapsed
+            if points == 'result':
+                num = len(result) if isinstance(result, (list, tuple)) else 0
+            else:
+                num = points or 0
+            for prof in _profilers:
+                prof._record(name, phase, elapsed, child, num)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
@@ -0,0 +1,496 @@
+"""
+.. module:: quadrature
+    :platform: Unix, Windows
+    :synopsis: Numerical integration routines for curves and surfaces
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import math
+from . import array
+from . import Abstract
+from . import utilities
+from . import helpers
+
+# Computed Gauss-Legendre rules, indexed by the number of points
+_GAUSS_LEGENDRE = {}
+
+
+def gauss_legendre(num):
+    """ Computes the points and the weights of the Gauss-Legendre quadrature rule on the interval [-1, 1].
+
+    The points are the roots of the Legendre polynomial of degree ``num``, which are found using Newton iteration. The
+    rules are computed once and cached, i.e. the consecutive calls with the same input are cheap.
+
+    :param num: number of quadrature points
+    :type num: int
+    :return: tuple of the quadrature points and the weights
+    :rtype: tuple
+    """
+    if num < 1:
+        raise ValueError("Number of quadrature points must be a positive integer")
+    try:
+        return _GAUSS_LEGENDRE[num]
+    except KeyError:
+        pass
+
+    points = [0.0 for _ in range(num)]
+    weights = [0.0 for _ in range(num)]
+    for i in range((num + 1) // 2):
+        # Initial guess of the i-th root
+        x = math.cos(math.pi * (i + 0.75) / (num + 0.5))
+        dp = 1.0
+        for _ in range(100):
+            # Evaluate the Legendre polynomial and its derivative using the recurrence relation
+            p0 = 1.0
+            p1 = x
+            for k in range(2, num + 1):
+                p0, p1 = p1, ((2 * k - 1) * x * p1 - (k - 1) * p0) / k
+            dp = num * (x * p1 - p0) / (x * x - 1.0) if num > 1 else 1.0
+            dx = p1 / dp
+            x -= dx
+            if abs(dx) < 1e-15:
+                break
+        weight = 2.0 / ((1.0 - x * x) * dp * dp)
+        points[i] = -x
+        points[num - 1 - i] = x
+        weights[i] = weight
+        weights[num - 1 - i] = weight
+
+    _GAUSS_LEGENDRE[num] = (tuple(points), tuple(weights))
+    return _GAUSS_LEGENDRE[num]
+
+
+def gauss_legendre_interval(start, stop, num):
+    """ Computes the points and the weights of the Gauss-Legendre quadrature rule on the interval [start, stop].
+
+    :param start: start of the interval
+    :type start: float
+    :param stop: end of the interval
+    :type stop: float
+    :param num: number of quadrature points
+    :type num: int
+    :return: tuple of the quadrature points and the weights
+    :rtype: tuple
+    """
+    points, weights = gauss_legendre(num)
+    half = (stop - start) / 2.0
+    mid = (stop + start) / 2.0
+    return [mid + (half * x) for x in points], [half * w for w in weights]
+
+
+def integrate(func, start, stop, num):
+    """ Integrates the function on the interval [start, stop] using the Gauss-Legendre quadrature rule.
+
+    :param func: function of a single variable
+    :type func: callable
+    :param start: start of the interval
+    :type start: float
+    :param stop: end of the interval
+    :type stop: float
+    :param num: number of quadrature points
+    :type num: int
+    :return: integral of the function
+    :rtype: float
+    """
+    points, weights = gauss_legendre_interval(start, stop, num)
+    return sum([w * func(x) for x, w in zip(points, weights)])
+
+
+def basis_tables(degree, knot_vector, num_ctrlpts, num, order=1):
+    """ Computes the quadrature points and the basis function derivatives on each knot span element.
+
+    The knot spans with non-zero length are the elements. For each element, the tuple contains the span index, the
+    quadrature points, the quadrature weights and the basis function derivatives up to the given order at each
+    quadrature point (as returned by :func:`.helpers.basis_function_ders`).
+
+    :param degree: degree
+    :type degree: int
+    :param knot_vector: knot vector
+    :type knot_vector: list, tuple
+    :param num_ctrlpts: number of control points
+    :type num_ctrlpts: int
+    :param num: number of quadrature points on each element
+    :type num: int
+    :param order: derivative order
+    :type order: int
+    :return: list of (span, points, weights, basis function derivatives) tuples
+    :rtype: list
+    """
+    knots = sorted(set(knot_vector[degree:len(knot_vector) - degree]))
+    tables = []
+    for start, stop in zip(knots[0:-1], knots[1:]):
+        span = helpers.find_span(knot_vector, num_ctrlpts, (start + stop) / 2.0)
+        points, weights = gauss_legendre_interval(start, stop, num)
+        ders = [helpers.basis_function_ders(degree, knot_vector, span, pt, order) for pt in points]
+        tables.append((span, points, weights, ders))
+    return tables
+
+
+class SurfaceQuadrature(object):
+    """ Gauss-Legendre quadrature on the knot span elements of a 3D surface.
+
+    The surface points, the first derivatives and the area elements are computed once at the quadrature points of all
+    elements, then the integrals reuse these tables. The basis functions are evaluated once for each parametric
+    direction and combined on the tensor product elements.
+
+    The quadrature does not track the changes on the surface. Please use :py:meth:`.BSpline.Surface.quadrature` to
+    get a cached instance, which is updated with the surface.
+
+    Keyword Arguments:
+        * ``num_u``: number of quadrature points on each element in U-direction. *Default: degree_u + 2*
+        * ``num_v``: number of quadrature points on each element in V-direction. *Default: degree_v + 2*
+
+    :param obj: surface
+    :type obj: Abstract.Surface
+    """
+
+    def __init__(self, obj, **kwargs):
+        if not isinstance(obj, Abstract.Surface):
+            raise TypeError("The input must be an instance of a Surface")
+        if obj.dimension != 3:
+            raise ValueError("Surface quadrature requires a 3D surface")
+        self._obj = obj
+        self._num_u = kwargs.get('num_u', obj.degree_u + 2)
+        self._num_v = kwargs.get('num_v', obj.degree_v + 2)
+        self._params = []
+        self._points = []
+        self._normals = []
+        self._weights = []
+        self._compute()
+
+    @property
+    def surface(self):
+        """ Surface object.
+
+        :getter: Gets the surface object
+        :type: Abstract.Surface
+        """
+        return self._obj
+
+    @property
+    def params(self):
+        """ Parameters of the quadrature points.
+
+        :getter: Gets the (u, v) parameters of the quadrature points
+        :type: list
+        """
+        return self._params
+
+    @property
+    def points(self):
+        """ Surface points at the quadrature points.
+
+        :getter: Gets the surface points
+        :type: list
+        """
+        return self._points
+
+    @property
+    def normals(self):
+        """ Unit surface normals at the quadrature points.
+
+        :getter: Gets the unit surface normals
+        :type: list
+        """
+        return self._normals
+
+    @property
+    def weights(self):
+        """ Quadrature weights multiplied by the area elements, i.e. the surface area represented by the points.
+
+        :getter: Gets the weights
+        :type: list
+        """
+        return self._weights
+
+    def integrate(self, func):
+        """ Integrates the function over the surface.
+
+        The function is called with the surface point, the (u, v) parameters and the unit surface normal at each
+        quadrature point. It can return a number or a list of numbers.
+
+        :param func: integrand
+        :type func: callable
+        :return: integral of the function
+        :rtype: float or list
+        """
+        result = None
+        for pt, uv, normal, weight in zip(self._points, self._params, self._normals, self._weights):
+            value = func(pt, uv, normal)
+            if isinstance(value, (list, tuple)):
+                if result is None:
+                    result = [0.0 for _ in value]
+                result = [r + (weight * val) for r, val in zip(result, value)]
+            else:
+                result = (0.0 if result is None else result) + (weight * value)
+        return result
+
+    def area(self):
+        """ Computes the surface area.
+
+        :return: area
+        :rtype: float
+        """
+        return sum(self._weights)
+
+    def first_moments(self):
+        """ Computes the first moments of area, i.e. the integrals of x, y and z over the surface.
+
+        :return: first moments
+        :rtype: list
+        """
+        return [sum([w * pt[i] for pt, w in zip(self._points, self._weights)]) for i in range(3)]
+
+    def centroid(self):
+        """ Computes the centroid of the surface.
+
+        :return: centroid
+        :rtype: list
+        """
+        area = self.area()
+        return [m / area for m in self.first_moments()]
+
+    def second_moments(self, origin=(0.0, 0.0, 0.0)):
+        """ Computes the second moments of area with respect to the input point.
+
+        The second moments are the integrals of the products of the coordinates, i.e. the element ``[i][j]`` of the
+        returned matrix is the integral of ``(x_i - origin_i) * (x_j - origin_j)`` over the surface.
+
+        :param origin: reference point
+        :type origin: list, tuple
+        :return: 3x3 matrix of the second moments
+        :rtype: list
+        """
+        moments = [[0.0 for _ in range(3)] for _ in range(3)]
+        for pt, w in zip(self._points, self._weights):
+            diff = [c - o for c, o in zip(pt, origin)]
+            for i in range(3):
+                for j in range(i, 3):
+                    moments[i][j] += w * diff[i] * diff[j]
+        for i in range(3):
+            for j in range(i):
+                moments[i][j] = moments[j][i]
+        return moments
+
+    def _compute(self):
+        obj = self._obj
+        degree_u = obj.degree_u
+        degree_v = obj.degree_v
+        size_v = obj.ctrlpts_size_v
+        ctrlpts = obj.ctrlptsw if obj.rational else obj.ctrlpts
+        dim = len(ctrlpts[0])
+        tables_u = basis_tables(degree_u, obj.knotvector_u, obj.ctrlpts_size_u, self._num_u)
+        tables_v = basis_tables(degree_v, obj.knotvector_v, size_v, self._num_v)
+
+        for span_u, points_u, weights_u, ders_u in tables_u:
+            for span_v, points_v, weights_v, ders_v in tables_v:
+                # Control points of the element
+                cpts = [[ctrlpts[(span_u - degree_u + k) * size_v + span_v - degree_v + l] for l in range(degree_v + 1)]
+                        for k in range(degree_u + 1)]
+                for u, wu, bu in zip(points_u, weights_u, ders_u):
+                    # Contract the U-direction first, the results are reused for all V-direction points
+                    rows = [[[sum([bu[d][k] * cpts[k][l][c] for k in range(degree_u + 1)]) for c in range(dim)]
+                             for l in range(degree_v + 1)] for d in range(2)]
+                    for v, wv, bv in zip(points_v, weights_v, ders_v):
+                        pt = [sum([bv[0][l] * rows[0][l][c] for l in range(degree_v + 1)]) for c in range(dim)]
+                        der_u = [sum([bv[0][l] * rows[1][l][c] for l in range(degree_v + 1)]) for c in range(dim)]
+                        der_v = [sum([bv[1][l] * rows[0][l][c] for l in range(degree_v + 1)]) for c in range(dim)]
+                        if obj.rational:
+                            # Derivatives of the rational surface (Eq. 4.20 of The NURBS Book)
+                            weight = pt[-1]
+                            pt = [c / weight for c in pt[0:-1]]
+                            der_u = [(cu - (der_u[-1] * c)) / weight for cu, c in zip(der_u[0:-1], pt)]
+                            der_v = [(cv - (der_v[-1] * c)) / weight for cv, c in zip(der_v[0:-1], pt)]
+                        normal = utilities.vector_cross(der_u, der_v)
+                        jacobian = utilities.vector_magnitude(normal)
+                        self._params.append((u, v))
+                        self._points.append(pt)
+                        self._normals.append([n / jacobian for n in normal] if jacobian > 0.0 else normal)
+                        self._weights.append(wu * wv * jacobian)
+
+
+class SpanElement(object):
+    """ Precomputed data of a knot span element for isogeometric analysis.
+
+    The element stores the following tables at its quadrature points. The tables are contiguous ``array('d')``
+    instances arranged in quadrature point-major order, e.g. the value of the a-th non-zero basis function at the k-th
+    quadrature point is ``basis[k * num_basis + a]``.
+
+    * ``params``: parameters of the quadrature points, ``num_points x parametric dimension``
+    * ``weights``: quadrature weights in the parametric space, ``num_points``
+    * ``basis``: non-zero (rational) basis functions, ``num_points x num_basis``
+    * ``basis_ders``: first derivatives of the non-zero basis functions for each parametric direction,
+      ``parametric dimension x num_points x num_basis``
+    * ``points``: geometry points, ``num_points x dimension``
+    * ``jacobians``: derivatives of the geometry for each parametric direction, i.e. the columns of the Jacobian
+      matrix, ``num_points x parametric dimension x dimension``
+    * ``det_jacobians``: determinant of the Jacobian matrix for the planar surfaces, the area element for the 3D
+      surfaces and the length element for the curves, ``num_points``
+
+    The ``connectivity`` array contains the indices of the control points corresponding to the non-zero basis
+    functions, i.e. the a-th basis function belongs to the control point ``ctrlpts[connectivity[a]]``.
+    """
+
+    def __init__(self, index, domain, connectivity, num_points):
+        self._index = index
+        self._domain = domain
+        self._connectivity = array('i', connectivity)
+        self._num_points = num_points
+        self.params = array('d')
+        self.weights = array('d')
+        self.basis = array('d')
+        self.basis_ders = tuple([array('d') for _ in domain])
+        self.points = array('d')
+        self.jacobians = array('d')
+        self.det_jacobians = array('d')
+
+    def __str__(self):
+        return "Span Element " + str(self._index)
+
+    __repr__ = __str__
+
+    @property
+    def index(self):
+        """ Element index, i.e. the index of the knot span in each parametric direction.
+
+        :getter: Gets the element index
+        :type: tuple
+        """
+        return self._index
+
+    @property
+    def domain(self):
+        """ Parametric domain of the element.
+
+        :getter: Gets the (start, stop) parameters in each parametric direction
+        :type: tuple
+        """
+        return self._domain
+
+    @property
+    def connectivity(self):
+        """ Indices of the control points corresponding to the non-zero basis functions.
+
+        :getter: Gets the control point indices
+        :type: array
+        """
+        return self._connectivity
+
+    @property
+    def num_points(self):
+        """ Number of quadrature points.
+
+        :getter: Gets the number of quadrature points
+        :type: int
+        """
+        return self._num_points
+
+    @property
+    def num_basis(self):
+        """ Number of non-zero basis functions.
+
+        :getter: Gets the number of non-zero basis functions
+        :type: int
+        """
+        return len(self._connectivity)
+
+    def _add_point(self, params, weight, basis, basis_ders, ctrlpts, rational):
+        # Computes and stores the data at a quadrature point from the non-rational basis functions
+        self.params.extend(params)
+        self.weights.append(weight)
+        if rational:
+            # Rational basis functions and their derivatives (Eq. 4.2 of The NURBS Book)
+            weights = [ctrlpts[idx][-1] for idx in self._connectivity]
+            nw = [b * w for b, w in zip(basis, weights)]
+            wsum = sum(nw)
+            basis = [b / wsum for b in nw]
+            wders = [sum([d * w for d, w in zip(ders, weights)]) for ders in basis_ders]
+            basis_ders = [[((d * w) - (r * wder)) / wsum for d, w, r in zip(ders, weights, basis)]
+                          for ders, wder in zip(basis_ders, wders)]
+            pts = [[c / pt[-1] for c in pt[0:-1]] for pt in [ctrlpts[idx] for idx in self._connectivity]]
+        else:
+            pts = [ctrlpts[idx] for idx in self._connectivity]
+        dim = len(pts[0])
+        self.basis.extend(basis)
+        self.points.extend([sum([b * pt[c] for b, pt in zip(basis, pts)]) for c in range(dim)])
+        cols = []
+        for ders, arr in zip(basis_ders, self.basis_ders):
+            arr.extend(ders)
+            cols.append([sum([d * pt[c] for d, pt in zip(ders, pts)]) for c in range(dim)])
+            self.jacobians.extend(cols[-1])
+        if len(cols) == 1:
+            self.det_jacobians.append(utilities.vector_magnitude(cols[0]))
+        elif dim == 2:
+            self.det_jacobians.append((cols[0][0] * cols[1][1]) - (cols[0][1] * cols[1][0]))
+        else:
+            self.det_jacobians.append(utilities.vector_magnitude(utilities.vector_cross(cols[0], cols[1])))
+
+
+def curve_elements(obj, **kwargs):
+    """ Computes the isogeometric analysis data on the knot span elements of the curve.
+
+    Keyword Arguments:
+        * ``num``: number of quadrature points on each element. *Default: degree + 1*
+
+    :param obj: curve
+    :type obj: Abstract.Curve
+    :return: list of elements
+    :rtype: list
+    """
+    if not isinstance(obj, Abstract.Curve):
+        raise TypeError("The input must be an instance of a Curve")
+    degree = obj.degree
+    ctrlpts = obj.ctrlptsw if obj.rational else obj.ctrlpts
+    tables = basis_tables(degree, obj.knotvector, len(ctrlpts), kwargs.get('num', degree + 1))
+
+    elems = []
+    for idx, (span, points, weights, ders) in enumerate(tables):
+        domain = ((obj.knotvector[span], obj.knotvector[span + 1]),)
+        elem = SpanElement((idx,), domain, range(span - degree, span + 1), len(points))
+        for u, w, bfd in zip(points, weights, ders):
+            elem._add_point((u,), w, bfd[0], (bfd[1],), ctrlpts, obj.rational)
+        elems.append(elem)
+    return elems
+
+
+def surface_elements(obj, **kwargs):
+    """ Computes the isogeometric analysis data on the knot span elements of the surface.
+
+    The elements are ordered with the U-direction index changing slowest, like the control points.
+
+    Keyword Arguments:
+        * ``num_u``: number of quadrature points on each element in U-direction. *Default: degree_u + 1*
+        * ``num_v``: number of quadrature points on each element in V-direction. *Default: degree_v + 1*
+
+    :param obj: surface
+    :type obj: Abstract.Surface
+    :return: list of elements
+    :rtype: list
+    """
+    if not isinstance(obj, Abstract.Surface):
+        raise TypeError("The input must be an instance of a Surface")
+    degree_u = obj.degree_u
+    degree_v = obj.degree_v
+    size_v = obj.ctrlpts_size_v
+    ctrlpts = obj.ctrlptsw if obj.rational else obj.ctrlpts
+    tables_u = basis_tables(degree_u, obj.knotvector_u, obj.ctrlpts_size_u, kwargs.get('num_u', degree_u + 1))
+    tables_v = basis_tables(degree_v, obj.knotvector_v, size_v, kwargs.get('num_v', degree_v + 1))
+
+    elems = []
+    for idx_u, (span_u, points_u, weights_u, ders_u) in enumerate(tables_u):
+        for idx_v, (span_v, points_v, weights_v, ders_v) in enumerate(tables_v):
+            connectivity = [(span_u - degree_u + k) * size_v + span_v - degree_v + l
+                            for k in range(degree_u + 1) for l in range(degree_v + 1)]
+            domain = ((obj.knotvector_u[span_u], obj.knotvector_u[span_u + 1]),
+                      (obj.knotvector_v[span_v], obj.knotvector_v[span_v + 1]))
+            elem = SpanElement((idx_u, idx_v), domain, connectivity, len(points_u) * len(points_v))
+            for u, wu, bu in zip(points_u, weights_u, ders_u):
+                for v, wv, bv in zip(points_v, weights_v, ders_v):
+                    basis = [nu * nv for nu in bu[0] for nv in bv[0]]
+                    basis_du = [du * nv for du in bu[1] for nv in bv[0]]
+                    basis_dv = [nu * dv for nu in bu[0] for dv in bv[1]]
+                    elem._add_point((u, v), wu * wv, basis, (basis_du, basis_dv), ctrlpts, obj.rational)
+            elems.append(elem)
+    return elems
@@ -0,0 +1,637 @@
+"""
+.. module:: spatial
+    :platform: Unix, Windows
+    :synopsis: Spatial indexing structures for accelerating geometric queries
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import math
+from . import heapq
+
+
+class KDTree(object):
+    """ k-d tree for nearest neighbor queries over a static set of points.
+
+    The tree is built once from the input points by splitting the points at the median of the axis with the largest
+    extent. The leaves store the indices of up to ``leaf_size`` points.
+
+    Keyword Arguments:
+        * ``leaf_size``: maximum number of points stored in a leaf node. *Default: 8*
+
+    :param points: list of points
+    :type points: list, tuple
+    """
+
+    def __init__(self, points, **kwargs):
+        if not points:
+            raise ValueError("Cannot build a k-d tree without points")
+        self._leaf_size = kwargs.get('leaf_size', 8)
+        self._points = [tuple(pt) for pt in points]
+        self._dimension = len(self._points[0])
+        # Each node is a list of [axis, split value, left child, right child] or [-1, point indices]
+        self._nodes = []
+        self._build(list(range(len(self._points))))
+
+    def __len__(self):
+        return len(self._points)
+
+    @property
+    def points(self):
+        """ Points stored in the tree.
+
+        :getter: Gets the points
+        :type: list
+        """
+        return self._points
+
+    def _build(self, indices):
+        node_idx = len(self._nodes)
+        if len(indices) <= self._leaf_size:
+            self._nodes.append([-1, indices])
+            return node_idx
+
+        # Split along the axis with the largest extent
+        axis = 0
+        extent = -1.0
+        for i in range(self._dimension):
+            coords = [self._points[idx][i] for idx in indices]
+            if max(coords) - min(coords) > extent:
+                extent = max(coords) - min(coords)
+                axis = i
+
+        indices.sort(key=lambda idx: self._points[idx][axis])
+        mid = len(indices) // 2
+        node = [axis, self._points[indices[mid]][axis], None, None]
+        self._nodes.append(node)
+        node[2] = self._build(indices[:mid])
+        node[3] = self._build(indices[mid:])
+        return node_idx
+
+    def nearest(self, point):
+        """ Finds the nearest point to the input point.
+
+        :param point: query point
+        :type point: list, tuple
+        :return: index of the nearest point and the distance to it
+        :rtype: tuple
+        """
+        best_idx = -1
+        best_dist2 = float('inf')
+        stack = [(0, 0.0)]
+        while stack:
+            node_idx, bound = stack.pop()
+            if bound >= best_dist2:
+                continue
+            node = self._nodes[node_idx]
+            if node[0] < 0:
+                for idx in node[1]:
+                    dist2 = sum([(c1 - c2) ** 2 for c1, c2 in zip(self._points[idx], point)])
+                    if dist2 < best_dist2:
+                        best_dist2 = dist2
+                        best_idx = idx
+                continue
+
+            # Visit the child containing the point first, the other one only if it can contain a closer point
+            diff = point[node[0]] - node[1]
+            near, far = (node[2], node[3]) if diff < 0 else (node[3], node[2])
+            stack.append((far, diff * diff))
+            stack.append((near, 0.0))
+
+        return best_idx, math.sqrt(best_dist2)
+
+
+class BoundingVolumeHierarchy(object):
+    """ Bounding volume hierarchy over a static set of axis-aligned bounding boxes.
+
+    The hierarchy is built once from the input boxes by splitting the boxes at the median of their centers along the
+    axis with the largest extent. The leaves store the indices of up to ``leaf_size`` boxes.
+
+    Keyword Arguments:
+        * ``leaf_size``: maximum number of boxes stored in a leaf node. *Default: 4*
+
+    :param bboxes: list of bounding boxes, each defined by its minimum and maximum points
+    :type bboxes: list, tuple
+    """
+
+    def __init__(self, bboxes, **kwargs):
+        if not bboxes:
+            raise ValueError("Cannot build a bounding volume hierarchy without bounding boxes")
+        self._leaf_size = kwargs.get('leaf_size', 4)
+        self._bboxes = [(tuple(bbox[0]), tuple(bbox[1])) for bbox in bboxes]
+        self._dimension = len(self._bboxes[0][0])
+        # Each node is a list of [bbox, left child, right child, box indices]
+        self._nodes = []
+        self._build(list(range(len(self._bboxes))))
+
+    def __len__(self):
+        return len(self._bboxes)
+
+    @property
+    def bboxes(self):
+        """ Bounding boxes stored in the hierarchy.
+
+        :getter: Gets the bounding boxes
+        :type: list
+        """
+        return self._bboxes
+
+    def _build(self, indices):
+        node_idx = len(self._nodes)
+        bbmin = tuple([min([self._bboxes[idx][0][i] for idx in indices]) for i in range(self._dimension)])
+        bbmax = tuple([max([self._bboxes[idx][1][i] for idx in indices]) for i in range(self._dimension)])
+        node = [(bbmin, bbmax), None, None, None]
+        self._nodes.append(node)
+        if len(indices) <= self._leaf_size:
+            node[3] = indices
+            return node_idx
+
+        # Split along the axis with the largest extent
+        extents = [bbmax[i] - bbmin[i] for i in range(self._dimension)]
+        axis = extents.index(max(extents))
+        indices.sort(key=lambda idx: self._bboxes[idx][0][axis] + self._bboxes[idx][1][axis])
+        mid = len(indices) // 2
+        node[1] = self._build(indices[:mid])
+        node[2] = self._build(indices[mid:])
+        return node_idx
+
+    def ray_intersect(self, origin, direction, t_max=float('inf')):
+        """ Finds the bounding boxes intersected by the ray.
+
+        This is a generator function yielding the boxes in increasing order of the ray parameter at which the ray
+        enters the box. Therefore, the caller can stop iterating as soon as the entry parameter exceeds the parameter
+        of the closest hit found so far.
+
+        :param origin: origin of the ray
+        :type origin: list, tuple
+        :param direction: direction of the ray
+        :type direction: list, tuple
+        :param t_max: maximum ray parameter
+        :type t_max: float
+        :return: (entry parameter, box index) tuples
+        :rtype: generator
+        """
+        counter = 0
+        heap = []
+        hit = ray_box_intersection(origin, direction, self._nodes[0][0], t_max)
+        if hit is not None:
+            heap.append((hit[0], counter, 0, True))
+        while heap:
+            t_entry, _, idx, is_node = heapq.heappop(heap)
+            if not is_node:
+                yield t_entry, idx
+                continue
+            node = self._nodes[idx]
+            if node[3] is None:
+                children = [(node[1], True), (node[2], True)]
+                boxes = [self._nodes[node[1]][0], self._nodes[node[2]][0]]
+            else:
+                children = [(i, False) for i in node[3]]
+                boxes = [self._bboxes[i] for i in node[3]]
+            for (child, child_is_node), bbox in zip(children, boxes):
+                hit = ray_box_intersection(origin, direction, bbox, t_max)
+                if hit is not None:
+                    counter += 1
+                    heapq.heappush(heap, (hit[0], counter, child, child_is_node))
+
+
+def ray_box_intersection(origin, direction, bbox, t_max=float('inf')):
+    """ Intersects the ray with the axis-aligned bounding box using the slab method.
+
+    :param origin: origin of the ray
+    :type origin: list, tuple
+    :param direction: direction of the ray
+    :type direction: list, tuple
+    :param bbox: bounding box defined by its minimum and maximum points
+    :type bbox: list, tuple
+    :param t_max: maximum ray parameter
+    :type t_max: float
+    :return: ray parameters where the ray enters and exits the box or None, if there is no intersection
+    :rtype: tuple
+    """
+    t_near = 0.0
+    t_far = t_max
+    for o, d, bmin, bmax in zip(origin, direction, bbox[0], bbox[1]):
+        if d == 0.0:
+            if o < bmin or o > bmax:
+                return None
+            continue
+        t1 = (bmin - o) / d
+        t2 = (bmax - o) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_near = max(t_near, t1)
+        t_far = min(t_far, t2)
+        if t_near > t_far:
+            return None
+    return t_near, t_far
+
+
+class BoundingBoxTree(object):
+    """ Dynamic bounding box tree for broad-phase queries over a changing set of bounding boxes.
+
+    Each inserted bounding box is stored in a leaf node and the inner nodes store the union of their children's
+    bounding boxes. A new leaf is placed next to the node causing the minimum increase in the sum of the bounding box
+    extents and the tree is kept balanced using tree rotations, therefore insertions, removals and updates take
+    logarithmic time.
+
+    The items are identified by the integer values returned from :py:meth:`insert`. If a list of bounding boxes is
+    provided on initialization, the tree is built from top to bottom by splitting the bounding boxes at the median of
+    their centers, which is considerably faster than inserting the bounding boxes one by one. In this case, the item
+    identifiers are the indices of the bounding boxes in the list.
+
+    :param bboxes: list of bounding boxes, each defined by its minimum and maximum points
+    :type bboxes: list, tuple
+    """
+
+    def __init__(self, bboxes=()):
+        self._root = -1
+        self._bbox = []
+        self._parent = []
+        self._left = []
+        self._right = []
+        self._height = []
+        self._item = []
+        self._free = []  # indices of the free nodes
+        self._leaves = {}  # item to leaf node mapping
+        self._next_item = 0
+        if bboxes:
+            leaves = []
+            for item, bbox in enumerate(bboxes):
+                leaf = self._allocate((tuple(bbox[0]), tuple(bbox[1])), item)
+                self._leaves[item] = leaf
+                leaves.append(leaf)
+            self._next_item = len(leaves)
+            self._root = self._build(leaves)
+
+    def __len__(self):
+        return len(self._leaves)
+
+    @property
+    def height(self):
+        """ Height of the tree.
+
+        :getter: Gets the height of the tree, zero for an empty tree or a tree with a single item
+        :type: int
+        """
+        return self._height[self._root] if self._root >= 0 else 0
+
+    def _allocate(self, bbox, item):
+        if self._free:
+            node = self._free.pop()
+            self._bbox[node] = bbox
+            self._parent[node] = -1
+            self._left[node] = -1
+            self._right[node] = -1
+            self._height[node] = 0
+            self._item[node] = item
+            return node
+        self._bbox.append(bbox)
+        self._parent.append(-1)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._height.append(0)
+        self._item.append(item)
+        return len(self._bbox) - 1
+
+    def insert(self, bbox, item=None):
+        """ Inserts the bounding box into the tree.
+
+        :param bbox: bounding box defined by its minimum and maximum points
+        :type bbox: list, tuple
+        :param item: item identifier; a new one is generated if it is not provided
+        :type item: int
+        :return: item identifier
+        :rtype: int
+        """
+        if item is None:
+            item = self._next_item
+        if item in self._leaves:
+            raise ValueError("Item " + str(item) + " already exists in the tree")
+        self._next_item = max(self._next_item, item + 1)
+        leaf = self._allocate((tuple(bbox[0]), tuple(bbox[1])), item)
+        self._leaves[item] = leaf
+        self._insert_leaf(leaf)
+        return item
+
+    def remove(self, item):
+        """ Removes the item from the tree.
+
+        :param item: item identifier
+        :type item: int
+        """
+        leaf = self._leaves.pop(item)
+        self._remove_leaf(leaf)
+        self._free.append(leaf)
+
+    def update(self, item, bbox):
+        """ Updates the bounding box of the item.
+
+        :param item: item identifier
+        :type item: int
+        :param bbox: new bounding box defined by its minimum and maximum points
+        :type bbox: list, tuple
+        """
+        leaf = self._leaves[item]
+        self._remove_leaf(leaf)
+        self._bbox[leaf] = (tuple(bbox[0]), tuple(bbox[1]))
+        self._insert_leaf(leaf)
+
+    def bbox(self, item):
+        """ Returns the bounding box of the item.
+
+        :param item: item identifier
+        :type item: int
+        :return: bounding box
+        :rtype: tuple
+        """
+        return self._bbox[self._leaves[item]]
+
+    def _build(self, leaves):
+        if len(leaves) == 1:
+            return leaves[0]
+
+        # Split along the axis with the largest extent
+        bbmin = [min(coords) for coords in zip(*[self._bbox[leaf][0] for leaf in leaves])]
+        bbmax = [max(coords) for coords in zip(*[self._bbox[leaf][1] for leaf in leaves])]
+        extents = [c2 - c1 for c1, c2 in zip(bbmin, bbmax)]
+        axis = extents.index(max(extents))
+        leaves.sort(key=lambda leaf: self._bbox[leaf][0][axis] + self._bbox[leaf][1][axis])
+        mid = len(leaves) // 2
+
+        left = self._build(leaves[:mid])
+        right = self._build(leaves[mid:])
+        node = self._allocate(_bbox_union(self._bbox[left], self._bbox[right]), None)
+        self._left[node] = left
+        self._right[node] = right
+        self._height[node] = 1 + max(self._height[left], self._height[right])
+        self._parent[left] = node
+        self._parent[right] = node
+        return node
+
+    def _insert_leaf(self, leaf):
+        if self._root < 0:
+            self._root = leaf
+            self._parent[leaf] = -1
+            return
+
+        # Find the best sibling for the new leaf
+        bbox = self._bbox[leaf]
+        index = self._root
+        while self._left[index] >= 0:
+            area = _bbox_perimeter(self._bbox[index])
+            combined_area = _bbox_union_perimeter(self._bbox[index], bbox)
+            # Cost of creating a new parent for this node and the new leaf
+            cost = 2.0 * combined_area
+            # Minimum cost of pushing the leaf further down the tree
+            inheritance_cost = 2.0 * (combined_area - area)
+            costs = []
+            for child in (self._left[index], self._right[index]):
+                child_cost = _bbox_union_perimeter(bbox, self._bbox[child]) + inheritance_cost
+                if self._left[child] >= 0:
+                    child_cost -= _bbox_perimeter(self._bbox[child])
+                costs.append(child_cost)
+            if cost < costs[0] and cost < costs[1]:
+                break
+            index = self._left[index] if costs[0] < costs[1] else self._right[index]
+
+        # Create a new parent for the sibling and the leaf
+        sibling = index
+        old_parent = self._parent[sibling]
+        new_parent = self._allocate(_bbox_union(bbox, self._bbox[sibling]), None)
+        self._parent[new_parent] = old_parent
+        self._height[new_parent] = self._height[sibling] + 1
+        if old_parent >= 0:
+            if self._left[old_parent] == sibling:
+                self._left[old_parent] = new_parent
+            else:
+                self._right[old_parent] = new_parent
+        else:
+            self._root = new_parent
+        self._left[new_parent] = sibling
+        self._right[new_parent] = leaf
+        self._parent[sibling] = new_parent
+        self._parent[leaf] = new_parent
+
+        # Walk back up the tree fixing the heights and the bounding boxes
+        self._refit(self._parent[leaf])
+
+    def _remove_leaf(self, leaf):
+        if leaf == self._root:
+            self._root = -1
+            return
+
+        parent = self._parent[leaf]
+        grand_parent = self._parent[parent]
+        sibling = self._right[parent] if self._left[parent] == leaf else self._left[parent]
+        self._free.append(parent)
+        if grand_parent >= 0:
+            # Connect the sibling to the grand parent
+            if self._left[grand_parent] == parent:
+                self._left[grand_parent] = sibling
+            else:
+                self._right[grand_parent] = sibling
+            self._parent[sibling] = grand_parent
+            self._refit(grand_parent)
+        else:
+            self._root = sibling
+            self._parent[sibling] = -1
+
+    def _refit(self, index):
+        while index >= 0:
+            index = self._balance(index)
+            left = self._left[index]
+            right = self._right[index]
+            self._height[index] = 1 + max(self._height[left], self._height[right])
+            self._bbox[index] = _bbox_union(self._bbox[left], self._bbox[right])
+            index = self._parent[index]
+
+    def _balance(self, node_a):
+        # Performs a left or right rotation if the node is imbalanced and returns the new root of the subtree
+        if self._left[node_a] < 0 or self._height[node_a] < 2:
+            return node_a
+
+        node_b = self._left[node_a]
+        node_c = self._right[node_a]
+        balance = self._height[node_c] - self._height[node_b]
+
+        # Rotate C up
+        if balance > 1:
+            node_f = self._left[node_c]
+            node_g = self._right[node_c]
+            self._replace_child(node_a, node_c)
+            self._left[node_c] = node_a
+            self._parent[node_a] = node_c
+            if self._height[node_f] > self._height[node_g]:
+                node_f, node_g = node_g, node_f
+            # The higher grandchild stays under C, the lower one moves under A
+            self._right[node_c] = node_g
+            self._right[node_a] = node_f
+            self._parent[node_f] = node_a
+            self._bbox[node_a] = _bbox_union(self._bbox[node_b], self._bbox[node_f])
+            self._bbox[node_c] = _bbox_union(self._bbox[node_a], self._bbox[node_g])
+            self._height[node_a] = 1 + max(self._height[node_b], self._height[node_f])
+            self._height[node_c] = 1 + max(self._height[node_a], self._height[node_g])
+            return node_c
+
+        # Rotate B up
+        if balance < -1:
+            node_d = self._left[node_b]
+            node_e = self._right[node_b]
+            self._replace_child(node_a, node_b)
+            self._left[node_b] = node_a
+            self._parent[node_a] = node_b
+            if self._height[node_d] > self._height[node_e]:
+                node_d, node_e = node_e, node_d
+            # The higher grandchild stays under B, the lower one moves under A
+            self._right[node_b] = node_e
+            self._left[node_a] = node_d
+            self._parent[node_d] = node_a
+            self._bbox[node_a] = _bbox_union(self._bbox[node_c], self._bbox[node_d])
+            self._bbox[node_b] = _bbox_union(self._bbox[node_a], self._bbox[node_e])
+            self._height[node_a] = 1 + max(self._height[node_c], self._height[node_d])
+            self._height[node_b] = 1 + max(self._height[node_a], self._height[node_e])
+            return node_b
+
+        return node_a
+
+    def _replace_child(self, node, new_node):
+        # Replaces the node with the new node in its parent
+        parent = self._parent[node]
+        self._parent[new_node] = parent
+        if parent < 0:
+            self._root = new_node
+        elif self._left[parent] == node:
+            self._left[parent] = new_node
+        else:
+            self._right[parent] = new_node
+
+    def query_box(self, bbox):
+        """ Finds the items whose bounding boxes overlap with the input bounding box.
+
+        :param bbox: bounding box defined by its minimum and maximum points
+        :type bbox: list, tuple
+        :return: list of item identifiers
+        :rtype: list
+        """
+        items = []
+        stack = [self._root] if self._root >= 0 else []
+        while stack:
+            node = stack.pop()
+            if not _bbox_overlap(self._bbox[node], bbox):
+                continue
+            if self._left[node] < 0:
+                items.append(self._item[node])
+            else:
+                stack.append(self._left[node])
+                stack.append(self._right[node])
+        return items
+
+    def query_sphere(self, center, radius):
+        """ Finds the items whose bounding boxes overlap with the sphere.
+
+        :param center: center of the sphere
+        :type center: list, tuple
+        :param radius: radius of the sphere
+        :type radius: float
+        :return: list of item identifiers
+        :rtype: list
+        """
+        items = []
+        radius_sq = radius * radius
+        stack = [self._root] if self._root >= 0 else []
+        while stack:
+            node = stack.pop()
+            if _bbox_distance_sq(self._bbox[node], center) > radius_sq:
+                continue
+            if self._left[node] < 0:
+                items.append(self._item[node])
+            else:
+                stack.append(self._left[node])
+                stack.append(self._right[node])
+        return items
+
+    def nearest(self, point):
+        """ Finds the item whose bounding box is nearest to the input point.
+
+        :param point: query point
+        :type point: list, tuple
+        :return: item identifier and the distance between the point and its bounding box
+        :rtype: tuple
+        """
+        if self._root < 0:
+            return None, float('inf')
+        heap = [(_bbox_distance_sq(self._bbox[self._root], point), self._root)]
+        while heap:
+            dist_sq, node = heapq.heappop(heap)
+            # The first leaf popped from the heap is the nearest one
+            if self._left[node] < 0:
+                return self._item[node], math.sqrt(dist_sq)
+            for child in (self._left[node], self._right[node]):
+                heapq.heappush(heap, (_bbox_distance_sq(self._bbox[child], point), child))
+
+    def overlapping_pairs(self):
+        """ Finds all pairs of items with overlapping bounding boxes.
+
+        :return: list of item identifier pairs
+        :rtype: list
+        """
+        pairs = []
+        stack = [(self._root, self._root)] if self._root >= 0 else []
+        while stack:
+            node_a, node_b = stack.pop()
+            if node_a == node_b:
+                # Pairs within the same subtree
+                if self._left[node_a] >= 0:
+                    left = self._left[node_a]
+                    right = self._right[node_a]
+                    stack.extend([(left, left), (right, right), (left, right)])
+                continue
+            if not _bbox_overlap(self._bbox[node_a], self._bbox[node_b]):
+                continue
+            leaf_a = self._left[node_a] < 0
+            leaf_b = self._left[node_b] < 0
+            if leaf_a and leaf_b:
+                pair = (self._item[node_a], self._item[node_b])
+                pairs.append(pair if pair[0] < pair[1] else (pair[1], pair[0]))
+            elif leaf_b or (not leaf_a and self._height[node_a] >= self._height[node_b]):
+                stack.append((self._left[node_a], node_b))
+                stack.append((self._right[node_a], node_b))
+            else:
+                stack.append((node_a, self._left[node_b]))
+                stack.append((node_a, self._right[node_b]))
+        return pairs
+
+
+def _bbox_union(bbox1, bbox2):
+    return (tuple([min(c1, c2) for c1, c2 in zip(bbox1[0], bbox2[0])]),
+            tuple([max(c1, c2) for c1, c2 in zip(bbox1[1], bbox2[1])]))
+
+
+def _bbox_perimeter(bbox):
+    return sum([c2 - c1 for c1, c2 in zip(bbox[0], bbox[1])])
+
+
+def _bbox_union_perimeter(bbox1, bbox2):
+    return sum([max(c1, c2) for c1, c2 in zip(bbox1[1], bbox2[1])]) - \
+        sum([min(c1, c2) for c1, c2 in zip(bbox1[0], bbox2[0])])
+
+
+def _bbox_overlap(bbox1, bbox2):
+    min1, max1 = bbox1
+    min2, max2 = bbox2
+    for i in range(len(min1)):
+        if min1[i] > max2[i] or min2[i] > max1[i]:
+            return False
+    return True
+
+
+def _bbox_distance_sq(bbox, point):
+    dist_sq = 0.0
+    for bmin, bmax, c in zip(bbox[0], bbox[1], point):
+        if c < bmin:
+            dist_sq += (bmin - c) ** 2
+        elif c > bmax:
+            dist_sq += (c - bmax) ** 2
+    return dist_sq
@@ -0,0 +1,375 @@
+"""
+.. module:: tiles
+    :platform: Unix, Windows
+    :synopsis: Tile-based cached evaluation of the surfaces over parametric sub-ranges
+
+.. moduleauthor:: Onur Rauf Bingol <orbingol@gmail.com>
+
+"""
+
+from . import math
+from . import array
+from . import OrderedDict
+from . import utilities
+from . import buffers
+from . import profiling
+
+
+class Window(buffers.PointBuffer):
+    """ Evaluated points of a parametric window.
+
+    The points are stored in *[u][v]* order, i.e. v-direction varies the fastest, same as ``evalpts``.
+
+    :param data: buffer of the coordinates
+    :type data: array
+    :param knots_u: parameters of the points in u-direction
+    :type knots_u: list
+    :param knots_v: parameters of the points in v-direction
+    :type knots_v: list
+    :param dimension: dimension of the points
+    :type dimension: int
+    :param level: level of detail
+    :type level: int
+    """
+
+    def __init__(self, data, knots_u, knots_v, dimension, level):
+        super(Window, self).__init__(data, len(knots_u) * len(knots_v), dimension)
+        self._knots_u = knots_u
+        self._knots_v = knots_v
+        self._level = level
+
+    def __str__(self):
+        return "Window(size_u=" + str(self.size_u) + ", size_v=" + str(self.size_v) + ", level=" + \
+               str(self._level) + ")"
+
+    __repr__ = __str__
+
+    @property
+    def knots_u(self):
+        """ Parameters of the points in u-direction.
+
+        :getter: Gets the parameters
+        :type: list
+        """
+        return self._knots_u
+
+    @property
+    def knots_v(self):
+        """ Parameters of the points in v-direction.
+
+        :getter: Gets the parameters
+        :type: list
+        """
+        return self._knots_v
+
+    @property
+    def size_u(self):
+        """ Number of points in u-direction.
+
+        :getter: Gets the number of points in u-direction
+        :type: int
+        """
+        return len(self._knots_u)
+
+    @property
+    def size_v(self):
+        """ Number of points in v-direction.
+
+        :getter: Gets the number of points in v-direction
+        :type: int
+        """
+        return len(self._knots_v)
+
+    @property
+    def level(self):
+        """ Level of detail of the points.
+
+        :getter: Gets the level of detail
+        :type: int
+        """
+        return self._level
+
+
+class TileCache(object):
+    """ Caches the evaluated surface points in tiles for the repeated evaluations over parametric sub-ranges.
+
+    The parametric domain of the surface is sampled on a uniform lattice for each level of detail. The lattice of the
+    level *L* has *tile_size * 2^L* intervals in each direction and it is split into *2^L x 2^L* tiles. Each tile
+    contains *(tile_size + 1) x (tile_size + 1)* points, i.e. the neighboring tiles share their boundary points.
+
+    A window request, e.g. from a viewer panning and zooming over a large surface, is snapped to the lattice of the
+    requested level and only the tiles which are not in the cache are evaluated. The least recently used tiles are
+    evicted when the size of the cached tiles exceeds the memory budget. The cache is cleared automatically when the
+    surface is modified.
+
+    .. code-block:: python
+
+        cache = tiles.TileCache(surf, tile_size=32)
+        level = cache.select_level(0.25, 0.5, resolution=200)
+        window = cache.evaluate(level, start_u=0.25, stop_u=0.5, start_v=0.4, stop_v=0.6)
+        points = window.view
+
+    :param obj: surface
+    :type obj: BSpline.Surface or NURBS.Surface
+    :param tile_size: number of intervals in each direction of a tile
+    :type tile_size: int
+    :param memory_budget: maximum size of the cached tiles in bytes
+    :type memory_budget: int
+    """
+
+    def __init__(self, obj, tile_size=32, memory_budget=64 * 1024 * 1024):
+        if tile_size < 1:
+            raise ValueError("Tile size must be a positive integer")
+        self._obj = obj
+        self._tile_size = tile_size
+        self._memory_budget = memory_budget
+        self._tiles = OrderedDict()
+        self._memory = 0
+        self._version = None
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    @property
+    def surface(self):
+        """ Surface bound to the cache.
+
+        :getter: Gets the surface
+        :type: BSpline.Surface or NURBS.Surface
+        """
+        return self._obj
+
+    @property
+    def tile_size(self):
+        """ Number of intervals in each direction of a tile.
+
+        :getter: Gets the tile size
+        :type: int
+        """
+        return self._tile_size
+
+    @property
+    def memory_budget(self):
+        """ Maximum size of the cached tiles in bytes.
+
+        :getter: Gets the memory budget
+        :setter: Sets the memory budget and evicts the tiles, if necessary
+        :type: int
+        """
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value):
+        self._memory_budget = value
+        self._evict()
+
+    @property
+    def memory(self):
+        """ Size of the cached tiles in bytes.
+
+        :getter: Gets the size of the cached tiles
+        :type: int
+        """
+        return self._memory
+
+    @property
+    def hits(self):
+        """ Number of the tile requests served from the cache.
+
+        :getter: Gets the number of cache hits
+        :type: int
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """ Number of the evaluated tiles.
+
+        :getter: Gets the number of cache misses
+        :type: int
+        """
+        return self._misses
+
+    def clear(self):
+        """ Removes all tiles from the cache. """
+        self._tiles.clear()
+        self._memory = 0
+
+    def select_level(self, start, stop, resolution):
+        """ Selects the coarsest level of detail with the required resolution.
+
+        :param start: start parameter of the window
+        :type start: float
+        :param stop: stop parameter of the window
+        :type stop: float
+        :param resolution: minimum number of intervals between the start and the stop parameters
+        :type resolution: int
+        :return: level of detail
+        :rtype: int
+        """
+        intervals = abs(stop - start) * self._tile_size
+        if intervals <= 0.0:
+            return 0
+        return max(0, int(math.ceil(math.log(float(resolution) / intervals, 2))))
+
+    def tile(self, level, index_u, index_v):
+        """ Returns the points of a tile, evaluating them if they are not in the cache.
+
+        :param level: level of detail
+        :type level: int
+        :param index_u: index of the tile in u-direction
+        :type index_u: int
+        :param index_v: index of the tile in v-direction
+        :type index_v: int
+        :return: points of the tile
+        :rtype: buffers.PointBuffer
+        """
+        self._update()
+        num_tiles = 2 ** level
+        if not (0 <= index_u < num_tiles and 0 <= index_v < num_tiles):
+            raise IndexError("Tile index out of range")
+        key = (level, index_u, index_v)
+        data = self._tiles.pop(key, None)
+        if data is None:
+            self._misses += 1
+            profiling.count('cache.tiles.misses')
+            data = self._evaluate_tile(level, index_u, index_v)
+            self._memory += len(data) * data.itemsize
+        else:
+            self._hits += 1
+            profiling.count('cache.tiles.hits')
+        # Move the tile to the end, i.e. mark it as the most recently used one
+        self._tiles[key] = data
+        self._evict(keep=key)
+        return buffers.PointBuffer(data, (self._tile_size + 1) ** 2, self._obj.dimension)
+
+    def evaluate(self, level=0, **kwargs):
+        """ Evaluates the surface points in a parametric window using the cached tiles.
+
+        The window is extended to the closest lattice points of the requested level of detail, therefore the returned
+        points cover the whole window.
+
+        Keyword arguments:
+
+        * ``start_u``: start parameter in u-direction
+        * ``stop_u``: stop parameter in u-direction
+        * ``start_v``: start parameter in v-direction
+        * ``stop_v``: stop parameter in v-direction
+
+        :param level: level of detail
+        :type level: int
+        :return: evaluated points of the window
+        :rtype: Window
+        """
+        if level < 0:
+            raise ValueError("Level of detail must be a non-negative integer")
+        self._update()
+        obj = self._obj
+        start_u = kwargs.get('start_u', obj.knotvector_u[obj.degree_u])
+        stop_u = kwargs.get('stop_u', obj.knotvector_u[-(obj.degree_u + 1)])
+        start_v = kwargs.get('start_v', obj.knotvector_v[obj.degree_v])
+        stop_v = kwargs.get('stop_v', obj.knotvector_v[-(obj.degree_v + 1)])
+        utilities.check_uv(start_u, stop_u)
+        utilities.check_uv(start_v, stop_v)
+
+        size = self._tile_size
+        num_tiles = 2 ** level
+        dimension = obj.dimension
+        idx_u = self._lattice_range(start_u, stop_u, level, 'u')
+        idx_v = self._lattice_range(start_v, stop_v, level, 'v')
+        segments_u = self._segments(idx_u[0], idx_u[1], num_tiles)
+        segments_v = self._segments(idx_v[0], idx_v[1], num_tiles)
+
+        # Collect the tiles first, so that the eviction cannot remove the tiles of the window during copying
+        tiles = {}
+        for iu, _, _ in segments_u:
+            for jv, _, _ in segments_v:
+                tiles[(iu, jv)] = self.tile(level, iu, jv).data
+
+        row_size = (size + 1) * dimension
+        out = buffers.allocate((idx_u[1] - idx_u[0] + 1) * (idx_v[1] - idx_v[0] + 1) * dimension)
+        pos = 0
+        for iu, first_u, last_u in segments_u:
+            for pu in range(first_u, last_u + 1):
+                offset = (pu - iu * size) * row_size
+                for jv, first_v, last_v in segments_v:
+                    data = tiles[(iu, jv)]
+                    count = (last_v - first_v + 1) * dimension
+                    start = offset + (first_v - jv * size) * dimension
+                    out[pos:(pos + count)] = data[start:(start + count)]
+                    pos += count
+
+        knots_u = [self._param(idx, level, 'u') for idx in range(idx_u[0], idx_u[1] + 1)]
+        knots_v = [self._param(idx, level, 'v') for idx in range(idx_v[0], idx_v[1] + 1)]
+        return Window(out, knots_u, knots_v, dimension, level)
+
+    def _update(self):
+        # Clears the cache, if the surface is modified
+        if self._version != self._obj._version:
+            self.clear()
+            self._version = self._obj._version
+
+    def _evict(self, keep=None):
+        # Evicts the least recently used tiles until the cached tiles fit into the memory budget
+        while self._memory > self._memory_budget and self._tiles:
+            key = next(iter(self._tiles))
+            if key == keep:
+                break
+            data = self._tiles.pop(key)
+            self._memory -= len(data) * data.itemsize
+
+    def _domain(self, direction):
+        obj = self._obj
+        if direction == 'u':
+            return obj.knotvector_u[obj.degree_u], obj.knotvector_u[-(obj.degree_u + 1)]
+        return obj.knotvector_v[obj.degree_v], obj.knotvector_v[-(obj.degree_v + 1)]
+
+    def _param(self, index, level, direction):
+        # Returns the parameter of the lattice point
+        start, stop = self._domain(direction)
+        num_intervals = self._tile_size * (2 ** level)
+        if index == num_intervals:
+            return stop
+        return start + (stop - start) * float(index) / num_intervals
+
+    def _lattice_range(self, start, stop, level, direction):
+        # Returns the indices of the lattice points covering the parametric range
+        dom_start, dom_stop = self._domain(direction)
+        num_intervals = self._tile_size * (2 ** level)
+        scale = num_intervals / float(dom_stop - dom_start)
+        first = int(math.floor((start - dom_start) * scale + 1e-9))
+        last = int(math.ceil((stop - dom_start) * scale - 1e-9))
+        first = min(max(first, 0), num_intervals)
+        last = min(max(last, first), num_intervals)
+        return first, last
+
+    def _segments(self, first, last, num_tiles):
+        # Splits the lattice range into (tile index, first index, last index) segments. The tiles share their boundary
+        # points, therefore a segment ending on a tile boundary does not require the next tile.
+        segments = []
+        idx = first
+        while idx <= last:
+            tile = min(idx // self._tile_size, num_tiles - 1)
+            end = min(last, (tile + 1) * self._tile_size)
+            segments.append((tile, idx, end))
+            idx = end + 1
+        return segments
+
+    def _evaluate_tile(self, level, index_u, index_v):
+        obj = self._obj
+        size = self._tile_size
+        knots_u = [self._param(index_u * size + k, level, 'u') for k in range(size + 1)]
+        knots_v = [self._param(index_v * size + k, level, 'v') for k in range(size + 1)]
+        evaluator, ctrlpts, dimension = obj._evaluation_data()
+        out = array('d', [0.0]) * ((size + 1) ** 2 * obj.dimension)
+        spts = evaluator.evaluate(knots_u=knots_u, knots_v=knots_v,
+                                  degree_u=obj.degree_u, degree_v=obj.degree_v,
+                                  knotvector_u=obj.knotvector_u, knotvector_v=obj.knotvector_v,
+                                  ctrlpts_size_u=obj.ctrlpts_size_u, ctrlpts_size_v=obj.ctrlpts_size_v,
+                                  ctrlpts=ctrlpts,
+                                  dimension=dimension,
+                                  out=out)
+        buffers.store(spts, out, len(knots_u) * len(knots_v), obj.dimension)
+        return out
@@ -32,7 +32,7 @@ def linspace(start, stop, num, decimals=6):
     num = int(num)
     div = num - 1
     delta = stop - start
-    return [float(("%0." + str(decimals) + "f") % (float(x) * float(delta) / float(div))) for x in range(num)]
+    return [float(("%0." + str(decimals) + "f") % (start + (float(x) * float(delta) / float(div)))) for x in range(num)]
 
 
 def vector_cross(vector1, vector2):
@@ -118,6 +118,20 @@ def vector_normalize(vector_in):
         raise ValueError("The magnitude of the vector is zero")
 
 
+def vector_magnitude(vector_in):
+    """ Computes the magnitude of the input vector.
+
+    :param vector_in: input vector
+    :type vector_in: list, tuple
+    :return: magnitude of the vector
+    :rtype: float
+    """
+    sq_sum = 0.0
+    for vin in vector_in:
+        sq_sum += vin ** 2
+    return math.sqrt(sq_sum)
+
+
 def vector_generate(start_pt, end_pt, normalize=False):
     """ Generates a vector from 2 input 3D points.
 
@@ -213,7 +227,7 @@ def evaluate_bounding_box(ctrlpts):
 
     # Evaluate bounding box
     bbmin = [float('inf') for _ in range(0, dimension)]
-    bbmax = [0.0 for _ in range(0, dimension)]
+    bbmax = [float('-inf') for _ in range(0, dimension)]
     for cpt in ctrlpts:
         for i, arr in enumerate(zip(cpt, bbmin)):
             if arr[0] < arr[1]:
@@ -27,6 +27,8 @@ class VisConfig(Abstract.VisConfigAbstract):
     * ``axes`` (True or False): Enables/Disables axes and grid on the figure
     * ``figure_size`` (list, *default: [800, 800]*): Size of the figure in (x, y)
     * ``linewidth`` (int, *default: 2*): thickness of the lines on the figure
+    * ``float32`` (True or False, *default: False*): Converts the mesh vertices to single precision (``VisSurfaceMesh``)
+    * ``decimation`` (int, *default: 1*): Uses every n-th evaluated point in each direction (``VisSurfaceMesh``)
 
     Please refer to the **Examples Repository** for details.
     """
@@ -36,6 +38,8 @@ class VisConfig(Abstract.VisConfigAbstract):
         self.figure_size = kwargs.get('figure_size', [800, 800])
         self.display_legend = kwargs.get('legend', True)
         self.line_width = kwargs.get('linewidth', 2)
+        self.use_float32 = kwargs.get('float32', False)
+        self.decimation = kwargs.get('decimation', 1)
 
 
 class VisCurve2D(Abstract.VisAbstract):
@@ -220,3 +224,128 @@ class VisSurface(Abstract.VisAbstractSurf):
             "data": plot_data,
             "layout": plot_layout
         }, show_link=False)
+
+
+class VisSurfaceMesh(Abstract.VisAbstractSurf):
+    """ Plotly visualization module for Surfaces using triangular meshes
+
+    The evaluated points are plotted as a ``Mesh3d`` trace. Each point is stored once in the vertex arrays and the
+    triangles are defined by the face index arrays generated from the grid size, which produces much smaller figures
+    than :class:`.VisSurface` for the large sample sizes. The size of the figure can be reduced further using the
+    ``float32`` and ``decimation`` options of :class:`.VisConfig`.
+    """
+    def __init__(self, config=VisConfig()):
+        super(VisSurfaceMesh, self).__init__(config=config)
+
+    def render(self):
+        """ Plots the surface and the control points grid """
+        if not self._plots:
+            return
+
+        plot_data = []
+        for plot in self._plots:
+            # Plot control points
+            if plot['type'] == 'ctrlpts' and self._config.display_ctrlpts:
+                pts = np.array(utilities.make_quad(plot['ptsarr'], plot['size'][1], plot['size'][0]))
+                cp_z = pts[:, 2] + self._ctrlpts_offset
+                figure = graph_objs.Scatter3d(
+                    x=pts[:, 0],
+                    y=pts[:, 1],
+                    z=cp_z,
+                    name=plot['name'],
+                    mode='lines+markers',
+                    line=dict(
+                        color=plot['color'],
+                        width=self._config.line_width,
+                        dash='solid'
+                    ),
+                    marker=dict(
+                        color=plot['color'],
+                        size=self._config.line_width
+                    )
+                )
+                plot_data.append(figure)
+
+            # Plot evaluated points
+            if plot['type'] == 'evalpts':
+                dtype = np.float32 if self._config.use_float32 else np.float64
+                pts = make_mesh_vertices(plot['ptsarr'], plot['size'][0], plot['size'][1],
+                                         self._config.decimation, dtype)
+                tri_i, tri_j, tri_k = make_mesh_faces(pts.shape[0], pts.shape[1])
+                pts = pts.reshape(-1, pts.shape[2])
+                figure = graph_objs.Mesh3d(
+                    x=pts[:, 0],
+                    y=pts[:, 1],
+                    z=pts[:, 2],
+                    i=tri_i,
+                    j=tri_j,
+                    k=tri_k,
+                    name=plot['name'],
+                    color=plot['color'],
+                    showlegend=True
+                )
+                plot_data.append(figure)
+
+        plot_layout = dict(
+            width=self._config.figure_size[0],
+            height=self._config.figure_size[1],
+            autosize=False,
+            showlegend=self._config.display_legend
+        )
+
+        plotly.offline.plot({
+            "data": plot_data,
+            "layout": plot_layout
+        }, show_link=False)
+
+
+def make_mesh_vertices(points, size_u, size_v, decimation=1, dtype=np.float64):
+    """ Generates the vertex grid from the evaluated surface points.
+
+    The evaluated points are reshaped into a *(size_u, size_v, dimension)* array without generating any intermediate
+    lists. If the decimation is bigger than 1, every n-th point is kept in each direction and the last row and the last
+    column are always kept to preserve the boundaries of the surface.
+
+    :param points: evaluated surface points in *[u][v]* order, e.g. ``evalpts``
+    :type points: list, tuple, buffers.PointBuffer
+    :param size_u: number of points in u-direction
+    :type size_u: int
+    :param size_v: number of points in v-direction
+    :type size_v: int
+    :param decimation: step size of the decimation
+    :type decimation: int
+    :param dtype: data type of the vertices
+    :return: vertex grid
+    :rtype: numpy.ndarray
+    """
+    if decimation < 1:
+        raise ValueError("Decimation must be a positive integer")
+    pts = np.asarray(points, dtype=dtype)
+    pts = pts.reshape(size_u, size_v, -1)
+    if decimation > 1:
+        idx_u = np.unique(np.append(np.arange(0, size_u, decimation), size_u - 1))
+        idx_v = np.unique(np.append(np.arange(0, size_v, decimation), size_v - 1))
+        pts = pts[idx_u][:, idx_v]
+    return pts
+
+
+def make_mesh_faces(size_u, size_v):
+    """ Generates the triangle vertex indices of a structured grid of points.
+
+    Each quad of the grid is split into two triangles. The indices refer to the points in *[u][v]* order, i.e. the
+    index of the point *(i, j)* is ``i * size_v + j``.
+
+    :param size_u: number of points in u-direction
+    :type size_u: int
+    :param size_v: number of points in v-direction
+    :type size_v: int
+    :return: first, second and third vertex indices of the triangles
+    :rtype: tuple
+    """
+    idx = np.arange(size_u * size_v, dtype=np.int32).reshape(size_u, size_v)
+    corner1 = idx[:-1, :-1].ravel()
+    corner2 = idx[1:, :-1].ravel()
+    corner3 = idx[1:, 1:].ravel()
+    corner4 = idx[:-1, 1:].ravel()
+    return np.concatenate((corner1, corner1)), np.concatenate((corner2, corner3)), \
+        np.concatenate((corner3, corner4))
@@ -0,0 +1,112 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Shared test fixtures. Requires "pytest" to run.
+"""
+
+import pytest
+from geomdl import BSpline
+from geomdl import NURBS
+
+SAMPLE_SIZE = 5
+
+C_DEGREE = 2
+C_CTRLPTS2D = [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [3.0, 2.0]]
+C_CTRLPTS3D = [[1.0, 1.0, 0.0], [2.0, 1.0, -1.0], [2.0, 2.0, 0.0], [3.0, 2.0, 1.0]]
+C_WEIGHTS = [1.0, 0.5, 2.0, 1.0]
+C_KV = [0.0, 0.0, 0.0, 0.5, 1.0, 1.0, 1.0]
+
+S_DEGREE_U = 2
+S_DEGREE_V = 2
+S_CTRLPTS = [[0.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 2.0, -3.0],
+             [1.0, 0.0, 6.0], [1.0, 1.0, 0.0], [1.0, 2.0, 0.0],
+             [2.0, 0.0, 0.0], [2.0, 1.0, 0.0], [2.0, 2.0, 3.0]]
+S_KV_U = [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+S_KV_V = [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+
+# Weighted control points of the rational surface
+R_DEGREE_U = 2
+R_DEGREE_V = 1
+R_CTRLPTSW = [[0.0, 0.0, 0.0, 1.0], [0.0, 1.0, 0.0, 1.0], [0.0, 2.0, -3.0, 1.0],
+              [1.0, 0.0, 6.0, 2.0], [1.0, 1.0, 0.0, 1.0], [1.0, 2.0, 0.0, 0.5],
+              [2.0, 0.0, 0.0, 1.0], [2.0, 1.0, 0.0, 1.0], [2.0, 2.0, 3.0, 1.0]]
+R_KV_U = [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+R_KV_V = [0.0, 0.0, 0.5, 1.0, 1.0]
+
+# Rectangle of size 2 x 3 on the xy-plane
+P_CTRLPTS = [[0.0, 0.0, 0.0], [0.0, 3.0, 0.0], [2.0, 0.0, 0.0], [2.0, 3.0, 0.0]]
+P_KV = [0.0, 0.0, 1.0, 1.0]
+
+
+@pytest.fixture
+def curve2d():
+    """ 2D quadratic B-spline curve """
+    curve = BSpline.Curve()
+    curve.degree = C_DEGREE
+    curve.ctrlpts = C_CTRLPTS2D
+    curve.knotvector = C_KV
+    curve.sample_size = SAMPLE_SIZE
+    return curve
+
+
+@pytest.fixture
+def curve3d():
+    """ 3D quadratic B-spline curve """
+    curve = BSpline.Curve()
+    curve.degree = C_DEGREE
+    curve.ctrlpts = C_CTRLPTS3D
+    curve.knotvector = C_KV
+    curve.sample_size = SAMPLE_SIZE
+    return curve
+
+
+@pytest.fixture
+def nurbs_curve2d():
+    """ 2D quadratic NURBS curve """
+    curve = NURBS.Curve()
+    curve.degree = C_DEGREE
+    curve.ctrlpts = C_CTRLPTS2D
+    curve.weights = C_WEIGHTS
+    curve.knotvector = C_KV
+    curve.sample_size = SAMPLE_SIZE
+    return curve
+
+
+@pytest.fixture
+def surface():
+    """ Biquadratic B-spline surface """
+    surf = BSpline.Surface()
+    surf.degree_u = S_DEGREE_U
+    surf.degree_v = S_DEGREE_V
+    surf.set_ctrlpts(S_CTRLPTS, 3, 3)
+    surf.knotvector_u = S_KV_U
+    surf.knotvector_v = S_KV_V
+    surf.sample_size = SAMPLE_SIZE
+    return surf
+
+
+@pytest.fixture
+def nurbs_surface():
+    """ NURBS surface, quadratic in u-direction and linear in v-direction """
+    surf = NURBS.Surface()
+    surf.degree_u = R_DEGREE_U
+    surf.degree_v = R_DEGREE_V
+    surf.set_ctrlpts(R_CTRLPTSW, 3, 3)
+    surf.knotvector_u = R_KV_U
+    surf.knotvector_v = R_KV_V
+    surf.sample_size = SAMPLE_SIZE
+    return surf
+
+
+@pytest.fixture
+def plane():
+    """ Bilinear B-spline surface of a rectangle """
+    surf = BSpline.Surface()
+    surf.degree_u = 1
+    surf.degree_v = 1
+    surf.set_ctrlpts(P_CTRLPTS, 2, 2)
+    surf.knotvector_u = P_KV
+    surf.knotvector_v = P_KV
+    return surf
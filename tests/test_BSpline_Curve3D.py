@@ -6,6 +6,7 @@
     Tests geomdl.BSpline.Curve module. Requires "pytest" to run.
 """
 from geomdl import BSpline
+from geomdl import evaluators
 
 GEOMDL_DELTA = 0.001
 OBJECT_INSTANCE = BSpline.Curve
@@ -291,3 +292,140 @@ def test_bspline_curve3d_insert_knot4():
     assert curve.knotvector[7] == 0.5
     assert curve.knotvector[8] == 0.5
     assert curve.knotvector[10] == 0.7
+
+
+def test_bspline_curve3d_refine_knotvector():
+    # Create curve instances
+    curve1 = OBJECT_INSTANCE()
+    curve1.degree = 4
+    curve1.ctrlpts = CONTROL_POINTS
+    curve1.knotvector = [0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0]
+
+    curve2 = OBJECT_INSTANCE()
+    curve2.degree = 4
+    curve2.ctrlpts = CONTROL_POINTS
+    curve2.knotvector = [0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0]
+
+    # Insert the same knots using both methods
+    curve1.refine_knotvector([0.8, 0.2, 0.5, 0.5, 0.25])
+    curve2.insert_knot(0.2)
+    curve2.insert_knot(0.25)
+    curve2.insert_knot(0.5, 2)
+    curve2.insert_knot(0.8)
+
+    assert curve1.knotvector == curve2.knotvector
+    for pt1, pt2 in zip(curve1.ctrlpts, curve2.ctrlpts):
+        assert abs(pt1[0] - pt2[0]) < GEOMDL_DELTA
+        assert abs(pt1[1] - pt2[1]) < GEOMDL_DELTA
+        assert abs(pt1[2] - pt2[2]) < GEOMDL_DELTA
+
+    # Evaluation result should not change
+    evalpt = curve1.curvept(0.8)
+    res = [10.978, -1.349, 31.307]
+    assert abs(evalpt[0] - res[0]) < GEOMDL_DELTA
+    assert abs(evalpt[1] - res[1]) < GEOMDL_DELTA
+    assert abs(evalpt[2] - res[2]) < GEOMDL_DELTA
+
+
+def test_bspline_curve3d_decompose():
+    # Create a curve instance
+    curve = OBJECT_INSTANCE()
+    curve.degree = 4
+    curve.ctrlpts = CONTROL_POINTS
+    curve.knotvector = [0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0]
+
+    curve.evaluator = evaluators.CurveEvaluatorParallel(processes=2)
+    curve.sample_size = 7
+
+    # Decompose the curve into Bezier segments
+    segments = curve.decompose()
+
+    assert len(segments) == 6
+    for segment in segments:
+        # Segments keep the evaluator and the sampling settings
+        assert segment.evaluator is curve.evaluator
+        assert segment.sample_size == 7
+        assert abs(segment.delta - curve.delta) < GEOMDL_DELTA
+    knots = [0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0]
+    for idx, segment in enumerate(segments):
+        assert segment.degree == 4
+        assert len(segment.ctrlpts) == 5
+        assert segment.knotvector == (0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+        # Segment end points should lie on the curve
+        for pt, knot in ((segment.ctrlpts[0], knots[idx]), (segment.ctrlpts[-1], knots[idx + 1])):
+            evalpt = curve.curvept(knot)
+            assert abs(pt[0] - evalpt[0]) < GEOMDL_DELTA
+            assert abs(pt[1] - evalpt[1]) < GEOMDL_DELTA
+            assert abs(pt[2] - evalpt[2]) < GEOMDL_DELTA
+
+
+def test_bspline_curve3d_remove_knot():
+    # Create a curve instance
+    curve = OBJECT_INSTANCE()
+    curve.degree = 4
+    curve.ctrlpts = CONTROL_POINTS
+    curve.knotvector = [0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0]
+
+    # Inserting and then removing a knot should not change the curve
+    curve.insert_knot(0.8, 2)
+    num_removed = curve.remove_knot(0.8, 2)
+
+    assert num_removed == 2
+    assert curve.knotvector == (0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0)
+    for pt1, pt2 in zip(curve.ctrlpts, CONTROL_POINTS):
+        assert abs(pt1[0] - pt2[0]) < GEOMDL_DELTA
+        assert abs(pt1[1] - pt2[1]) < GEOMDL_DELTA
+        assert abs(pt1[2] - pt2[2]) < GEOMDL_DELTA
+
+
+def test_bspline_curve3d_reduce():
+    # Create a curve instance
+    curve = OBJECT_INSTANCE()
+    curve.degree = 4
+    curve.ctrlpts = CONTROL_POINTS
+    curve.knotvector = [0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0]
+
+    # Refined knots should be removed completely
+    curve.refine_knotvector([0.2, 0.4, 0.4, 0.6, 0.8])
+    error = curve.reduce(0.001)
+
+    assert error < GEOMDL_DELTA
+    assert len(curve.ctrlpts) == len(CONTROL_POINTS)
+
+    # Evaluation result should not change
+    evalpt = curve.curvept(0.8)
+    res = [10.978, -1.349, 31.307]
+    assert abs(evalpt[0] - res[0]) < GEOMDL_DELTA
+    assert abs(evalpt[1] - res[1]) < GEOMDL_DELTA
+    assert abs(evalpt[2] - res[2]) < GEOMDL_DELTA
+
+
+def test_bspline_curve3d_length():
+    # A linear curve is a polyline, so its length is the sum of the control polygon leg lengths
+    curve = OBJECT_INSTANCE()
+    curve.degree = 1
+    curve.ctrlpts = [[0.0, 0.0, 0.0], [3.0, 4.0, 0.0], [3.0, 4.0, 12.0]]
+    curve.knotvector = [0.0, 0.0, 0.5, 1.0, 1.0]
+
+    assert abs(curve.length() - 17.0) < GEOMDL_DELTA
+    assert abs(curve.length(0.25, 0.75) - 8.5) < GEOMDL_DELTA
+    assert abs(curve.param_at_length(5.0) - 0.5) < GEOMDL_DELTA
+    assert abs(curve.param_at_length(11.0) - 0.75) < GEOMDL_DELTA
+
+
+def test_bspline_curve3d_evaluate_by_length():
+    curve = OBJECT_INSTANCE()
+    curve.degree = 4
+    curve.ctrlpts = CONTROL_POINTS
+    curve.knotvector = [0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0]
+    total = curve.length()
+    curve.evaluate_by_length(2.0)
+
+    assert len(curve.evalpts) == int(total / 2.0) + 2
+    assert curve.evalpts[0] == curve.curvept(0.0)
+    assert curve.evalpts[-1] == curve.curvept(1.0)
+    for idx in range(1, len(curve.evalpts) - 1):
+        u = curve.param_at_length(idx * 2.0)
+        assert abs(curve.length(0.0, u) - idx * 2.0) < GEOMDL_DELTA
+        assert curve.evalpts[idx] == curve.curvept(u)
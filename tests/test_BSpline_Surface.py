@@ -6,6 +6,7 @@
     Tests geomdl.BSpline.Surface module. Requires "pytest" to run.
 """
 from geomdl import BSpline
+from geomdl import evaluators
 
 GEOMDL_DELTA = 0.001
 OBJECT_INSTANCE = BSpline.Surface
@@ -520,3 +521,139 @@ def test_bspline_surface_insert_knot5():
 
     assert surf.knotvector_u[3] == 0.0
     assert surf.knotvector_u[6] == 0.66
+
+
+def test_bspline_surface_refine_knotvector():
+    # Create a surface instance
+    surf = OBJECT_INSTANCE()
+
+    # Set degrees
+    surf.degree_u = 3
+    surf.degree_v = 3
+
+    # Set control points
+    surf.set_ctrlpts(CONTROL_POINTS, 6, 6)
+
+    # Set knot vectors
+    surf.knotvector_u = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+    surf.knotvector_v = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+
+    # Refine knot vectors
+    surf.refine_knotvector(knots_u=[0.3, 0.5, 0.5], knots_v=[0.2, 0.4])
+
+    assert surf.ctrlpts_size_u == 9
+    assert surf.ctrlpts_size_v == 8
+    assert surf.knotvector_u == (0.0, 0.0, 0.0, 0.0, 0.3, 0.33, 0.5, 0.5, 0.66, 1.0, 1.0, 1.0, 1.0)
+    assert surf.knotvector_v == (0.0, 0.0, 0.0, 0.0, 0.2, 0.33, 0.4, 0.66, 1.0, 1.0, 1.0, 1.0)
+
+    # Evaluate surface
+    evalpt = surf.surfpt(u=0.3, v=0.4)
+
+    assert abs(evalpt[0] - RESULT_LIST[4][0]) < GEOMDL_DELTA
+    assert abs(evalpt[1] - RESULT_LIST[4][1]) < GEOMDL_DELTA
+    assert abs(evalpt[2] - RESULT_LIST[4][2]) < GEOMDL_DELTA
+
+
+def test_bspline_surface_decompose():
+    # Create a surface instance
+    surf = OBJECT_INSTANCE()
+
+    # Set degrees
+    surf.degree_u = 3
+    surf.degree_v = 3
+
+    # Set control points
+    surf.set_ctrlpts(CONTROL_POINTS, 6, 6)
+
+    # Set knot vectors
+    surf.knotvector_u = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+    surf.knotvector_v = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+
+    surf.evaluator = evaluators.SurfaceEvaluatorParallel(processes=2)
+    surf.sample_size = 7
+
+    # Decompose the surface into Bezier patches
+    patches = surf.decompose()
+
+    assert len(patches) == 9
+    for patch in patches:
+        # Patches keep the evaluator and the sampling settings
+        assert patch.evaluator is surf.evaluator
+        assert patch.sample_size == 7
+        assert abs(patch.delta_u - surf.delta_u) < GEOMDL_DELTA
+        assert abs(patch.delta_v - surf.delta_v) < GEOMDL_DELTA
+    for patch in patches:
+        assert patch.ctrlpts_size_u == 4
+        assert patch.ctrlpts_size_v == 4
+        assert patch.knotvector_u == (0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)
+        assert patch.knotvector_v == (0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)
+
+    # Patch corners should lie on the surface
+    knots = [0.0, 0.33, 0.66, 1.0]
+    for i in range(3):
+        for j in range(3):
+            patch = patches[(i * 3) + j]
+            evalpt = surf.surfpt(u=knots[i + 1], v=knots[j + 1])
+            res = patch.ctrlpts2d[-1][-1]
+            assert abs(res[0] - evalpt[0]) < GEOMDL_DELTA
+            assert abs(res[1] - evalpt[1]) < GEOMDL_DELTA
+            assert abs(res[2] - evalpt[2]) < GEOMDL_DELTA
+
+
+def test_bspline_surface_remove_knot():
+    # Create a surface instance
+    surf = OBJECT_INSTANCE()
+
+    # Set degrees
+    surf.degree_u = 3
+    surf.degree_v = 3
+
+    # Set control points
+    surf.set_ctrlpts(CONTROL_POINTS, 6, 6)
+
+    # Set knot vectors
+    surf.knotvector_u = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+    surf.knotvector_v = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+
+    # Inserting and then removing knots should not change the surface
+    surf.insert_knot(u=0.5, v=0.4)
+    num_removed = surf.remove_knot(u=0.5, v=0.4)
+
+    assert num_removed == (1, 1)
+    assert surf.ctrlpts_size_u == 6
+    assert surf.ctrlpts_size_v == 6
+    for pt1, pt2 in zip(surf.ctrlpts, CONTROL_POINTS):
+        assert abs(pt1[0] - pt2[0]) < GEOMDL_DELTA
+        assert abs(pt1[1] - pt2[1]) < GEOMDL_DELTA
+        assert abs(pt1[2] - pt2[2]) < GEOMDL_DELTA
+
+
+def test_bspline_surface_reduce():
+    # Create a surface instance
+    surf = OBJECT_INSTANCE()
+
+    # Set degrees
+    surf.degree_u = 3
+    surf.degree_v = 3
+
+    # Set control points
+    surf.set_ctrlpts(CONTROL_POINTS, 6, 6)
+
+    # Set knot vectors
+    surf.knotvector_u = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+    surf.knotvector_v = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+
+    # Refined knots should be removed completely
+    surf.refine_knotvector(knots_u=[0.3, 0.5, 0.5], knots_v=[0.2, 0.4])
+    error = surf.reduce(0.001)
+
+    assert error < GEOMDL_DELTA
+    assert surf.ctrlpts_size_u == 6
+    assert surf.ctrlpts_size_v == 6
+
+    # Evaluate surface
+    evalpt = surf.surfpt(u=0.3, v=0.4)
+
+    assert abs(evalpt[0] - RESULT_LIST[4][0]) < GEOMDL_DELTA
+    assert abs(evalpt[1] - RESULT_LIST[4][1]) < GEOMDL_DELTA
+    assert abs(evalpt[2] - RESULT_LIST[4][2]) < GEOMDL_DELTA
@@ -0,0 +1,104 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.Multi module and the spatial index of the containers. Requires "pytest" to run.
+"""
+
+import copy
+import pytest
+from geomdl import BSpline
+from geomdl import Multi
+from geomdl import spatial
+
+GEOMDL_DELTA = 10e-6
+
+# Unit patch, which is inclined along the x-axis
+PATCH_CTRLPTS = [[0.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 0.0, 1.0], [1.0, 1.0, 1.0]]
+PATCH_KV = [0.0, 0.0, 1.0, 1.0]
+
+
+@pytest.fixture
+def patch():
+    surf = BSpline.Surface()
+    surf.degree_u = 1
+    surf.degree_v = 1
+    surf.set_ctrlpts(PATCH_CTRLPTS, 2, 2)
+    surf.knotvector_u = PATCH_KV
+    surf.knotvector_v = PATCH_KV
+    return surf
+
+
+@pytest.fixture
+def multi_surface(patch):
+    # A 4x4 grid of touching patches
+    multi = Multi.MultiSurface()
+    for i in range(4):
+        for j in range(4):
+            surf = copy.deepcopy(patch)
+            surf.translate([float(i), float(j), 0.0])
+            multi.add(surf)
+    return multi
+
+
+def test_bbox_tree_dynamic():
+    tree = spatial.BoundingBoxTree()
+    items = [tree.insert([(float(i), 0.0), (i + 0.5, 1.0)]) for i in range(20)]
+    assert items == list(range(20))
+    assert tree.height <= 6
+
+    tree.remove(3)
+    tree.update(4, [(100.0, 0.0), (101.0, 1.0)])
+    assert len(tree) == 19
+    assert sorted(tree.query_box([(2.0, 0.0), (4.2, 1.0)])) == [2]
+    assert tree.query_box([(99.0, 0.0), (100.5, 0.5)]) == [4]
+
+
+def test_multi_query_box(multi_surface):
+    multi = multi_surface
+    assert multi.query_box([(1.5, 1.5, 0.0), (1.8, 1.8, 0.5)]) == [5]
+    assert multi.query_box([(10.0, 10.0, 0.0), (11.0, 11.0, 0.5)]) == []
+
+
+def test_multi_query_sphere(multi_surface):
+    multi = multi_surface
+    assert multi.query_sphere([2.0, 2.0, 0.5], 0.1) == [5, 6, 9, 10]
+
+
+def test_multi_nearest(multi_surface):
+    multi = multi_surface
+    idx, dist = multi.nearest([-2.0, 3.5, 0.5])
+    assert idx == 3
+    assert abs(dist - 2.0) < GEOMDL_DELTA
+
+
+def test_multi_overlapping_pairs(multi_surface):
+    multi = multi_surface
+    pairs = multi.overlapping_pairs()
+
+    # Each patch touches its 8 neighbors: 24 edge and 18 diagonal neighbor pairs
+    assert len(pairs) == 42
+    assert (0, 1) in pairs
+    assert (0, 5) in pairs
+    assert (0, 2) not in pairs
+
+
+def test_multi_bbox_tree_update(multi_surface, patch):
+    multi = multi_surface
+    assert len(multi.bbox_tree) == 16
+
+    # Adding elements updates the existing index
+    patch.translate([10.0, 10.0, 0.0])
+    multi.add(patch)
+    assert multi.query_box([(10.5, 10.5, 0.0), (11.0, 11.0, 0.5)]) == [16]
+
+    # Modified elements require an explicit update
+    multi[16].translate([10.0, 0.0, 0.0])
+    multi.update_bbox(16)
+    assert multi.query_box([(10.5, 10.5, 0.0), (11.0, 11.0, 0.5)]) == []
+    assert multi.query_box([(20.5, 10.5, 0.0), (21.0, 11.0, 0.5)]) == [16]
+
+    # Translating the container updates the index
+    multi.translate([0.0, 0.0, 5.0])
+    assert multi.query_box([(1.5, 1.5, 0.0), (1.8, 1.8, 0.5)]) == []
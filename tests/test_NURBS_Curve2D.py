@@ -300,4 +300,25 @@ def test_nurbs_curve2d_insert_knot2():
     res = [33.304, 24.593]
 
     assert abs(evalpt[0] - res[0]) < GEOMDL_DELTA
-    assert abs(evalpt[1] - res[1]) < GEOMDL_DELTA
\ No newline at end of file
+    assert abs(evalpt[1] - res[1]) < GEOMDL_DELTA
+
+
+def test_nurbs_curve2d_length():
+    # Full circle with radius 2
+    curve = OBJECT_INSTANCE()
+    curve.degree = 2
+    w = 2.0 ** 0.5 / 2.0
+    curve.ctrlptsw = [[2.0, 0.0, 1.0], [2.0 * w, 2.0 * w, w], [0.0, 2.0, 1.0], [-2.0 * w, 2.0 * w, w], [-2.0, 0.0, 1.0],
+                      [-2.0 * w, -2.0 * w, w], [0.0, -2.0, 1.0], [2.0 * w, -2.0 * w, w], [2.0, 0.0, 1.0]]
+    curve.knotvector = [0.0, 0.0, 0.0, 0.25, 0.25, 0.5, 0.5, 0.75, 0.75, 1.0, 1.0, 1.0]
+
+    assert abs(curve.length() - 12.566370614) < GEOMDL_DELTA
+    assert abs(curve.length(0.0, 0.25) - 3.141592654) < GEOMDL_DELTA
+    u = curve.param_at_length(1.0)
+    evalpt = curve.curvept(u)
+    assert abs(evalpt[0] - 2.0 * 0.877582562) < GEOMDL_DELTA
+    assert abs(evalpt[1] - 2.0 * 0.479425539) < GEOMDL_DELTA
+
+    # Changing the weights invalidates the cached arc length table
+    curve.weights = [1.0 for _ in range(9)]
+    assert abs(curve.length() - 12.566370614) > GEOMDL_DELTA
@@ -0,0 +1,155 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.buffers module. Requires "pytest" to run.
+"""
+
+import os
+import sys
+from array import array
+import pytest
+from geomdl import buffers
+
+GEOMDL_DELTA = 10e-6
+
+
+def view_coordinates(view):
+    # Reads the coordinates from the memory view, which works for the flat Python 2.x views too
+    data = array('d')
+    raw = memoryview(view).tobytes()
+    if hasattr(data, 'frombytes'):
+        data.frombytes(raw)
+    else:
+        data.fromstring(raw)
+    return data.tolist()
+
+
+def test_point_buffer():
+    pts = buffers.PointBuffer(array('d', [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]), 2, 3)
+    assert len(pts) == 2
+    assert pts[0] == [1.0, 2.0, 3.0]
+    assert pts[-1] == [4.0, 5.0, 6.0]
+    assert pts[0:2] == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert pts == [(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)]
+    assert view_coordinates(pts.view) == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    if sys.version_info[0] > 2:
+        assert pts.view.tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    with pytest.raises(IndexError):
+        pts[2]
+    with pytest.raises(ValueError):
+        buffers.PointBuffer(array('d', [1.0, 2.0]), 1, 3)
+
+
+def test_evaluate_buffer_curve(curve3d):
+    curve = curve3d
+    curve.evaluate()
+    res = [list(pt) for pt in curve.evalpts]
+
+    curve.evaluate(buffer=True)
+    assert isinstance(curve.evalpts, buffers.PointBuffer)
+    assert curve.evalpts == res
+
+    # The buffer owned by the curve is reused
+    data = curve.evalpts.data
+    curve.evaluate(start=0.5)
+    res = [list(pt) for pt in curve.evalpts]
+    curve.evaluate(buffer=True, start=0.5)
+    assert curve.evalpts.data is data
+    assert curve.evalpts == res
+
+
+def test_evaluate_buffer_view(curve3d):
+    curve = curve3d
+    curve.evaluate(buffer=True)
+    pts = curve.evalpts
+    mv = memoryview(pts.view)
+    assert len(mv.tobytes()) == pts.size * pts.dimension * pts.data.itemsize
+    assert view_coordinates(mv) == [c for pt in pts for c in pt]
+    if sys.version_info[0] > 2:
+        assert mv.format == 'd'
+        assert mv.tolist() == [list(pt) for pt in pts]
+
+    # The view shares the storage of the buffer owned by the curve
+    pts.data[0] = 100.0
+    assert view_coordinates(mv)[0] == 100.0
+    if hasattr(mv, 'release'):
+        mv.release()
+
+
+def test_evaluate_out_surface(nurbs_surface):
+    surf = nurbs_surface
+    surf.evaluate()
+    res = [list(pt) for pt in surf.evalpts]
+
+    out = array('d', [0.0]) * (25 * 3)
+    surf.evaluate(out=out)
+    assert surf.evalpts.data is out
+    for pt, pt_res in zip(surf.evalpts, res):
+        assert abs(pt[0] - pt_res[0]) < GEOMDL_DELTA
+        assert abs(pt[1] - pt_res[1]) < GEOMDL_DELTA
+        assert abs(pt[2] - pt_res[2]) < GEOMDL_DELTA
+
+    with pytest.raises(ValueError):
+        surf.evaluate(out=array('d', [0.0]) * 10)
+
+
+def test_evaluate_to_file(nurbs_surface):
+    surf = nurbs_surface
+    surf.sample_size = 7
+    res = [list(pt) for pt in surf.evalpts]
+
+    fname = 'testing_buffers.bin'
+    with surf.evaluate_to_file(fname, tile_size=3) as points:
+        assert (points.size_u, points.size_v, points.dimension) == (7, 7, 3)
+        assert points == res
+        assert points.row(2)[0] == res[14]
+    with surf.evaluate_to_file(fname, tile_size=4, typecode='f') as points:
+        for pt, pt_res in zip(points, res):
+            assert abs(pt[0] - pt_res[0]) < GEOMDL_DELTA
+            assert abs(pt[1] - pt_res[1]) < GEOMDL_DELTA
+            assert abs(pt[2] - pt_res[2]) < GEOMDL_DELTA
+    os.remove(fname)
+
+
+def test_mapped_points_read_data(nurbs_surface):
+    surf = nurbs_surface
+    res = [list(pt) for pt in surf.evalpts]
+
+    # Python 2.x reads the points into the memory instead of mapping them
+    fname = 'testing_buffers_read.bin'
+    surf.evaluate_to_file(fname).close()
+    with buffers.MappedPoints(fname, 'r+') as points:
+        points._data = points._read_data()
+        assert isinstance(points.data, array)
+        assert points == res
+        assert points.row(1)[0] == res[5]
+
+        # The points in the memory are updated together with the file
+        points.write(1, [1.0, 2.0, 3.0])
+        assert points[1] == [1.0, 2.0, 3.0]
+    with buffers.MappedPoints(fname) as points:
+        assert points[1] == [1.0, 2.0, 3.0]
+        assert points[2] == res[2]
+    os.remove(fname)
+
+
+@pytest.mark.skipif(sys.version_info[0] < 3, reason="Python 2.x reads the points into the memory")
+def test_mapped_points_close_with_live_row(nurbs_surface):
+    surf = nurbs_surface
+    res = [list(pt) for pt in surf.evalpts]
+
+    fname = 'testing_buffers_close.bin'
+    points = surf.evaluate_to_file(fname)
+    row = points.row(1)
+    with pytest.raises(BufferError):
+        points.close()
+
+    # The file stays open and usable until the row is released
+    assert points == res
+    assert row[0] == res[5]
+    del row
+    points.close()
+    points.close()
+    os.remove(fname)
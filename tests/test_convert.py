@@ -7,7 +7,11 @@
 """
 
 from geomdl import BSpline
+from geomdl import NURBS
 from geomdl import convert
+from geomdl import evaluators
+
+GEOMDL_DELTA = 10e-6
 
 
 SAMPLE_SIZE = 5
@@ -74,3 +78,66 @@ def test_convert_surface():
     assert surf_nurbs.rational
     assert surf_nurbs.evalpts == res
     assert surf_nurbs.weights == tuple(res_weights)
+
+
+def test_convert_curve_nonrational_path():
+    curve_bs = BSpline.Curve()
+    curve_bs.degree = C_DEGREE
+    curve_bs.ctrlpts = C_CTRLPTS
+    curve_bs.knotvector = C_KV
+
+    curve_nurbs = convert.bspline_to_nurbs(curve_bs)
+
+    # All weights are 1.0, the curve must be evaluated by the non-rational evaluator
+    evaluator, ctrlpts, dimension = curve_nurbs._evaluation_data()
+    assert type(evaluator) is evaluators.CurveEvaluator
+    assert dimension == 3
+
+    for res, expected in zip(curve_nurbs.derivatives(0.3, 2), curve_bs.derivatives(0.3, 2)):
+        assert abs(res[0] - expected[0]) < GEOMDL_DELTA
+        assert abs(res[1] - expected[1]) < GEOMDL_DELTA
+        assert abs(res[2] - expected[2]) < GEOMDL_DELTA
+
+
+def test_nurbs_curve_uniform_weights():
+    curve = NURBS.Curve()
+    curve.degree = C_DEGREE
+    curve.ctrlptsw = [[2.0 * c for c in pt] + [2.0] for pt in C_CTRLPTS]
+    curve.knotvector = C_KV
+    curve.evaluator = 'sequential'
+
+    # Equal weights other than 1.0 also use the non-rational evaluator
+    assert isinstance(curve._evaluation_data()[0], evaluators.CurveEvaluator)
+    assert not isinstance(curve._evaluation_data()[0], evaluators.NURBSCurveEvaluator)
+    pt = curve.curvept(0.25)
+    assert abs(pt[0] - 1.4375) < GEOMDL_DELTA
+    assert abs(pt[1] - 1.0625) < GEOMDL_DELTA
+    assert abs(pt[2] + 0.375) < GEOMDL_DELTA
+
+    # Changing the weights switches back to the rational evaluator
+    curve.weights = [1.0, 0.5, 1.0]
+    assert isinstance(curve._evaluation_data()[0], evaluators.NURBSCurveEvaluator)
+
+
+def test_convert_surface_nonrational_path():
+    surf_bs = BSpline.Surface()
+    surf_bs.degree_u = S_DEGREE_U
+    surf_bs.degree_v = S_DEGREE_V
+    surf_bs.ctrlpts_size_u = 3
+    surf_bs.ctrlpts_size_v = 3
+    surf_bs.ctrlpts = S_CTRLPTS
+    surf_bs.knotvector_u = S_KV_U
+    surf_bs.knotvector_v = S_KV_V
+
+    surf_nurbs = convert.bspline_to_nurbs(surf_bs)
+
+    evaluator, ctrlpts, dimension = surf_nurbs._evaluation_data()
+    assert type(evaluator) is evaluators.SurfaceEvaluator
+    assert dimension == 3
+
+    res = surf_nurbs.derivatives(0.2, 0.7, 1)
+    expected = surf_bs.derivatives(0.2, 0.7, 1)
+    for k, l in ((0, 0), (0, 1), (1, 0)):
+        assert abs(res[k][l][0] - expected[k][l][0]) < GEOMDL_DELTA
+        assert abs(res[k][l][1] - expected[k][l][1]) < GEOMDL_DELTA
+        assert abs(res[k][l][2] - expected[k][l][2]) < GEOMDL_DELTA
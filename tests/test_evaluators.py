@@ -0,0 +1,66 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.evaluators module. Requires "pytest" to run.
+"""
+
+import os
+import pytest
+from geomdl import evaluators
+
+FILE_NAME = 'testing_evaluators.json'
+
+
+def test_registry():
+    for kind in evaluators.KINDS:
+        assert evaluators.evaluator_names(kind) == ['auto', 'parallel', 'sequential']
+    assert isinstance(evaluators.get_evaluator('sequential', 'nurbs_curve'), evaluators.NURBSCurveEvaluator)
+    assert evaluators.get_evaluator('auto', 'surface').kind == 'surface'
+    with pytest.raises(ValueError):
+        evaluators.get_evaluator('unknown', 'curve')
+    with pytest.raises(ValueError):
+        evaluators.register_evaluator('sequential', 'volume', evaluators.CurveEvaluator)
+
+
+def test_evaluator_by_name(nurbs_curve2d):
+    curve = nurbs_curve2d
+    assert type(curve.evaluator) is evaluators.NURBSCurveEvaluator
+    curve.evaluator = 'auto'
+    assert curve.evaluator.name == "Auto NURBS Curve Evaluator"
+    curve.evaluator = 'sequential'
+    assert isinstance(curve.evaluator, evaluators.NURBSCurveEvaluator)
+    with pytest.raises(ValueError):
+        curve.evaluator = 'unknown'
+
+
+def test_parallel_curve(nurbs_curve2d):
+    curve = nurbs_curve2d
+    curve.evaluate()
+    evalpts = [list(pt) for pt in curve.evalpts]
+    curve.evaluator = evaluators.NURBSCurveEvaluatorParallel(processes=2)
+    curve.evaluate()
+    assert curve.evalpts == evalpts
+
+
+def test_parallel_surface(surface):
+    surf = surface
+    surf.evaluate()
+    evalpts = [list(pt) for pt in surf.evalpts]
+    surf.evaluator = evaluators.SurfaceEvaluatorParallel(processes=2)
+    surf.evaluate()
+    assert surf.evalpts == evalpts
+
+
+def test_auto_select():
+    evaluator = evaluators.AutoEvaluator('curve')
+    assert evaluator.select(knots=[0.5], degree=3, dimension=3) == 'sequential'
+
+
+def test_calibration_save_load():
+    data = dict(evaluators.calibration())
+    evaluators.save_calibration(FILE_NAME)
+    evaluators.load_calibration(FILE_NAME)
+    assert evaluators.calibration() == data
+    os.remove(FILE_NAME)
@@ -0,0 +1,138 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.exchange module. Requires "pytest" to run.
+"""
+
+import os
+import struct
+from geomdl import exchange
+
+GEOMDL_DELTA = 10e-6
+FILE_NAME = 'testing_exchange'
+
+
+def test_export_vtk_surface_ascii(surface):
+    surf = surface
+    fname = FILE_NAME + '.vtk'
+    exchange.export_vtk(surf, fname, point_data=('params', 'normals'))
+
+    with open(fname, 'r') as fp:
+        content = fp.read().splitlines()
+    os.remove(fname)
+
+    assert content[3] == "DATASET STRUCTURED_GRID"
+    assert content[4] == "DIMENSIONS 5 5 1"
+    assert content[5] == "POINTS 25 float"
+    assert [float(c) for c in content[6].split()] == surf.evalpts[0]
+    assert "POINT_DATA 25" in content
+    assert "SCALARS params float 2" in content
+    assert "NORMALS normals float" in content
+
+
+def test_export_vtk_surface_params_subrange(surface):
+    surf = surface
+    surf.sample_size = 3
+    surf.evaluate(start_u=0.25, stop_u=0.75, stop_v=0.5)
+    fname = FILE_NAME + '.vtk'
+    exchange.export_vtk(surf, fname, point_data=('params',))
+
+    with open(fname, 'r') as fp:
+        content = fp.read().splitlines()
+    os.remove(fname)
+
+    # The parameters must belong to the evaluated points of the sub-range
+    idx = content.index("SCALARS params float 2") + 2
+    params = [[float(c) for c in line.split()] for line in content[idx:idx + 9]]
+    points = [[float(c) for c in line.split()] for line in content[6:15]]
+    assert params[-1] == [0.75, 0.5]
+    for (u, v), pt in zip(params, points):
+        res = surf.surfpt(u, v)
+        assert abs(pt[0] - res[0]) < GEOMDL_DELTA
+        assert abs(pt[1] - res[1]) < GEOMDL_DELTA
+        assert abs(pt[2] - res[2]) < GEOMDL_DELTA
+
+
+def test_export_vtk_surface_binary(surface):
+    surf = surface
+    fname = FILE_NAME + '.vtk'
+    exchange.export_vtk(surf, fname, binary=True)
+
+    with open(fname, 'rb') as fp:
+        content = fp.read()
+    os.remove(fname)
+
+    header = b"POINTS 25 float\n"
+    idx = content.index(header) + len(header)
+    data = struct.unpack('>75f', content[idx:idx + 300])
+    for res, evalpt in zip([data[i:i + 3] for i in range(0, 75, 3)], surf.evalpts):
+        assert abs(res[0] - evalpt[0]) < 1e-5
+        assert abs(res[1] - evalpt[1]) < 1e-5
+        assert abs(res[2] - evalpt[2]) < 1e-5
+
+
+def test_export_vtk_curve_binary(curve2d):
+    curve = curve2d
+    fname = FILE_NAME + '.vtk'
+    exchange.export_vtk(curve, fname, binary=True, user_data={'index': list(range(curve.sample_size))})
+
+    with open(fname, 'rb') as fp:
+        content = fp.read()
+    os.remove(fname)
+
+    assert b"DATASET POLYDATA" in content
+    header = b"LINES 1 6\n"
+    idx = content.index(header) + len(header)
+    assert struct.unpack('>6i', content[idx:idx + 24]) == (5, 0, 1, 2, 3, 4)
+    assert b"SCALARS index float 1" in content
+
+
+def test_export_vtk_xml_surface(surface):
+    surf = surface
+    fname = FILE_NAME + '.vts'
+    exchange.export_vtk_xml(surf, fname, point_data=('curvature',))
+
+    with open(fname, 'rb') as fp:
+        content = fp.read()
+    os.remove(fname)
+
+    assert b'type="StructuredGrid"' in content
+    assert b'WholeExtent="0 4 0 4 0 0"' in content
+
+    # First appended block is the points array, the second one is the curvature array
+    idx = content.index(b'<AppendedData encoding="raw">\n_') + 31
+    size = struct.unpack('<I', content[idx:idx + 4])[0]
+    assert size == 25 * 3 * 4
+    data = struct.unpack('<3f', content[idx + 4:idx + 16])
+    assert abs(data[0] - surf.evalpts[0][0]) < 1e-5
+    assert abs(data[2] - surf.evalpts[0][2]) < 1e-5
+    idx += 4 + size
+    size = struct.unpack('<I', content[idx:idx + 4])[0]
+    assert size == 25 * 4
+
+
+def test_export_mapped_points(surface):
+    surf = surface
+    fname = FILE_NAME + '.vtk'
+    fname_mapped = FILE_NAME + '_mapped.vtk'
+    fname_points = FILE_NAME + '.bin'
+    with surf.evaluate_to_file(fname_points, tile_size=2) as points:
+        exchange.export_vtk(surf, fname, binary=True)
+        exchange.export_vtk(points, fname_mapped, binary=True)
+        exchange.save_stl(points, FILE_NAME + '.stl', vertex_spacing=1)
+
+    with open(fname, 'rb') as fp:
+        content = fp.read()
+    with open(fname_mapped, 'rb') as fp:
+        content_mapped = fp.read()
+    with open(FILE_NAME + '.stl', 'rb') as fp:
+        content_stl = fp.read()
+    for fn in (fname, fname_mapped, fname_points, FILE_NAME + '.stl'):
+        os.remove(fn)
+
+    # Only the title lines are different
+    assert content.split(b"\n", 2)[2] == content_mapped.split(b"\n", 2)[2]
+    assert struct.unpack('<i', content_stl[80:84])[0] == 2 * 4 * 4
+    assert len(content_stl) == 84 + (2 * 4 * 4 * 50)
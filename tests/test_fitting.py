@@ -0,0 +1,130 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.fitting and geomdl.linalg modules. Requires "pytest" to run.
+"""
+
+from geomdl import fitting
+from geomdl import linalg
+
+GEOMDL_DELTA = 10e-6
+
+POINTS = [[0.0, 0.0, 0.0], [3.0, 4.0, 0.0], [-1.0, 4.0, 1.0], [-4.0, 0.0, 1.0], [-4.0, -3.0, 2.0], [1.0, -5.0, 2.0],
+          [5.0, -2.0, 3.0]]
+
+
+def test_banded_lu():
+    # Tridiagonal matrix [[4, 1, 0], [2, 5, 1], [0, 1, 3]]
+    band = linalg.band_matrix(3, 1, 1)
+    band[0][1:] = [4.0, 1.0]
+    band[1][:] = [2.0, 5.0, 1.0]
+    band[2][:2] = [1.0, 3.0]
+    lu = linalg.BandedLU(band, 1, 1)
+
+    res = lu.solve([5.0, 8.0, 4.0])
+    for r in res:
+        assert abs(r - 1.0) < GEOMDL_DELTA
+    res = lu.solve([[5.0, 6.0], [8.0, 15.0], [4.0, 11.0]])
+    for r in res:
+        assert abs(r[0] - 1.0) < GEOMDL_DELTA
+    assert abs(res[0][1] - 1.0) < GEOMDL_DELTA
+    assert abs(res[1][1] - 2.0) < GEOMDL_DELTA
+    assert abs(res[2][1] - 3.0) < GEOMDL_DELTA
+
+
+def test_compute_knot_vector():
+    params = fitting.compute_params_curve([[0.0, 0.0], [1.0, 0.0], [3.0, 0.0], [4.0, 0.0], [8.0, 0.0]])
+    assert params == [0.0, 0.125, 0.375, 0.5, 1.0]
+    params = fitting.compute_params_curve([[0.0, 0.0], [1.0, 0.0], [5.0, 0.0]], centripetal=True)
+    assert abs(params[1] - 1.0 / 3.0) < GEOMDL_DELTA
+    assert fitting.compute_knot_vector(2, 5, [0.0, 0.125, 0.375, 0.5, 1.0]) == \
+        [0.0, 0.0, 0.0, 0.25, 0.4375, 1.0, 1.0, 1.0]
+
+
+def test_interpolate_curve():
+    for centripetal in (False, True):
+        curve = fitting.interpolate_curve(POINTS, 3, centripetal=centripetal)
+        assert curve.degree == 3
+        assert len(curve.ctrlpts) == len(POINTS)
+        for u, pt in zip(fitting.compute_params_curve(POINTS, centripetal), POINTS):
+            evalpt = curve.curvept(u)
+            assert abs(evalpt[0] - pt[0]) < GEOMDL_DELTA
+            assert abs(evalpt[1] - pt[1]) < GEOMDL_DELTA
+            assert abs(evalpt[2] - pt[2]) < GEOMDL_DELTA
+
+
+def make_grid(size_u, size_v):
+    # Samples of a plane on a regular grid
+    return [[float(i) / (size_u - 1), float(j) / (size_v - 1), 2.0 * float(i) / (size_u - 1) - float(j) / (size_v - 1)]
+            for i in range(size_u) for j in range(size_v)]
+
+
+def test_interpolate_surface():
+    points = [[float(i), float(j), float((i * j) % 5)] for i in range(7) for j in range(6)]
+    surf = fitting.interpolate_surface(points, 7, 6, 3, 2)
+    assert surf.ctrlpts_size_u == 7
+    assert surf.ctrlpts_size_v == 6
+    params_u, params_v = fitting.compute_params_surface(points, 7, 6)
+    for i in range(7):
+        for j in range(6):
+            evalpt = surf.surfpt(params_u[i], params_v[j])
+            for k in range(3):
+                assert abs(evalpt[k] - points[i * 6 + j][k]) < GEOMDL_DELTA
+
+
+def test_interpolate_surface_weights():
+    points = [[float(i), float(j), float((i * j) % 5)] for i in range(5) for j in range(5)]
+    weights = [1.0 + 0.1 * (k % 4) for k in range(25)]
+    surf = fitting.interpolate_surface(points, 5, 5, 2, 2, weights=weights)
+    assert surf.rational
+    params_u, params_v = fitting.compute_params_surface(points, 5, 5)
+    for i in range(5):
+        for j in range(5):
+            evalpt = surf.surfpt(params_u[i], params_v[j])
+            for k in range(3):
+                assert abs(evalpt[k] - points[i * 5 + j][k]) < GEOMDL_DELTA
+
+
+def test_approximate_curve():
+    points = [[float(i), float(i % 3)] for i in range(30)]
+    curve = fitting.approximate_curve(points, 3, ctrlpts_size=8)
+    assert len(curve.ctrlpts) == 8
+    assert len(curve.knotvector) == 12
+
+    # Smoothing pulls the curve towards the mean line of the data
+    smooth = fitting.approximate_curve(points, 3, ctrlpts_size=8, smoothing=10.0)
+    deviation = max([abs(pt[1] - 1.0) for pt in curve.ctrlpts[2:-2]])
+    assert max([abs(pt[1] - 1.0) for pt in smooth.ctrlpts[2:-2]]) < deviation
+
+
+def test_approximate_surface():
+    points = make_grid(12, 10)
+    surf = fitting.approximate_surface(points, 12, 10, 2, 3, ctrlpts_size_u=6, ctrlpts_size_v=5)
+    assert surf.ctrlpts_size_u == 6
+    assert surf.ctrlpts_size_v == 5
+
+    # The plane is reproduced exactly
+    params_u, params_v = fitting.compute_params_surface(points, 12, 10)
+    for i in range(12):
+        for j in range(10):
+            evalpt = surf.surfpt(params_u[i], params_v[j])
+            assert abs(evalpt[0] - points[i * 10 + j][0]) < GEOMDL_DELTA
+            assert abs(evalpt[2] - points[i * 10 + j][2]) < GEOMDL_DELTA
+
+
+def test_approximate_surface_scattered():
+    params = [((i * 0.618034) % 1.0, (i * 0.754878) % 1.0) for i in range(200)]
+    points = [[u, v, u ** 2 - v] for u, v in params]
+    surf = fitting.approximate_surface_scattered(points, params, 2, 2, 5, 5)
+    for (u, v), pt in zip(params, points):
+        evalpt = surf.surfpt(u, v)
+        assert abs(evalpt[0] - pt[0]) < GEOMDL_DELTA
+        assert abs(evalpt[2] - pt[2]) < GEOMDL_DELTA
+
+    # Smoothing regularizes the empty knot spans
+    params = [(u * 0.5, v) for u, v in params]
+    points = [[u, v, u ** 2 - v] for u, v in params]
+    surf = fitting.approximate_surface_scattered(points, params, 2, 2, 8, 8, smoothing=1e-6)
+    assert abs(surf.surfpt(0.25, 0.5)[2] + 0.4375) < 0.001
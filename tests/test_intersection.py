@@ -0,0 +1,226 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.intersection module. Requires "pytest" to run.
+"""
+
+import math
+import random
+import pytest
+from geomdl import BSpline
+from geomdl import utilities
+from geomdl import intersection
+from geomdl import spatial
+
+GEOMDL_DELTA = 10e-6
+
+S_DEGREE_U = 3
+S_DEGREE_V = 3
+S_CTRLPTS = [[float(i), float(j), float((i * j) % 3) - 1.0] for i in range(6) for j in range(6)]
+S_KV_U = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+S_KV_V = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+
+C1_DEGREE = 2
+C1_CTRLPTS = [[0.0, 0.0], [1.0, 2.0], [2.0, -2.0], [3.0, 2.0], [4.0, 0.0]]
+C1_KV = [0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0]
+C2_CTRLPTS = [[0.0, 0.25], [4.0, 0.25]]
+C2_KV = [0.0, 0.0, 1.0, 1.0]
+
+# A plane at z = 0 and a parabolic cylinder z = 3x^2 - 1, which intersect at x = +/- 1 / sqrt(3)
+P_CTRLPTS = [[-1.0, -1.0, 0.0], [-1.0, 1.0, 0.0], [1.0, -1.0, 0.0], [1.0, 1.0, 0.0]]
+P_KV = [0.0, 0.0, 1.0, 1.0]
+PC_CTRLPTS = [[-1.0, -2.0, 1.0], [-1.0, 2.0, 1.0], [0.0, -2.0, -2.0], [0.0, 2.0, -2.0],
+              [1.0, -2.0, 1.0], [1.0, 2.0, 1.0]]
+PC_KV_U = [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+PC_KV_V = [0.0, 0.0, 1.0, 1.0]
+
+# Wavy surface crossing the plane z = 0 along the lines intersecting each other
+W_CTRLPTS = [[i / 9.0, j / 9.0, 0.2 * math.sin(i) * math.cos(j)] for i in range(10) for j in range(10)]
+W_KV = [0.0, 0.0, 0.0, 0.0, 1.0 / 7.0, 2.0 / 7.0, 3.0 / 7.0, 4.0 / 7.0, 5.0 / 7.0, 6.0 / 7.0, 1.0, 1.0, 1.0, 1.0]
+
+
+@pytest.fixture
+def bumpy_surface():
+    surf = BSpline.Surface()
+    surf.degree_u = S_DEGREE_U
+    surf.degree_v = S_DEGREE_V
+    surf.set_ctrlpts(S_CTRLPTS, 6, 6)
+    surf.knotvector_u = S_KV_U
+    surf.knotvector_v = S_KV_V
+    return surf
+
+
+@pytest.fixture
+def curves():
+    curve1 = BSpline.Curve()
+    curve1.degree = C1_DEGREE
+    curve1.ctrlpts = C1_CTRLPTS
+    curve1.knotvector = C1_KV
+    curve2 = BSpline.Curve()
+    curve2.degree = 1
+    curve2.ctrlpts = C2_CTRLPTS
+    curve2.knotvector = C2_KV
+    return curve1, curve2
+
+
+@pytest.fixture
+def planar_surfaces():
+    surf1 = BSpline.Surface()
+    surf1.degree_u = 1
+    surf1.degree_v = 1
+    surf1.set_ctrlpts(P_CTRLPTS, 2, 2)
+    surf1.knotvector_u = P_KV
+    surf1.knotvector_v = P_KV
+    surf2 = BSpline.Surface()
+    surf2.degree_u = 2
+    surf2.degree_v = 1
+    surf2.set_ctrlpts(PC_CTRLPTS, 3, 2)
+    surf2.knotvector_u = PC_KV_U
+    surf2.knotvector_v = PC_KV_V
+    return surf1, surf2
+
+
+def test_ray_box_intersection():
+    bbox = [(0.0, 0.0, 0.0), (1.0, 1.0, 1.0)]
+    assert spatial.ray_box_intersection([-1.0, 0.5, 0.5], [1.0, 0.0, 0.0], bbox) == (1.0, 2.0)
+    assert spatial.ray_box_intersection([-1.0, 1.5, 0.5], [1.0, 0.0, 0.0], bbox) is None
+    assert spatial.ray_box_intersection([2.0, 0.5, 0.5], [1.0, 0.0, 0.0], bbox) is None
+
+
+def test_bvh_ray_order():
+    bboxes = [[(float(i), 0.0, 0.0), (i + 0.5, 1.0, 1.0)] for i in range(10)]
+    bvh = spatial.BoundingVolumeHierarchy(bboxes, leaf_size=2)
+
+    res = list(bvh.ray_intersect([10.0, 0.5, 0.5], [-1.0, 0.0, 0.0]))
+    assert [idx for _, idx in res] == list(range(9, -1, -1))
+    assert abs(res[0][0] - 0.5) < GEOMDL_DELTA
+
+
+def test_surface_ray_cast(bumpy_surface):
+    surf = bumpy_surface
+    caster = intersection.SurfaceRayCaster(surf)
+    assert len(caster.bvh) == 9
+
+    # Vertical rays hit the surface at the points with the same x and y coordinates
+    for u, v in ((0.1, 0.2), (0.5, 0.5), (0.9, 0.7)):
+        evalpt = surf.surfpt(u, v)
+        hit = caster.intersect([evalpt[0], evalpt[1], 10.0], [0.0, 0.0, -1.0])
+        assert abs(hit[0] - (10.0 - evalpt[2])) < GEOMDL_DELTA
+        assert abs(hit[1][0] - u) < GEOMDL_DELTA
+        assert abs(hit[1][1] - v) < GEOMDL_DELTA
+        assert abs(hit[2][2] - evalpt[2]) < GEOMDL_DELTA
+        normal = surf.normal(u, v)[1]
+        assert abs(abs(sum([n1 * n2 for n1, n2 in zip(hit[3], normal)])) - 1.0) < GEOMDL_DELTA
+
+
+def test_surface_ray_cast_oblique():
+    rng = random.Random(0)
+    surf = BSpline.Surface()
+    surf.degree_u = 3
+    surf.degree_v = 3
+    surf.set_ctrlpts([[float(i), float(j), rng.uniform(-1.5, 1.5)] for i in range(12) for j in range(12)], 12, 12)
+    surf.knotvector_u = utilities.generate_knot_vector(3, 12)
+    surf.knotvector_v = utilities.generate_knot_vector(3, 12)
+    caster = intersection.SurfaceRayCaster(surf)
+
+    # Each ray passes through a known surface point at t = 5, the closest hit cannot be farther
+    for _ in range(500):
+        u, v = rng.random(), rng.random()
+        evalpt = surf.surfpt(u, v)
+        direction = utilities.vector_normalize([rng.uniform(-1.0, 1.0), rng.uniform(-1.0, 1.0),
+                                                rng.uniform(-1.0, -0.2)])
+        origin = [p - (5.0 * d) for p, d in zip(evalpt, direction)]
+        hit = caster.intersect(origin, direction)
+        assert hit is not None
+        assert hit[0] < 5.0 + GEOMDL_DELTA
+        for res, pt, o, d in zip(hit[2], surf.surfpt(hit[1][0], hit[1][1]), origin, direction):
+            assert abs(res - pt) < GEOMDL_DELTA
+            assert abs(res - (o + (hit[0] * d))) < GEOMDL_DELTA
+        if hit[0] > 5.0 - GEOMDL_DELTA:
+            assert abs(hit[1][0] - u) < GEOMDL_DELTA
+            assert abs(hit[1][1] - v) < GEOMDL_DELTA
+
+
+def test_surface_ray_cast_miss(bumpy_surface):
+    surf = bumpy_surface
+    hits = intersection.ray_cast(surf, [([2.0, 2.0, 10.0], [0.0, 0.0, 1.0]), ([8.0, 8.0, 10.0], [0.0, 0.0, -1.0])])
+    assert hits == [None, None]
+
+
+def test_intersect_curves(curves):
+    curve1, curve2 = curves
+    results = intersection.intersect_curves(curve1, curve2)
+    assert len(results) == 4
+    for u1, u2, pt in results:
+        assert abs(pt[1] - 0.25) < GEOMDL_DELTA
+        assert abs(curve1.curvept(u1)[0] - curve2.curvept(u2)[0]) < GEOMDL_DELTA
+        assert abs(curve1.curvept(u1)[1] - 0.25) < GEOMDL_DELTA
+
+
+def test_intersect_curves_miss(curves):
+    curve1, curve2 = curves
+    curve2.ctrlpts = [[0.0, 5.0], [4.0, 5.0]]
+    assert intersection.intersect_curves(curve1, curve2) == []
+
+
+def test_intersect_surfaces(planar_surfaces):
+    surf1, surf2 = planar_surfaces
+    curves = intersection.intersect_surfaces(surf1, surf2)
+    assert len(curves) == 2
+    for curve in curves:
+        # Each intersection curve is a line crossing the domain of the plane
+        assert abs(abs(curve[0][0][1]) - 1.0) < GEOMDL_DELTA
+        assert abs(abs(curve[-1][0][1]) - 1.0) < GEOMDL_DELTA
+        for pt, uv1, uv2 in curve:
+            assert abs(abs(pt[0]) - (1.0 / 3.0) ** 0.5) < GEOMDL_DELTA
+            assert abs(pt[2]) < GEOMDL_DELTA
+            assert abs(surf2.surfpt(uv2[0], uv2[1])[2]) < GEOMDL_DELTA
+
+
+def test_intersect_surfaces_closed(planar_surfaces):
+    surf1, surf2 = planar_surfaces
+    surf1.set_ctrlpts([[-1.0, -1.0, 2.0], [-1.0, 0.0, 0.0], [-1.0, 1.0, 2.0], [0.0, -1.0, 0.0], [0.0, 0.0, -2.0],
+                       [0.0, 1.0, 0.0], [1.0, -1.0, 2.0], [1.0, 0.0, 0.0], [1.0, 1.0, 2.0]], 3, 3)
+    surf1.degree_u = 2
+    surf1.degree_v = 2
+    surf1.knotvector_u = [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+    surf1.knotvector_v = [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+    surf2.degree_u = 1
+    surf2.set_ctrlpts([[-2.0, -2.0, 0.5], [-2.0, 2.0, 0.5], [2.0, -2.0, 0.5], [2.0, 2.0, 0.5]], 2, 2)
+    surf2.knotvector_u = [0.0, 0.0, 1.0, 1.0]
+    curves = intersection.intersect_surfaces(surf1, surf2)
+    assert len(curves) == 1
+    assert curves[0][0] == curves[0][-1]
+    for pt, uv1, uv2 in curves[0]:
+        assert abs(surf1.surfpt(uv1[0], uv1[1])[2] - 0.5) < GEOMDL_DELTA
+
+
+def test_intersect_surfaces_wavy():
+    surf1 = BSpline.Surface()
+    surf1.degree_u = 3
+    surf1.degree_v = 3
+    surf1.set_ctrlpts(W_CTRLPTS, 10, 10)
+    surf1.knotvector_u = W_KV
+    surf1.knotvector_v = W_KV
+    surf2 = BSpline.Surface()
+    surf2.degree_u = 1
+    surf2.degree_v = 1
+    surf2.set_ctrlpts([[-0.5, -0.5, 0.0], [-0.5, 1.5, 0.0], [1.5, -0.5, 0.0], [1.5, 1.5, 0.0]], 2, 2)
+    surf2.knotvector_u = [0.0, 0.0, 1.0, 1.0]
+    surf2.knotvector_v = [0.0, 0.0, 1.0, 1.0]
+    curves = intersection.intersect_surfaces(surf1, surf2)
+
+    # The marching must not oscillate at the crossings of the intersection curves
+    assert 0 < len(curves) <= 10
+    for curve in curves:
+        assert len(curve) < 100
+        pts = [pt for pt, uv1, uv2 in curve]
+        assert len(set([tuple(pt) for pt in pts])) == len(pts)
+        length = sum([utilities.vector_magnitude([c2 - c1 for c1, c2 in zip(pt1, pt2)])
+                      for pt1, pt2 in zip(pts[0:-1], pts[1:])])
+        assert length < 2.0
+        for pt, uv1, uv2 in curve:
+            assert abs(pt[2]) < GEOMDL_DELTA
+            assert abs(surf1.surfpt(uv1[0], uv1[1])[2]) < GEOMDL_DELTA
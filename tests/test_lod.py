@@ -0,0 +1,78 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.lod module. Requires "pytest" to run.
+"""
+
+import copy
+import pytest
+from geomdl import Multi
+
+GEOMDL_DELTA = 10e-6
+
+
+def check_level(surf, points):
+    surf.sample_size = points.size_u
+    surf.evaluate()
+    assert len(points) == len(surf.evalpts)
+    for res, ref in zip(points, surf.evalpts):
+        for r, e in zip(res, ref):
+            assert abs(r - e) < GEOMDL_DELTA
+
+
+def test_pyramid_sample_size(nurbs_surface):
+    pyramid = nurbs_surface.pyramid(base_size=9)
+    assert pyramid.min_level == -3
+    assert [pyramid.sample_size(level) for level in range(-3, 3)] == [2, 3, 5, 9, 17, 33]
+    assert pyramid.select_level(10) == 1
+    assert pyramid.select_level(9) == 0
+    with pytest.raises(ValueError):
+        pyramid.sample_size(-4)
+
+
+@pytest.mark.parametrize("level", [-3, -1, 0, 1, 2])
+def test_pyramid_level(level, nurbs_surface):
+    surf = nurbs_surface
+    pyramid = surf.pyramid(base_size=9)
+    points = pyramid.level(level)
+    assert points.level == level
+    assert points.size_u == pyramid.sample_size(level)
+    check_level(surf, points)
+
+
+def test_pyramid_reuse(nurbs_surface):
+    surf = nurbs_surface
+    pyramid = surf.pyramid(base_size=5)
+    fine = pyramid.level(2)
+    assert len(pyramid) == 3
+    assert pyramid.level(2) is fine
+
+    # The coarser levels are generated from the base level
+    pyramid.level(-1)
+    assert len(pyramid) == 4
+
+
+def test_pyramid_invalidate(nurbs_surface):
+    surf = nurbs_surface
+    pyramid = surf.pyramid(base_size=5)
+    pyramid.level(1)
+    surf.weights = [1.0] * 9
+    points = pyramid.level(0)
+
+    assert len(pyramid) == 1
+    check_level(surf, points)
+
+
+def test_multi_pyramid(nurbs_surface):
+    surf1 = nurbs_surface
+    surf2 = copy.deepcopy(nurbs_surface)
+    surf2.weights = [1.0] * 9
+    msurf = Multi.MultiSurface()
+    msurf.add_list([surf1, surf2])
+    levels = msurf.pyramid(base_size=5).level(1)
+
+    assert len(levels) == 2
+    check_level(surf1, levels[0])
+    check_level(surf2, levels[1])
@@ -0,0 +1,122 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.prepared module. Requires "pytest" to run.
+"""
+
+import pytest
+from geomdl import NURBS
+
+GEOMDL_DELTA = 10e-6
+PARAMS = [0.0, 0.1, 0.33, 0.5, 0.66, 0.9, 1.0]
+
+C_DEGREE = 3
+C_CTRLPTSW = [[5.0, 5.0, 0.5], [10.0, 10.0, 1.0], [20.0, 15.0, 0.1], [35.0, 15.0, 0.25], [45.0, 10.0, 1.0],
+              [50.0, 5.0, 1.0], [55.0, 15.0, 0.5]]
+C_KV = [0.0, 0.0, 0.0, 0.0, 0.25, 0.5, 0.75, 1.0, 1.0, 1.0, 1.0]
+
+
+@pytest.fixture
+def curve():
+    crv = NURBS.Curve()
+    crv.degree = C_DEGREE
+    crv.ctrlptsw = C_CTRLPTSW
+    crv.knotvector = C_KV
+    return crv
+
+
+def test_prepared_curve(curve):
+    evaluator = curve.prepare()
+    for u in PARAMS:
+        pt = evaluator(u)
+        res = curve.curvept(u)
+        assert abs(pt[0] - res[0]) < GEOMDL_DELTA
+        assert abs(pt[1] - res[1]) < GEOMDL_DELTA
+
+        ders = evaluator.derivatives(u, order=4)
+        res = curve.derivatives(u, order=4)
+        assert len(ders) == 5
+        for k in range(5):
+            assert abs(ders[k][0] - res[k][0]) < GEOMDL_DELTA * (1.0 + abs(res[k][0]))
+            assert abs(ders[k][1] - res[k][1]) < GEOMDL_DELTA * (1.0 + abs(res[k][1]))
+
+
+def test_prepared_curve_update(curve):
+    evaluator = curve.prepare()
+    pt = evaluator(0.4)
+    curve.ctrlptsw = [[x + w, y + (2.0 * w), w] for x, y, w in curve.ctrlptsw]
+    assert abs(evaluator(0.4)[0] - pt[0] - 1.0) < GEOMDL_DELTA
+    assert abs(evaluator(0.4)[1] - pt[1] - 2.0) < GEOMDL_DELTA
+
+    # Knot insertion does not change the shape of the curve
+    curve.insert_knot(0.4)
+    res = curve.curvept(0.4)
+    assert abs(evaluator(0.4)[0] - res[0]) < GEOMDL_DELTA
+    assert abs(evaluator(0.4)[1] - res[1]) < GEOMDL_DELTA
+
+
+def test_polynomial_curve(curve):
+    evaluator = curve.prepare(polynomial=True)
+    for u in PARAMS:
+        pt = evaluator(u)
+        res = curve.curvept(u)
+        assert abs(pt[0] - res[0]) < GEOMDL_DELTA
+        assert abs(pt[1] - res[1]) < GEOMDL_DELTA
+
+        ders = evaluator.derivatives(u, order=4)
+        res = curve.derivatives(u, order=4)
+        for k in range(5):
+            assert abs(ders[k][0] - res[k][0]) < GEOMDL_DELTA * (1.0 + abs(res[k][0]))
+            assert abs(ders[k][1] - res[k][1]) < GEOMDL_DELTA * (1.0 + abs(res[k][1]))
+
+    # The cached span coefficients are discarded after modifying the curve
+    curve.ctrlptsw = [[x + w, y + (2.0 * w), w] for x, y, w in curve.ctrlptsw]
+    for u in PARAMS:
+        pt = evaluator(u)
+        res = curve.curvept(u)
+        assert abs(pt[0] - res[0]) < GEOMDL_DELTA
+        assert abs(pt[1] - res[1]) < GEOMDL_DELTA
+
+
+def test_prepared_surface(surface, nurbs_surface):
+    for surf in (surface, nurbs_surface):
+        evaluator = surf.prepare()
+        for u in PARAMS:
+            for v in PARAMS:
+                pt = evaluator(u, v)
+                res = surf.surfpt(u, v)
+                assert len(pt) == len(res)
+                for c1, c2 in zip(pt, res):
+                    assert abs(c1 - c2) < GEOMDL_DELTA
+
+                ders = evaluator.derivatives(u, v, order=1)
+                res = surf.derivatives(u, v, order=1)
+                for k, l in ((0, 0), (1, 0), (0, 1)):
+                    for c1, c2 in zip(ders[k][l], res[k][l]):
+                        assert abs(c1 - c2) < GEOMDL_DELTA
+
+
+def test_polynomial_surface(surface, nurbs_surface):
+    for surf in (surface, nurbs_surface):
+        evaluator = surf.prepare(polynomial=True)
+        reference = surf.prepare()
+        for u in PARAMS:
+            for v in PARAMS:
+                pt = evaluator(u, v)
+                res = surf.surfpt(u, v)
+                assert len(pt) == len(res)
+                for c1, c2 in zip(pt, res):
+                    assert abs(c1 - c2) < GEOMDL_DELTA
+
+                ders = evaluator.derivatives(u, v, order=2)
+                res = reference.derivatives(u, v, order=2)
+                for k, l in ((0, 0), (1, 0), (0, 1), (1, 1), (2, 0), (0, 2)):
+                    for c1, c2 in zip(ders[k][l], res[k][l]):
+                        assert abs(c1 - c2) < GEOMDL_DELTA * (1.0 + abs(c2))
+
+        # The cached patch coefficients are discarded after modifying the surface
+        surf.set_ctrlpts([[pt[0], pt[1], pt[2] + 1.0] + list(pt[3:]) for pt in surf.ctrlpts], 3, 3)
+        for c1, c2 in zip(evaluator(0.3, 0.6), surf.surfpt(0.3, 0.6)):
+            assert abs(c1 - c2) < GEOMDL_DELTA
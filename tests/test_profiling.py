@@ -0,0 +1,54 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.profiling module. Requires "pytest" to run.
+"""
+
+from geomdl import helpers
+from geomdl import evaluators
+from geomdl import profiling
+
+
+def test_profile_evaluate(nurbs_curve2d):
+    curve = nurbs_curve2d
+    with profiling.profile() as prof:
+        assert prof.active
+        curve.evaluate()
+    assert not prof.active
+    stat = prof.stats['evaluators.NURBSCurveEvaluator.evaluate']
+    assert stat.calls == 1
+    assert stat.points == curve.sample_size
+    assert stat.self_time <= stat.total_time
+    # The rational division excludes the time spent in the B-Spline evaluator
+    assert prof.stats['evaluators.CurveEvaluator.evaluate'].total_time <= stat.total_time
+    assert prof.stats['helpers.find_spans'].points == curve.sample_size
+    assert set(prof.phases().keys()) == {'span', 'basis', 'evaluate', 'rational'}
+    assert 'evaluators.NURBSCurveEvaluator.evaluate' in prof.report()
+
+
+def test_profile_counters(plane):
+    surf = plane
+    with profiling.profile() as prof:
+        surf.quadrature()
+        surf.quadrature()
+    assert prof.counters['cache.quadrature.misses'] == 1
+    assert prof.counters['cache.quadrature.hits'] == 1
+
+
+def test_profile_disabled(nurbs_curve2d):
+    find_spans = helpers.find_spans
+    evaluate = evaluators.CurveEvaluator.__dict__['evaluate']
+    outer = profiling.Profiler()
+    outer.start()
+    with profiling.profile() as inner:
+        nurbs_curve2d.evaluate()
+    assert helpers.find_spans is not find_spans
+    outer.stop()
+
+    # Instrumentation is removed after stopping the last profiler
+    assert helpers.find_spans is find_spans
+    assert evaluators.CurveEvaluator.__dict__['evaluate'] is evaluate
+    nurbs_curve2d.evaluate()
+    assert outer.stats['helpers.find_spans'].calls == inner.stats['helpers.find_spans'].calls
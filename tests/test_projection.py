@@ -0,0 +1,92 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.projection and geomdl.spatial modules. Requires "pytest" to run.
+"""
+
+import pytest
+from geomdl import BSpline
+from geomdl import projection
+from geomdl import spatial
+
+GEOMDL_DELTA = 10e-6
+
+C_DEGREE = 3
+C_CTRLPTS = [[5.0, 5.0, 0.0], [10.0, 10.0, 5.0], [20.0, 15.0, 10.0], [35.0, 15.0, 5.0], [45.0, 10.0, 0.0],
+             [50.0, 5.0, -5.0]]
+C_KV = [0.0, 0.0, 0.0, 0.0, 0.33, 0.66, 1.0, 1.0, 1.0, 1.0]
+
+
+@pytest.fixture
+def curve():
+    crv = BSpline.Curve()
+    crv.degree = C_DEGREE
+    crv.ctrlpts = C_CTRLPTS
+    crv.knotvector = C_KV
+    return crv
+
+
+def test_kdtree_nearest():
+    points = [[float(i), float(j), float((i * j) % 7)] for i in range(10) for j in range(10)]
+    tree = spatial.KDTree(points, leaf_size=4)
+
+    for query in ([0.2, 0.1, 0.0], [4.6, 7.2, 3.1], [12.0, -3.0, 8.0]):
+        dists = [sum([(c1 - c2) ** 2 for c1, c2 in zip(pt, query)]) ** 0.5 for pt in points]
+        idx, dist = tree.nearest(query)
+        assert abs(dist - min(dists)) < GEOMDL_DELTA
+        assert abs(dists[idx] - dist) < GEOMDL_DELTA
+
+
+def test_curve_projection_on_curve(curve):
+    projector = projection.CurveProjector(curve)
+
+    for u in (0.0, 0.15, 0.5, 0.77, 1.0):
+        res = projector.project(curve.curvept(u))
+        assert abs(res[0] - u) < GEOMDL_DELTA
+        assert res[2] < GEOMDL_DELTA
+
+
+def test_curve_projection_offset(curve):
+    u = 0.4
+    ders = curve.derivatives(u, order=1)
+
+    # Offset the curve point along a direction orthogonal to the tangent
+    normal = [-ders[1][1], ders[1][0], 0.0]
+    mag = sum([c ** 2 for c in normal]) ** 0.5
+    point = [c + (0.5 * n / mag) for c, n in zip(ders[0], normal)]
+
+    res = projection.project_points(curve, [point])[0]
+    assert abs(res[0] - u) < GEOMDL_DELTA
+    assert abs(res[2] - 0.5) < GEOMDL_DELTA
+
+
+def test_surface_projection_on_surface(surface):
+    projector = projection.SurfaceProjector(surface)
+
+    params = [(0.1, 0.2), (0.5, 0.5), (0.8, 0.3), (0.0, 1.0)]
+    results = projector.project_points([surface.surfpt(u, v) for u, v in params])
+    for (u, v), res in zip(params, results):
+        assert abs(res[0][0] - u) < GEOMDL_DELTA
+        assert abs(res[0][1] - v) < GEOMDL_DELTA
+        assert res[2] < GEOMDL_DELTA
+
+
+def test_surface_projection_boundary(surface):
+    projector = projection.SurfaceProjector(surface)
+
+    # Closest point lies on the u = 0 boundary
+    res = projector.project([-1.0, 1.0, 0.0])
+    assert abs(res[0][0]) < GEOMDL_DELTA
+    assert abs(res[1][0]) < GEOMDL_DELTA
+
+
+def test_projection_warm_start(surface):
+    projector = projection.SurfaceProjector(surface)
+
+    points = [[0.5 + (0.01 * i), 0.5, 1.0] for i in range(50)]
+    results = projector.project_points(points)
+    for point, res in zip(points, results):
+        res_cold = projector.project(point)
+        assert abs(res[2] - res_cold[2]) < GEOMDL_DELTA
@@ -0,0 +1,118 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.quadrature module. Requires "pytest" to run.
+"""
+
+import pytest
+from geomdl import BSpline
+from geomdl import NURBS
+from geomdl import quadrature
+
+GEOMDL_DELTA = 10e-6
+
+# Quarter of a cylinder with radius 1 and height 2
+CYL_W = 0.5 ** 0.5
+CYL_DEGREE_U = 2
+CYL_DEGREE_V = 1
+CYL_CTRLPTSW = [[1.0, 0.0, 0.0, 1.0], [1.0, 0.0, 2.0, 1.0],
+                [CYL_W, CYL_W, 0.0, CYL_W], [CYL_W, CYL_W, 2.0 * CYL_W, CYL_W],
+                [0.0, 1.0, 0.0, 1.0], [0.0, 1.0, 2.0, 1.0]]
+CYL_KV_U = [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+CYL_KV_V = [0.0, 0.0, 1.0, 1.0]
+
+
+@pytest.fixture
+def cylinder():
+    surf = NURBS.Surface()
+    surf.degree_u = CYL_DEGREE_U
+    surf.degree_v = CYL_DEGREE_V
+    surf.set_ctrlpts(CYL_CTRLPTSW, 3, 2)
+    surf.knotvector_u = CYL_KV_U
+    surf.knotvector_v = CYL_KV_V
+    return surf
+
+
+def test_gauss_legendre():
+    points, weights = quadrature.gauss_legendre(3)
+    assert abs(points[0] + 0.6 ** 0.5) < GEOMDL_DELTA
+    assert abs(points[1]) < GEOMDL_DELTA
+    assert abs(weights[0] - 5.0 / 9.0) < GEOMDL_DELTA
+    assert abs(weights[1] - 8.0 / 9.0) < GEOMDL_DELTA
+
+    # n-point rule integrates polynomials up to degree 2n - 1 exactly
+    assert abs(quadrature.integrate(lambda x: x ** 5 - x ** 2, 0.0, 2.0, 3) - (64.0 / 6.0 - 8.0 / 3.0)) < GEOMDL_DELTA
+
+
+def test_surface_moments(plane):
+    quad = plane.quadrature()
+    assert abs(quad.area() - 6.0) < GEOMDL_DELTA
+    centroid = quad.centroid()
+    assert abs(centroid[0] - 1.0) < GEOMDL_DELTA
+    assert abs(centroid[1] - 1.5) < GEOMDL_DELTA
+    moments = quad.second_moments(centroid)
+    assert abs(moments[0][0] - 2.0) < GEOMDL_DELTA
+    assert abs(moments[1][1] - 4.5) < GEOMDL_DELTA
+    assert abs(moments[0][1]) < GEOMDL_DELTA
+
+
+def test_surface_integrate(cylinder):
+    surf = cylinder
+    quad = surf.quadrature(num_u=8, num_v=2)
+    assert abs(surf.quadrature(num_u=8, num_v=2).area() - 3.141592654) < GEOMDL_DELTA
+    assert quad is surf.quadrature(num_u=8, num_v=2)
+
+    # Flux of the vector field (x, y, 0) through the cylinder
+    assert abs(quad.integrate(lambda pt, uv, normal: pt[0] * normal[0] + pt[1] * normal[1]) - 3.141592654) < \
+        GEOMDL_DELTA
+    first_moments = quad.integrate(lambda pt, uv, normal: pt)
+    assert abs(first_moments[0] - 2.0) < GEOMDL_DELTA
+    assert abs(first_moments[2] - 3.141592654) < GEOMDL_DELTA
+
+    # The cached quadrature is discarded when the surface changes
+    surf.knotvector_v = [0.0, 0.0, 1.0, 1.0]
+    assert quad is not surf.quadrature(num_u=8, num_v=2)
+
+
+def test_curve_span_elements():
+    curve = BSpline.Curve()
+    curve.degree = 1
+    curve.ctrlpts = [[0.0, 0.0], [3.0, 4.0], [3.0, 10.0]]
+    curve.knotvector = [0.0, 0.0, 0.5, 1.0, 1.0]
+    elems = curve.span_elements()
+
+    assert len(elems) == 2
+    assert list(elems[1].connectivity) == [1, 2]
+    assert elems[1].domain == ((0.5, 1.0),)
+    length = sum([elem.weights[k] * elem.det_jacobians[k] for elem in elems for k in range(elem.num_points)])
+    assert abs(length - 11.0) < GEOMDL_DELTA
+    assert elems is curve.span_elements()
+
+    # Knot insertion changes the elements
+    curve.insert_knot(0.75)
+    assert len(curve.span_elements()) == 3
+
+
+def test_surface_span_elements(cylinder):
+    surf = cylinder
+    surf.insert_knot(u=0.5)
+    elems = surf.span_elements(num_u=6)
+
+    assert len(elems) == 2
+    assert elems[1].index == (1, 0)
+    assert list(elems[1].connectivity) == [2, 3, 4, 5, 6, 7]
+    area = 0.0
+    for elem in elems:
+        num_basis = elem.num_basis
+        for k in range(elem.num_points):
+            # Partition of unity
+            assert abs(sum(elem.basis[k * num_basis:(k + 1) * num_basis]) - 1.0) < GEOMDL_DELTA
+            assert abs(sum(elem.basis_ders[0][k * num_basis:(k + 1) * num_basis])) < GEOMDL_DELTA
+            evalpt = surf.surfpt(elem.params[2 * k], elem.params[2 * k + 1])
+            assert abs(evalpt[0] - elem.points[3 * k]) < GEOMDL_DELTA
+            assert abs(evalpt[1] - elem.points[3 * k + 1]) < GEOMDL_DELTA
+            assert abs(evalpt[2] - elem.points[3 * k + 2]) < GEOMDL_DELTA
+            area += elem.weights[k] * elem.det_jacobians[k]
+    assert abs(area - 3.141592654) < GEOMDL_DELTA
@@ -0,0 +1,106 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests geomdl.tiles module. Requires "pytest" to run.
+"""
+
+import pytest
+from geomdl import tiles
+
+GEOMDL_DELTA = 10e-6
+
+
+def check_window(surf, window):
+    assert len(window) == window.size_u * window.size_v
+    idx = 0
+    for u in window.knots_u:
+        for v in window.knots_v:
+            for res, ref in zip(window[idx], surf.surfpt(u, v)):
+                assert abs(res - ref) < GEOMDL_DELTA
+            idx += 1
+
+
+def test_tile_cache_evaluate(nurbs_surface):
+    surf = nurbs_surface
+    cache = tiles.TileCache(surf, tile_size=4)
+    window = cache.evaluate(1, start_u=0.3, stop_u=0.8, start_v=0.1, stop_v=1.0)
+
+    assert window.level == 1
+    assert window.knots_u == [0.25, 0.375, 0.5, 0.625, 0.75, 0.875]
+    assert window.knots_v[0] == 0.0
+    assert window.knots_v[-1] == 1.0
+    check_window(surf, window)
+
+
+def test_tile_cache_full_domain(nurbs_surface):
+    surf = nurbs_surface
+    surf.sample_size = 9
+    surf.evaluate()
+    cache = tiles.TileCache(surf, tile_size=4)
+    window = cache.evaluate(1)
+
+    assert len(window) == len(surf.evalpts)
+    for res, ref in zip(window, surf.evalpts):
+        for r, e in zip(res, ref):
+            assert abs(r - e) < GEOMDL_DELTA
+
+
+def test_tile_cache_reuse(nurbs_surface):
+    surf = nurbs_surface
+    cache = tiles.TileCache(surf, tile_size=4)
+    cache.evaluate(1, start_u=0.0, stop_u=0.5, start_v=0.0, stop_v=0.5)
+    assert cache.misses == 1
+    assert cache.hits == 0
+
+    # Panning to the right evaluates only the new tile
+    cache.evaluate(1, start_u=0.0, stop_u=0.5, start_v=0.0, stop_v=0.9)
+    assert cache.misses == 2
+    assert cache.hits == 1
+
+
+def test_tile_cache_eviction(nurbs_surface):
+    surf = nurbs_surface
+    cache = tiles.TileCache(surf, tile_size=4)
+    cache.evaluate(1)
+    assert len(cache) == 4
+    tile_bytes = cache.memory // 4
+
+    cache.memory_budget = 2 * tile_bytes
+    assert len(cache) == 2
+    assert cache.memory == 2 * tile_bytes
+
+    # The window is evaluated correctly even if its tiles do not fit into the memory budget
+    check_window(surf, cache.evaluate(1))
+    assert len(cache) == 2
+
+
+def test_tile_cache_invalidate(nurbs_surface):
+    surf = nurbs_surface
+    cache = tiles.TileCache(surf, tile_size=4)
+    cache.evaluate(0)
+    surf.weights = [1.0] * 9
+    window = cache.evaluate(0)
+
+    assert cache.misses == 2
+    check_window(surf, window)
+
+
+def test_tile_cache_select_level(nurbs_surface):
+    surf = nurbs_surface
+    cache = tiles.TileCache(surf, tile_size=8)
+    assert cache.select_level(0.0, 1.0, 8) == 0
+    assert cache.select_level(0.0, 1.0, 9) == 1
+    assert cache.select_level(0.25, 0.5, 8) == 2
+
+
+def test_tile_cache_errors(nurbs_surface):
+    surf = nurbs_surface
+    with pytest.raises(ValueError):
+        tiles.TileCache(surf, tile_size=0)
+    cache = tiles.TileCache(surf, tile_size=4)
+    with pytest.raises(IndexError):
+        cache.tile(0, 1, 0)
+    with pytest.raises(ValueError):
+        cache.evaluate(-1)
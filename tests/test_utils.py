@@ -29,3 +29,9 @@ def test_normalize_knot_vector():
     output_kv = [0.0, 0.0, 0.2, 0.3, 0.7, 0.8, 1.0, 1.0]
     to_check = utilities.normalize_knot_vector(input_kv)
     assert to_check == output_kv
+
+
+def test_evaluate_bounding_box_negative():
+    ctrlpts = [[-5.0, -3.0, -1.0], [-2.0, -4.0, -6.0]]
+    bbox = utilities.evaluate_bounding_box(ctrlpts)
+    assert bbox == [(-5.0, -4.0, -6.0), (-2.0, -3.0, -1.0)]
@@ -0,0 +1,79 @@
+"""
+    Tests for the NURBS-Python package
+    Released under The MIT License. See LICENSE file for details.
+    Copyright (c) 2018 Onur Rauf Bingol
+
+    Tests the mesh helpers of geomdl.visualization.VisPlotly module. Requires "pytest", "numpy" and "plotly" to run.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('plotly')
+
+from geomdl.visualization import VisPlotly
+
+GEOMDL_DELTA = 10e-6
+
+
+def make_grid(size_u, size_v):
+    # Planar grid of points in [u][v] order, the coordinates are the grid indices
+    return [[float(i), float(j), 0.0] for i in range(size_u) for j in range(size_v)]
+
+
+def test_mesh_vertices():
+    pts = VisPlotly.make_mesh_vertices(make_grid(4, 3), 4, 3)
+    assert pts.shape == (4, 3, 3)
+    assert pts.dtype == np.float64
+    assert pts[2, 1].tolist() == [2.0, 1.0, 0.0]
+
+    pts = VisPlotly.make_mesh_vertices(make_grid(4, 3), 4, 3, dtype=np.float32)
+    assert pts.dtype == np.float32
+
+    with pytest.raises(ValueError):
+        VisPlotly.make_mesh_vertices(make_grid(4, 3), 4, 3, decimation=0)
+
+
+def test_mesh_vertices_decimation():
+    size_u, size_v = 10, 7
+    pts = VisPlotly.make_mesh_vertices(make_grid(size_u, size_v), size_u, size_v, decimation=4)
+
+    # Every 4th row and column is kept, the boundary rows and columns are always kept
+    assert pts.shape == (4, 3, 3)
+    assert pts[:, 0, 0].tolist() == [0.0, 4.0, 8.0, 9.0]
+    assert pts[0, :, 1].tolist() == [0.0, 4.0, 6.0]
+    assert pts[0, 0].tolist() == [0.0, 0.0, 0.0]
+    assert pts[-1, -1].tolist() == [float(size_u - 1), float(size_v - 1), 0.0]
+    assert all(abs(x - (size_u - 1)) < GEOMDL_DELTA for x in pts[-1, :, 0])
+    assert all(abs(y - (size_v - 1)) < GEOMDL_DELTA for y in pts[:, -1, 1])
+
+    # The boundary row or column is not duplicated, if the decimation step ends on it
+    pts = VisPlotly.make_mesh_vertices(make_grid(9, 5), 9, 5, decimation=4)
+    assert pts.shape == (3, 2, 3)
+
+
+def test_mesh_faces():
+    size_u, size_v = 4, 3
+    tri_i, tri_j, tri_k = VisPlotly.make_mesh_faces(size_u, size_v)
+
+    # Two triangles for each quad
+    num_faces = 2 * (size_u - 1) * (size_v - 1)
+    assert len(tri_i) == len(tri_j) == len(tri_k) == num_faces
+
+    # The indices refer to the grid points and the triangles are not degenerate
+    faces = np.stack((tri_i, tri_j, tri_k), axis=1)
+    assert faces.min() == 0
+    assert faces.max() == size_u * size_v - 1
+    assert all(len(set(face)) == 3 for face in faces.tolist())
+
+
+def test_mesh_faces_winding():
+    size_u, size_v = 5, 4
+    pts = VisPlotly.make_mesh_vertices(make_grid(size_u, size_v), size_u, size_v).reshape(-1, 3)
+    tri_i, tri_j, tri_k = VisPlotly.make_mesh_faces(size_u, size_v)
+
+    # All triangles of the planar grid are oriented the same way and cover the grid area
+    normals = np.cross(pts[tri_j] - pts[tri_i], pts[tri_k] - pts[tri_i])
+    assert (normals[:, 2] > 0.0).all() or (normals[:, 2] < 0.0).all()
+    area = np.abs(normals[:, 2]).sum() / 2.0
+    assert abs(area - (size_u - 1) * (size_v - 1)) < GEOMDL_DELTA